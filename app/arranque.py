@@ -0,0 +1,148 @@
+"""Arranque del servidor con calentamiento previo, y su benchmark.
+
+En lugar de `streamlit run main.py`, el contenedor corre:
+
+    python app/arranque.py --server.port=8501 --server.address=0.0.0.0
+
+que primero calienta el proceso (ver simulations/calentamiento.py) y luego
+levanta Streamlit en ese mismo proceso, con las dependencias pesadas ya
+importadas y una figura ya dibujada. El servidor sólo responde a /_stcore/health cuando ya está
+caliente, así que el HEALTHCHECK no da por listo un contenedor frío.
+ELECTRO_CALENTAR=0 salta el calentamiento.
+
+La construcción de la imagen corre sólo el calentamiento, para dejar la
+caché de fuentes de matplotlib guardada en la capa:
+
+    python app/arranque.py --calentar
+
+Con --medir compara el arranque en frío (`streamlit run main.py` sin caché
+de fuentes, como antes) contra el arranque calentado: tiempo hasta que el
+servidor está listo y hasta que un navegador tiene su primera figura (la
+página de circuitos RLC, la de más mathtext). Usa el cliente de carga.py:
+
+    python app/arranque.py --medir --repeticiones 3 --salida arranque.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DIRECTORIO_APP = os.path.dirname(os.path.abspath(__file__))
+
+# Pasos de un navegador hasta ver su primera figura
+PRIMERA_FIGURA = [{"Selecciona un tema:": "Circuitos Eléctricos"}]
+
+
+def calentar():
+    if DIRECTORIO_APP not in sys.path:
+        sys.path.insert(0, DIRECTORIO_APP)
+    from simulations import calentamiento
+
+    return calentamiento.calentar()
+
+
+def servir(opciones):
+    """Calienta este proceso y levanta Streamlit en él."""
+    if os.environ.get("ELECTRO_CALENTAR", "1") != "0":
+        inicio = time.perf_counter()
+        tiempos = calentar()
+        detalle = ", ".join(f"{etapa} {segundos:.2f} s" for etapa, segundos in tiempos.items())
+        print(f"Calentamiento: {time.perf_counter() - inicio:.2f} s ({detalle})", file=sys.stderr)
+
+    from streamlit.web import cli
+
+    cli.main(["run", os.path.join(DIRECTORIO_APP, "main.py"), *opciones], prog_name="streamlit")
+
+
+async def primera_figura(url):
+    """Segundos desde que se abre la sesión hasta tener la primera figura descargada."""
+    import websockets  # sólo hace falta para el benchmark
+
+    from carga import Sesion
+
+    sesion = Sesion(url, random.Random(0))
+    ws_url = sesion.url.replace("http", "ws", 1) + "/_stcore/stream"
+    inicio = time.perf_counter()
+    async with websockets.connect(ws_url, subprotocols=["streamlit"], max_size=None) as ws:
+        await sesion.rerun(ws)
+        for paso in PRIMERA_FIGURA:
+            fragmentos = {sesion.fijar(etiqueta, valor) for etiqueta, valor in paso.items()}
+            await sesion.rerun(ws, fragmentos.pop() if len(fragmentos) == 1 else None)
+    return time.perf_counter() - inicio
+
+
+def medir_arranque(calentado):
+    """Un arranque completo en un directorio de caché de matplotlib nuevo."""
+    from carga import lanzar_servidor
+
+    with tempfile.TemporaryDirectory() as cache:
+        entorno = {"MPLCONFIGDIR": cache}
+        if calentado:
+            # Lo que hace la construcción de la imagen
+            subprocess.run([sys.executable, __file__, "--calentar"], check=True,
+                           env=dict(os.environ, **entorno), capture_output=True)
+            comando = [sys.executable, __file__]
+        else:
+            comando = [sys.executable, "-m", "streamlit", "run", "main.py"]
+
+        inicio = time.perf_counter()
+        servidor, url = lanzar_servidor(0, comando=comando, entorno=entorno)
+        try:
+            listo = time.perf_counter() - inicio
+            figura = asyncio.run(primera_figura(url))
+        finally:
+            servidor.terminate()
+            servidor.wait()
+    return {"listo_s": listo, "primera_figura_s": listo + figura, "figura_tras_listo_s": figura}
+
+
+def medir(repeticiones):
+    resultados = {}
+    for nombre, calentado in (("frio", False), ("calentado", True)):
+        medidas = [medir_arranque(calentado) for _ in range(repeticiones)]
+        resultados[nombre] = {
+            clave: statistics.median(medida[clave] for medida in medidas) for clave in medidas[0]
+        }
+        resultado = resultados[nombre]
+        print(f"{nombre:<10} listo {resultado['listo_s']:6.2f} s  "
+              f"primera figura {resultado['primera_figura_s']:6.2f} s  "
+              f"(tras listo {resultado['figura_tras_listo_s']:5.2f} s)", file=sys.stderr)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calentar", action="store_true", help="sólo calentar y salir (construcción de la imagen)")
+    parser.add_argument("--medir", action="store_true", help="comparar arranque en frío y calentado")
+    parser.add_argument("--repeticiones", type=int, default=3, help="arranques por configuración (se usa la mediana)")
+    parser.add_argument("--salida", help="con --medir, escribe los resultados como JSON en este archivo")
+    args, opciones = parser.parse_known_args()
+
+    if args.calentar:
+        for etapa, segundos in calentar().items():
+            print(f"{etapa:<14} {segundos * 1000:8.1f} ms")
+    elif args.medir:
+        resultados = medir(args.repeticiones)
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8") as archivo:
+                json.dump({
+                    "python": platform.python_version(),
+                    "maquina": platform.machine(),
+                    "cpus": os.cpu_count(),
+                    "repeticiones": args.repeticiones,
+                    "pagina": PRIMERA_FIGURA,
+                    "configuraciones": resultados,
+                }, archivo, indent=2, ensure_ascii=False)
+    else:
+        servir(opciones)
+
+
+if __name__ == "__main__":
+    main()
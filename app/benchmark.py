@@ -0,0 +1,279 @@
+"""Benchmark sin navegador de todas las páginas de simulación.
+
+Cada simulación del registro se ejecuta con AppTest de Streamlit, moviendo
+sus controles según un guion fijo (ESCENARIOS). De cada paso se mide el
+tiempo total del rerun, su reparto en cálculo / figura / rasterizado (ver
+simulations/metricas.py) y, en una pasada aparte para no inflar los
+tiempos, el pico de memoria de Python/NumPy con tracemalloc. Las cachés de
+figuras se vacían antes de cada paso, así que se mide siempre el camino
+caro.
+
+    python app/benchmark.py --salida base.json
+    python app/benchmark.py --comparar base.json --tolerancia 0.25
+
+Con --comparar el proceso termina con código 1 si alguna métrica empeora más
+que la tolerancia relativa respecto a la línea base.
+
+Con --fugas, en lugar de medir tiempos, cada simulación se dibuja --renders
+veces (500 por omisión) recorriendo su guion con las cachés vacías, y la
+memoria residente del proceso no debe crecer más de --umbral-mb entre el
+final del calentamiento y el último dibujo; si crece, termina con código 1:
+
+    python app/benchmark.py --fugas --renders 500 --umbral-mb 50
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+DIRECTORIO_APP = os.path.dirname(os.path.abspath(__file__))
+if DIRECTORIO_APP not in sys.path:
+    sys.path.insert(0, DIRECTORIO_APP)
+
+from streamlit.testing.v1 import AppTest # type: ignore
+
+from carga import rss_mb
+from registro import SIMULACIONES
+from simulations import cache, metricas
+
+# (sección, subtema) -> pasos; cada paso fija controles por etiqueta
+ESCENARIOS = {
+    ("Electrostática", "Ley de Coulomb"): [
+        {},
+        {"Carga 1 (μC):": 3.0, "Posición 1 X (m):": -1.0},
+        {"Carga 2 (μC):": 2.5, "Posición 2 Y (m):": 1.5},
+    ],
+    ("Electrostática", "Potencial eléctrico"): [
+        {},
+        {"Carga (nC)": -7.5},
+        {"Resolución": 1000},
+    ],
+    ("Electrostática", "Campo eléctrico"): [
+        {},
+        {"Carga (nC)": -12.0},
+        {"Resolución de malla": 100},
+    ],
+    ("Electrostática", "Conductores"): [
+        {},
+        {"Radio de la esfera (m)": 1.5},
+        {"Campo externo (V/m)": 3.0},
+    ],
+    ("Electrostática", "Torque sobre una distribución de carga"): [
+        {},
+        {"Radio del anillo (m)": 0.3},
+        {"Campo eléctrico externo (N/C)": 1.5},
+    ],
+    ("Magnetostática", "Ley de Biot-Savart"): [
+        {},
+        {"Corriente (A)": 2.5},
+        {"Longitud cable (m)": 20},
+    ],
+    ("Magnetostática", "No existencia de monopolos magnéticos"): [
+        {},
+        {"Corriente (A)": 3.0},
+        {"Número de líneas de campo": 20},
+    ],
+    ("Magnetostática", "Campo de inducción magnética"): [
+        {},
+        {"Hilo 1 - Corriente (A)": -2.0},
+        {"Resolución de malla": 30},
+    ],
+    ("Ondas Electromagnéticas", "Fibra óptica"): [
+        {},
+        {"Ángulo de incidencia (°)": 80},
+        {"Radio del núcleo (μm)": 8.0},
+    ],
+    ("Ondas Electromagnéticas", "Guías de onda"): [
+        {},
+        {"Número de modo n": 2},
+        {"Tipo de modo": "TM"},
+    ],
+    ("Circuitos Eléctricos", "Circuitos RL, RC y RLC"): [
+        {},
+        {"Resistencia R (Ω)": 50.0},
+        {"Tipo de excitación": "senoidal"},
+    ],
+}
+
+METRICAS = ("total_s", "calculo_s", "figura_s", "rasterizado_s", "pico_mb")
+
+# Dibujos antes de tomar la memoria de referencia en --fugas: importaciones,
+# cachés de fuentes y arenas del asignador ya asentadas
+CALENTAMIENTO_FUGAS = 20
+
+
+def guion(seccion, subtema):
+    """Script mínimo que sólo dibuja una simulación."""
+    return (
+        "from registro import ejecutar_simulacion\n"
+        "from simulations import metricas\n"
+        "metricas.reiniciar()\n"
+        f"ejecutar_simulacion({seccion!r}, {subtema!r})\n"
+        "metricas.publicar()\n"
+    )
+
+
+def fijar_controles(at, valores):
+    for etiqueta, valor in valores.items():
+        widgets = [w for w in list(at.slider) + list(at.selectbox) if w.label == etiqueta]
+        if not widgets:
+            raise KeyError(f"No hay control con etiqueta {etiqueta!r}")
+        widgets[0].set_value(valor)
+
+
+def rerun_sin_cache(at):
+    for c in cache.caches.values():
+        c.limpiar()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+def medir_paso(at, valores):
+    fijar_controles(at, valores)
+    inicio = time.perf_counter()
+    rerun_sin_cache(at)
+    total = time.perf_counter() - inicio
+    etapas = metricas.ultimo["etapas"]
+
+    # Segunda pasada, igual, sólo para la memoria
+    tracemalloc.start()
+    try:
+        rerun_sin_cache(at)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "total_s": total,
+        "calculo_s": etapas.get("calculo", 0.0),
+        "figura_s": etapas.get("figura", 0.0),
+        "rasterizado_s": etapas.get("rasterizado", 0.0),
+        "pico_mb": pico / 2**20,
+    }
+
+
+def medir_simulacion(seccion, subtema, repeticiones):
+    at = AppTest.from_string(guion(seccion, subtema), default_timeout=300)
+    at.run()  # importación y primer dibujo, fuera de la medición
+    muestras = []
+    for _ in range(repeticiones):
+        for valores in ESCENARIOS[(seccion, subtema)]:
+            muestras.append(medir_paso(at, valores))
+    return {m: statistics.median(muestra[m] for muestra in muestras) for m in METRICAS}
+
+
+def ejecutar(repeticiones, filtro=None):
+    resultados = {}
+    for seccion, subtema in SIMULACIONES:
+        nombre = f"{seccion} / {subtema}"
+        if filtro and filtro.lower() not in nombre.lower():
+            continue
+        resultados[nombre] = medir_simulacion(seccion, subtema, repeticiones)
+        r = resultados[nombre]
+        print(f"{nombre:<60} {r['total_s'] * 1000:8.1f} ms  "
+              f"(cálculo {r['calculo_s'] * 1000:.1f}, figura {r['figura_s'] * 1000:.1f}, "
+              f"raster {r['rasterizado_s'] * 1000:.1f})  pico {r['pico_mb']:.1f} MiB",
+              file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "repeticiones": repeticiones,
+        "simulaciones": resultados,
+    }
+
+
+def medir_fugas(seccion, subtema, renders):
+    """(MiB residentes tras el calentamiento, MiB tras `renders` dibujos sin caché)."""
+    at = AppTest.from_string(guion(seccion, subtema), default_timeout=300)
+    at.run()
+    pasos = ESCENARIOS[(seccion, subtema)]
+    base = None
+    for n in range(CALENTAMIENTO_FUGAS + renders):
+        if n == CALENTAMIENTO_FUGAS:
+            gc.collect()
+            base = rss_mb(os.getpid())
+        fijar_controles(at, pasos[n % len(pasos)])
+        rerun_sin_cache(at)
+    gc.collect()
+    return base, rss_mb(os.getpid())
+
+
+def fugas(renders, umbral_mb, filtro=None):
+    """Lista de (simulación, MiB antes, MiB después) cuya memoria creció más de umbral_mb."""
+    crecidas = []
+    for seccion, subtema in SIMULACIONES:
+        nombre = f"{seccion} / {subtema}"
+        if filtro and filtro.lower() not in nombre.lower():
+            continue
+        antes, despues = medir_fugas(seccion, subtema, renders)
+        print(f"{nombre:<60} {antes:8.1f} -> {despues:8.1f} MiB ({despues - antes:+.1f})",
+              file=sys.stderr)
+        if despues - antes > umbral_mb:
+            crecidas.append((nombre, antes, despues))
+    return crecidas
+
+
+def comparar(base, actual, tolerancia):
+    """Lista de (simulación, métrica, antes, después) que empeoraron."""
+    regresiones = []
+    for nombre, medidas in actual["simulaciones"].items():
+        anteriores = base["simulaciones"].get(nombre)
+        if anteriores is None:
+            continue
+        for metrica in METRICAS:
+            antes, despues = anteriores[metrica], medidas[metrica]
+            # Un piso absoluto evita falsos positivos en etapas de microsegundos
+            piso = 1.0 if metrica == "pico_mb" else 0.005
+            if despues > antes * (1 + tolerancia) and despues - antes > piso:
+                regresiones.append((nombre, metrica, antes, despues))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--solo", help="sólo simulaciones cuyo nombre contenga este texto")
+    parser.add_argument("--salida", help="escribe los resultados como JSON en este archivo")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior contra el cual comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="empeoramiento relativo permitido (0.25 = 25%%)")
+    parser.add_argument("--fugas", action="store_true",
+                        help="comprueba que la memoria residente no crezca al redibujar")
+    parser.add_argument("--renders", type=int, default=500, help="dibujos por simulación con --fugas")
+    parser.add_argument("--umbral-mb", type=float, default=50.0,
+                        help="crecimiento de memoria residente permitido por simulación con --fugas")
+    args = parser.parse_args()
+
+    if args.fugas:
+        crecidas = fugas(args.renders, args.umbral_mb, args.solo)
+        for nombre, antes, despues in crecidas:
+            print(f"FUGA {nombre}: {antes:.1f} -> {despues:.1f} MiB")
+        if crecidas:
+            sys.exit(1)
+        print("Sin crecimiento de memoria fuera del umbral.")
+        return
+
+    actual = ejecutar(args.repeticiones, args.solo)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(actual, archivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(base, actual, args.tolerancia)
+        for nombre, metrica, antes, despues in regresiones:
+            print(f"REGRESIÓN {nombre} {metrica}: {antes:.4f} -> {despues:.4f}")
+        if regresiones:
+            sys.exit(1)
+        print("Sin regresiones fuera de tolerancia.")
+
+
+if __name__ == "__main__":
+    main()
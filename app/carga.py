@@ -0,0 +1,333 @@
+"""Prueba de carga: N sesiones concurrentes contra un servidor local.
+
+Cada sesión es un cliente de websocket que habla el mismo protocolo que el
+navegador (BackMsg / ForwardMsg de Streamlit): pide reruns con el estado de
+sus controles, espera a que el script termine y descarga las imágenes que
+la página referenció, como haría el navegador. Los controles que viven
+dentro de un fragmento piden sólo el rerun del fragmento.
+
+Todas las sesiones siguen el RECORRIDO: cambian de sección, arrastran los
+sliders de los hilos magnéticos, alternan TE/TM en la guía de onda, etc.
+Los pasos marcados con ARRASTRE toman un valor al azar (semilla por
+sesión), para que no todas las sesiones acierten en la caché.
+
+Por omisión se lanza `streamlit run main.py` una vez por cada número de
+procesos de dibujo a comparar (ELECTRO_RENDER_PROCESOS, ver
+simulations/procesos.py) y se reporta la latencia de los reruns
+(p50/p95/p99), el rendimiento en reruns por segundo y la memoria residente
+del servidor y sus procesos por sesión:
+
+    python app/carga.py --sesiones 8 --procesos 0 2 4 --salida carga.json
+    python app/carga.py --url http://localhost:8501 --sesiones 20
+
+Con --url se usa un servidor ya levantado y no se mide memoria. Necesita el
+paquete `websockets`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg # type: ignore
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg # type: ignore
+from streamlit.proto.WidgetStates_pb2 import WidgetState # type: ignore
+
+DIRECTORIO_APP = os.path.dirname(os.path.abspath(__file__))
+
+# Valor al azar dentro del rango del slider
+ARRASTRE = object()
+
+# Cada paso fija controles por etiqueta y provoca un rerun
+RECORRIDO = [
+    {"Selecciona un tema:": "Magnetostática"},
+    {"Selecciona un subtema:": "Campo de inducción magnética"},
+    {"Hilo 1 - Pos X (m)": ARRASTRE},
+    {"Hilo 1 - Pos X (m)": ARRASTRE},
+    {"Hilo 2 - Corriente (A)": ARRASTRE},
+    {"Hilo 1 - Pos Y (m)": ARRASTRE},
+    {"Selecciona un tema:": "Ondas Electromagnéticas"},
+    {"Selecciona un subtema:": "Guías de onda"},
+    {"Tipo de modo": "TM"},
+    {"Número de modo n": ARRASTRE},
+    {"Tipo de modo": "TE"},
+    {"Ancho a (cm)": ARRASTRE},
+    {"Selecciona un tema:": "Electrostática"},
+    {"Carga 1 (μC):": ARRASTRE},
+    {"Selecciona un tema:": "Inicio"},
+]
+
+PERCENTILES = (50, 95, 99)
+
+
+class Sesion:
+    """Un navegador simulado: conoce los controles de la página y su estado."""
+
+    def __init__(self, url, azar):
+        self.url = url.rstrip("/")
+        self.azar = azar
+        self.controles = {}  # etiqueta -> (tipo, proto, id del fragmento)
+        self.estados = {}  # id del control -> WidgetState
+        self.pagina = ""
+        self.bytes = 0
+
+    async def rerun(self, ws, fragmento=None):
+        mensaje = BackMsg()
+        cliente = mensaje.rerun_script
+        cliente.query_string = ""
+        cliente.page_script_hash = self.pagina
+        if fragmento:
+            cliente.fragment_id = fragmento
+        cliente.widget_states.widgets.extend(self.estados.values())
+        await ws.send(mensaje.SerializeToString())
+
+        imagenes = []
+        while True:
+            datos = await ws.recv()
+            self.bytes += len(datos)
+            recibido = ForwardMsg()
+            recibido.ParseFromString(datos)
+            tipo = recibido.WhichOneof("type")
+            if tipo == "new_session":
+                self.pagina = recibido.new_session.page_script_hash
+            elif tipo == "delta" and recibido.delta.WhichOneof("type") == "new_element":
+                elemento = recibido.delta.new_element
+                clase = elemento.WhichOneof("type")
+                proto = getattr(elemento, clase)
+                if clase == "imgs":
+                    imagenes.extend(imagen.url for imagen in proto.imgs)
+                elif getattr(proto, "id", "") and getattr(proto, "label", ""):
+                    self.controles[proto.label] = (clase, proto, recibido.delta.fragment_id)
+            elif tipo == "script_finished":
+                break
+        # Como el navegador: la figura se ve cuando termina de descargarse
+        for url in imagenes:
+            if url.startswith("/"):
+                self.bytes += await asyncio.to_thread(descargar, self.url + url)
+
+    def fijar(self, etiqueta, valor):
+        """Cambia un control; devuelve su fragmento (o None si no está en uno)."""
+        if etiqueta not in self.controles:
+            raise KeyError(f"No hay control con etiqueta {etiqueta!r}")
+        clase, proto, fragmento = self.controles[etiqueta]
+        estado = WidgetState(id=proto.id)
+        if clase == "slider":
+            if valor is ARRASTRE:
+                pasos = round((proto.max - proto.min) / proto.step)
+                valor = proto.min + self.azar.randint(0, pasos) * proto.step
+            estado.double_array_value.data[:] = [valor]
+        elif clase in ("radio", "selectbox"):
+            estado.string_value = valor
+        elif clase == "checkbox":
+            estado.bool_value = valor
+        else:
+            raise TypeError(f"Control no soportado: {clase}")
+        self.estados[proto.id] = estado
+        return fragmento or None
+
+
+def descargar(url):
+    with urllib.request.urlopen(url) as respuesta:
+        return len(respuesta.read())
+
+
+async def sesion(url, indice, vueltas, pausa, semilla, latencias, errores):
+    import websockets  # sólo hace falta para esta herramienta
+
+    actual = Sesion(url, random.Random(semilla + indice))
+    ws_url = actual.url.replace("http", "ws", 1) + "/_stcore/stream"
+    async with websockets.connect(ws_url, subprotocols=["streamlit"], max_size=None) as ws:
+        inicio = time.perf_counter()
+        await actual.rerun(ws)
+        latencias.append(time.perf_counter() - inicio)
+        for _ in range(vueltas):
+            for paso in RECORRIDO:
+                await asyncio.sleep(actual.azar.uniform(0, 2 * pausa))
+                try:
+                    fragmentos = {actual.fijar(etiqueta, valor) for etiqueta, valor in paso.items()}
+                    # Si todo lo que cambió está en un mismo fragmento, sólo corre ese
+                    fragmento = fragmentos.pop() if len(fragmentos) == 1 else None
+                    inicio = time.perf_counter()
+                    await actual.rerun(ws, fragmento)
+                    latencias.append(time.perf_counter() - inicio)
+                except (KeyError, TypeError) as error:  # una sesión rota no detiene a las demás
+                    errores.append(repr(error))
+    return actual.bytes
+
+
+def rss_mb(pid):
+    """Memoria residente de un proceso en MiB (Linux); 0 si no se puede leer."""
+    try:
+        with open(f"/proc/{pid}/status") as archivo:
+            for linea in archivo:
+                if linea.startswith("VmRSS:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def descendientes(pid):
+    hijos = []
+    try:
+        for tarea in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tarea}/children") as archivo:
+                hijos.extend(int(hijo) for hijo in archivo.read().split())
+    except OSError:
+        return []
+    return hijos + [nieto for hijo in hijos for nieto in descendientes(hijo)]
+
+
+def rss_arbol_mb(pid):
+    return rss_mb(pid) + sum(rss_mb(hijo) for hijo in descendientes(pid))
+
+
+class Monitor(threading.Thread):
+    """Muestrea la memoria residente del servidor y sus hijos mientras dura la carga."""
+
+    def __init__(self, pid, intervalo=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.intervalo = intervalo
+        self.base = rss_arbol_mb(pid)
+        self.pico = self.base
+        self._alto = threading.Event()
+
+    def run(self):
+        while not self._alto.wait(self.intervalo):
+            self.pico = max(self.pico, rss_arbol_mb(self.pid))
+
+    def detener(self):
+        self._alto.set()
+        self.join()
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def lanzar_servidor(procesos, espera=120, comando=None, entorno=None):
+    """Arranca `streamlit run main.py` con `procesos` procesos de dibujo.
+
+    `comando` reemplaza a `streamlit run main.py` (recibe las mismas
+    opciones del servidor) y `entorno` se suma a las variables de entorno.
+    """
+    puerto = puerto_libre()
+    entorno = dict(os.environ, ELECTRO_RENDER_PROCESOS=str(procesos), **(entorno or {}))
+    servidor = subprocess.Popen(
+        (comando or [sys.executable, "-m", "streamlit", "run", "main.py"])
+        + ["--server.headless=true", f"--server.port={puerto}", "--server.address=127.0.0.1",
+           "--browser.gatherUsageStats=false"],
+        cwd=DIRECTORIO_APP, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{puerto}"
+    limite = time.monotonic() + espera
+    while time.monotonic() < limite:
+        try:
+            if descargar(url + "/_stcore/health"):
+                return servidor, url
+        except OSError:
+            time.sleep(0.2)
+    servidor.kill()
+    raise RuntimeError("El servidor no respondió a tiempo")
+
+
+async def carga(url, sesiones, vueltas, pausa, rampa, semilla, latencias, errores):
+    tareas = []
+    for i in range(sesiones):
+        tareas.append(asyncio.create_task(sesion(url, i, vueltas, pausa, semilla, latencias, errores)))
+        await asyncio.sleep(rampa / max(sesiones, 1))
+    resultados = await asyncio.gather(*tareas, return_exceptions=True)
+    errores.extend(repr(r) for r in resultados if isinstance(r, BaseException))
+    return sum(r for r in resultados if not isinstance(r, BaseException))
+
+
+def medir(url, pid, args):
+    latencias, errores = [], []
+    monitor = Monitor(pid) if pid else None
+    if monitor:
+        monitor.start()
+    inicio = time.perf_counter()
+    recibidos = asyncio.run(carga(url, args.sesiones, args.vueltas, args.pausa, args.rampa,
+                                  args.semilla, latencias, errores))
+    duracion = time.perf_counter() - inicio
+    if monitor:
+        monitor.detener()
+
+    if len(latencias) > 1:
+        cortes = statistics.quantiles(latencias, n=100, method="inclusive")
+    else:
+        cortes = (latencias or [float("nan")]) * 99
+    resultado = {f"p{p}_ms": cortes[p - 1] * 1000 for p in PERCENTILES}
+    resultado.update({
+        "reruns": len(latencias),
+        "errores": len(errores),
+        "duracion_s": duracion,
+        "reruns_por_s": len(latencias) / duracion,
+        "kib_por_rerun": recibidos / 1024 / max(len(latencias), 1),
+        "mb_por_sesion": (monitor.pico - monitor.base) / args.sesiones if monitor else None,
+        "pico_mb": monitor.pico if monitor else None,
+    })
+    return resultado, errores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sesiones", type=int, default=8)
+    parser.add_argument("--vueltas", type=int, default=1, help="veces que cada sesión repite el recorrido")
+    parser.add_argument("--procesos", type=int, nargs="+", default=[0],
+                        help="números de procesos de dibujo a comparar (0 = en el hilo de la sesión)")
+    parser.add_argument("--url", help="servidor ya levantado; si se da, --procesos se ignora")
+    parser.add_argument("--pausa", type=float, default=0.5,
+                        help="pausa media en segundos entre pasos de una sesión")
+    parser.add_argument("--rampa", type=float, default=2.0,
+                        help="segundos en los que se reparten los arranques de las sesiones")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="escribe los resultados como JSON en este archivo")
+    args = parser.parse_args()
+
+    configuraciones = [("externo", args.url)] if args.url else [(n, None) for n in args.procesos]
+    resultados = {}
+    for nombre, url in configuraciones:
+        servidor = None
+        if url is None:
+            servidor, url = lanzar_servidor(nombre)
+        try:
+            resultado, errores = medir(url, servidor.pid if servidor else None, args)
+        finally:
+            if servidor:
+                servidor.terminate()
+                servidor.wait()
+        resultados[str(nombre)] = resultado
+        memoria = f"{resultado['mb_por_sesion']:6.1f} MiB/sesión" if servidor else ""
+        print(f"procesos={nombre:<7} p50 {resultado['p50_ms']:7.0f} ms  p95 {resultado['p95_ms']:7.0f} ms  "
+              f"p99 {resultado['p99_ms']:7.0f} ms  {resultado['reruns_por_s']:5.2f} reruns/s  "
+              f"{memoria}  errores {resultado['errores']}", file=sys.stderr)
+        for error in errores[:5]:
+            print(f"  {error}", file=sys.stderr)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump({
+                "python": platform.python_version(),
+                "maquina": platform.machine(),
+                "cpus": os.cpu_count(),
+                "sesiones": args.sesiones,
+                "vueltas": args.vueltas,
+                "pausa_s": args.pausa,
+                "configuraciones": resultados,
+            }, archivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Núcleo físico de las simulaciones, sin Streamlit ni matplotlib.
+
+Funciones vectorizadas y sin efectos secundarios: reciben arreglos de
+NumPy y devuelven arreglos, así que se pueden llamar por lotes, cachear,
+medir o servir desde otro proceso.
+"""
+from electro_core.constantes import C_LUZ, EPS0, K_COULOMB, MU0
+from electro_core.cargas import (
+    DISTRIBUCIONES,
+    ArbolCargas,
+    energia_potencial,
+    evolucionar,
+    generar_cargas,
+    interaccion_barnes_hut,
+    interaccion_coulomb,
+    interaccion_directa,
+    matriz_fuerzas,
+)
+from electro_core.circuitos import derivadas_rlc, parametros_rlc, respuesta_rlc
+from electro_core.electrostatica import (
+    campo_puntual,
+    fuerza_coulomb,
+    momento_dipolar_anillo,
+    potencial_esfera_conductora,
+    potencial_puntual,
+    torque,
+)
+from electro_core.magnetostatica import (
+    campo_dipolo,
+    campo_hilo,
+    campo_hilos,
+    campo_polilinea,
+    campo_segmentos,
+    fuerzas_hilos,
+    lineas_de_campo,
+    potencial_vector_hilos,
+)
+from electro_core.frontera import Conductores, sistema_conductores
+from electro_core.green import campo_densidad, nucleos
+from electro_core.mallas import PRECISIONES, malla, tipo
+from electro_core.ondas import angulo_critico, campos_TE, campos_TM, frecuencia_corte, trayectoria_fibra
+from electro_core.poisson import Poisson, factorizacion, resolver_poisson
+from electro_core.superposicion import superponer
+from electro_core.vectores import magnitud, normalizar
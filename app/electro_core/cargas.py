@@ -0,0 +1,289 @@
+"""Sistemas de N cargas puntuales: fuerzas netas, potenciales y energía.
+
+Dos métodos con la misma salida, (fuerzas (N, d), potenciales (N,)), donde
+el potencial de cada carga es el que le producen todas las demás:
+
+- interaccion_directa: todos los pares a la vez con broadcasting, O(N²)
+  en tiempo y memoria. Exacto; conviene hasta unos miles de cargas.
+- interaccion_barnes_hut: árbol (cuadtree en 2D, octree en 3D) en el que
+  un nodo lejano (lado/distancia < theta) actúa como dos cargas puntuales,
+  una con la carga positiva del nodo en su centro de carga y otra con la
+  negativa. O(N log N). Separar los signos evita el centro de carga
+  indefinido de un nodo casi neutro.
+
+El árbol se construye y se recorre por niveles con operaciones de NumPy
+sobre todos los nodos o pares (carga, nodo) de un nivel a la vez; no hay
+recursión en Python.
+"""
+import numpy as np
+
+from electro_core.constantes import K_COULOMB
+
+# Hasta cuántas cargas interaccion_coulomb usa la suma directa
+UMBRAL_DIRECTO = 1000
+
+
+def _inversas(pos, suavizado):
+    """Diferencias r_i - r_j (N, N, d) y 1/|r| (N, N), cero en pares coincidentes."""
+    r = pos[:, None, :] - pos[None, :, :]
+    r2 = np.einsum("ijk,ijk->ij", r, r) + suavizado**2
+    with np.errstate(divide="ignore"):
+        inversa = np.where(r2 > 0, 1.0 / np.sqrt(r2), 0.0)
+    return r, inversa
+
+
+def matriz_fuerzas(q, pos, k=K_COULOMB, suavizado=0.0):
+    """F[i, j] (N, N, d): fuerza sobre la carga i debida a la j; cero en la diagonal."""
+    q = np.asarray(q, dtype=float)
+    r, inversa = _inversas(np.asarray(pos, dtype=float), suavizado)
+    return (k * q[:, None] * q[None, :] * inversa**3)[..., None] * r
+
+
+def interaccion_directa(q, pos, k=K_COULOMB, suavizado=0.0):
+    """Fuerza neta y potencial sobre cada carga sumando todos los pares."""
+    q = np.asarray(q, dtype=float)
+    r, inversa = _inversas(np.asarray(pos, dtype=float), suavizado)
+    potenciales = k * inversa @ q
+    campo = k * np.einsum("ij,ijk->ik", q[None, :] * inversa**3, r)
+    return q[:, None] * campo, potenciales
+
+
+class ArbolCargas:
+    """Árbol de Barnes-Hut guardado por niveles.
+
+    Las cargas se ordenan por su código de Morton, así que las de un nodo
+    quedan contiguas: cada nodo es un rango [inicio, inicio + cuenta) del
+    arreglo ordenado. Un nodo con `hoja` cargas o menos no se subdivide.
+    """
+
+    def __init__(self, q, pos, hoja=8, bits=16):
+        q = np.asarray(q, dtype=float)
+        pos = np.asarray(pos, dtype=float)
+        self.n, self.dimension = pos.shape
+        self.hoja = hoja
+
+        minimo = pos.min(axis=0)
+        lado = float((pos.max(axis=0) - minimo).max()) or 1.0
+        escala = 2**bits / (lado * (1 + 1e-9))
+        enteros = np.minimum(((pos - minimo) * escala).astype(np.int64), 2**bits - 1)
+
+        codigos = np.zeros(self.n, dtype=np.uint64)
+        for bit in range(bits):
+            for eje in range(self.dimension):
+                codigos |= ((enteros[:, eje] >> bit) & 1).astype(np.uint64) << np.uint64(bit * self.dimension + eje)
+        self.orden = np.argsort(codigos, kind="stable")
+        codigos = codigos[self.orden]
+        enteros = enteros[self.orden]
+        self.q = q[self.orden]
+        self.pos = pos[self.orden]
+
+        positivas = np.where(self.q > 0, self.q, 0.0)
+        negativas = self.q - positivas
+
+        self.niveles = []
+        for nivel in range(bits + 1):
+            prefijos = codigos >> np.uint64(self.dimension * (bits - nivel))
+            unicos, inicio, cuenta = np.unique(prefijos, return_index=True, return_counts=True)
+            tamano = lado / 2**nivel
+            esquina = (enteros[inicio] >> (bits - nivel)).astype(float)
+            datos = {
+                "prefijos": unicos,
+                "inicio": inicio,
+                "cuenta": cuenta,
+                "tamano": tamano,
+                "centro": minimo + (esquina + 0.5) * tamano,
+                "monopolos": [],
+            }
+            for parte in (positivas, negativas):
+                carga = np.add.reduceat(parte, inicio)
+                momento = np.add.reduceat(parte[:, None] * self.pos, inicio, axis=0)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    centro = np.where(carga[:, None] != 0, momento / carga[:, None], datos["centro"])
+                datos["monopolos"].append((carga, centro))
+            self.niveles.append(datos)
+            if cuenta.max() <= hoja:
+                break
+
+        # Hijos de cada nodo: un rango contiguo de nodos del nivel siguiente
+        for datos, siguiente in zip(self.niveles, self.niveles[1:]):
+            padres = siguiente["prefijos"] >> np.uint64(self.dimension)
+            datos["primer_hijo"] = np.searchsorted(padres, datos["prefijos"], side="left")
+            datos["hijos"] = np.searchsorted(padres, datos["prefijos"], side="right") - datos["primer_hijo"]
+
+    def interaccion(self, k=K_COULOMB, theta=0.5, suavizado=0.0):
+        """Fuerza neta y potencial sobre cada carga, en el orden original."""
+        if not 0 <= theta <= 1:
+            raise ValueError("theta debe estar entre 0 y 1")
+        campo = np.zeros((self.n, self.dimension))
+        potenciales = np.zeros(self.n)
+
+        def sumar(objetivos, cargas, posiciones):
+            r = self.pos[objetivos] - posiciones
+            r2 = np.einsum("ij,ij->i", r, r) + suavizado**2
+            with np.errstate(divide="ignore"):
+                inversa = np.where(r2 > 0, 1.0 / np.sqrt(r2), 0.0)
+            potenciales[:] += np.bincount(objetivos, k * cargas * inversa, minlength=self.n)
+            for eje in range(self.dimension):
+                campo[:, eje] += np.bincount(objetivos, k * cargas * inversa**3 * r[:, eje], minlength=self.n)
+
+        # Pares (carga, nodo) por revisar en el nivel actual; empieza con la raíz
+        objetivos = np.arange(self.n)
+        nodos = np.zeros(self.n, dtype=np.int64)
+        for nivel, datos in enumerate(self.niveles):
+            if objetivos.size == 0:
+                break
+            distancia = np.linalg.norm(self.pos[objetivos] - datos["centro"][nodos], axis=1)
+            # Con theta <= 1 un nodo lejano nunca contiene a la carga
+            lejos = datos["tamano"] < theta * distancia
+            hoja = datos["cuenta"][nodos] <= self.hoja
+            if nivel == len(self.niveles) - 1:
+                hoja[:] = True
+
+            for carga, centro in datos["monopolos"]:
+                sumar(objetivos[lejos], carga[nodos[lejos]], centro[nodos[lejos]])
+
+            cerca = ~lejos & hoja
+            t, n = objetivos[cerca], nodos[cerca]
+            cuentas = datos["cuenta"][n]
+            desplazamiento = np.repeat(datos["inicio"][n] - np.cumsum(cuentas) + cuentas, cuentas)
+            fuentes = np.arange(cuentas.sum()) + desplazamiento
+            t = np.repeat(t, cuentas)
+            distintas = fuentes != t
+            sumar(t[distintas], self.q[fuentes[distintas]], self.pos[fuentes[distintas]])
+
+            if nivel == len(self.niveles) - 1:
+                break
+            abrir = ~lejos & ~hoja
+            t, n = objetivos[abrir], nodos[abrir]
+            hijos = datos["hijos"][n]
+            objetivos = np.repeat(t, hijos)
+            nodos = np.arange(hijos.sum()) + np.repeat(datos["primer_hijo"][n] - np.cumsum(hijos) + hijos, hijos)
+
+        fuerzas = np.empty_like(campo)
+        fuerzas[self.orden] = self.q[:, None] * campo
+        resultado = np.empty_like(potenciales)
+        resultado[self.orden] = potenciales
+        return fuerzas, resultado
+
+
+def interaccion_barnes_hut(q, pos, k=K_COULOMB, theta=0.5, suavizado=0.0, hoja=8):
+    """Fuerza neta y potencial sobre cada carga con un árbol de Barnes-Hut."""
+    return ArbolCargas(q, pos, hoja=hoja).interaccion(k=k, theta=theta, suavizado=suavizado)
+
+
+def interaccion_coulomb(q, pos, k=K_COULOMB, metodo="auto", theta=0.5, suavizado=0.0):
+    """Fuerzas netas y potenciales de N cargas; devuelve también el método usado.
+
+    `metodo` es "directo", "barnes_hut" o "auto" (directo hasta
+    UMBRAL_DIRECTO cargas).
+    """
+    if metodo == "auto":
+        metodo = "directo" if len(q) <= UMBRAL_DIRECTO else "barnes_hut"
+    if metodo == "directo":
+        fuerzas, potenciales = interaccion_directa(q, pos, k=k, suavizado=suavizado)
+    elif metodo == "barnes_hut":
+        fuerzas, potenciales = interaccion_barnes_hut(q, pos, k=k, theta=theta, suavizado=suavizado)
+    else:
+        raise ValueError(f"Método desconocido: {metodo!r}")
+    return fuerzas, potenciales, metodo
+
+
+# Distribuciones de ejemplo de generar_cargas
+DISTRIBUCIONES = ["Aleatoria", "Anillo alternado", "Red iónica"]
+
+
+def generar_cargas(distribucion, n, semilla, extension=4.5):
+    """Cargas (en unidades de 1 a 5) y posiciones de una distribución dentro de ±extension."""
+    rng = np.random.default_rng(semilla)
+    indices = np.arange(n)
+    if distribucion == "Aleatoria":
+        q = rng.choice([-1.0, 1.0], n) * np.round(rng.uniform(0.5, 5.0, n), 1)
+        pos = np.round(rng.uniform(-extension, extension, (n, 2)), 2)
+    elif distribucion == "Anillo alternado":
+        angulos = 2 * np.pi * indices / n
+        pos = (2 / 3 * extension) * np.column_stack([np.cos(angulos), np.sin(angulos)])
+        q = np.where(indices % 2 == 0, 1.0, -1.0)
+    elif distribucion == "Red iónica":
+        # Red cuadrada con signos alternados, como un cristal de NaCl
+        lado = int(np.ceil(np.sqrt(n)))
+        fila, columna = np.divmod(indices, lado)
+        paso = 2 * extension / max(lado - 1, 1)
+        pos = np.column_stack([-extension + columna * paso, -extension + fila * paso])
+        q = np.where((fila + columna) % 2 == 0, 1.0, -1.0)
+    else:
+        raise ValueError(f"Distribución desconocida: {distribucion!r}")
+    return q, pos
+
+
+def energia_potencial(q, potenciales):
+    """Energía electrostática total U = ½ Σ q_i φ_i (cada par una sola vez).
+
+    En un sistema casi neutro U es una diferencia pequeña de términos
+    grandes: el error de Barnes-Hut se ve mucho más en U que en las fuerzas.
+    """
+    return 0.5 * float(np.dot(np.asarray(q, dtype=float), potenciales))
+
+
+
+def evolucionar(q, m, pos, vel, duracion, fotogramas, k=K_COULOMB, suavizado=0.05, eta=0.1,
+                dt_max=None, pasos_max=None, caja=None, metodo="auto", theta=0.5):
+    """Integra el movimiento de las cargas con velocity Verlet.
+
+    Cada paso avanza todas las partículas a la vez con una sola evaluación
+    de fuerzas. Los encuentros cercanos se manejan de dos formas:
+
+    - `suavizado` (ε, potencial de Plummer) acota la fuerza; la energía que
+      se conserva es la del sistema suavizado.
+    - El paso es común a todas las cargas pero se adapta en cada paso:
+      dt = eta · min(sqrt(ε/|a|), ε/|v|) con la mayor aceleración y la mayor
+      velocidad del sistema, sin pasar de `dt_max` ni del siguiente fotograma.
+      Con `pasos_max` el paso nunca baja de duracion/pasos_max: el costo
+      queda acotado a cambio de precisión (la deriva de energía lo delata).
+
+    Con `caja` = L las cargas rebotan elásticamente en ±L. Guarda
+    `fotogramas` + 1 estados equiespaciados en [0, duracion] y devuelve
+    (tiempos (F,), posiciones (F, N, d), energía cinética (F,),
+    energía potencial (F,), pasos).
+    """
+    q = np.asarray(q, dtype=float)
+    m = np.broadcast_to(np.asarray(m, dtype=float), q.shape)[:, None]
+    pos = np.array(pos, dtype=float)
+    vel = np.array(vel, dtype=float)
+    dt_max = duracion / fotogramas if dt_max is None else dt_max
+    dt_min = 0.0 if pasos_max is None else duracion / pasos_max
+
+    fuerzas, potenciales, metodo = interaccion_coulomb(q, pos, k, metodo, theta, suavizado)
+    aceleracion = fuerzas / m
+    tiempos = np.linspace(0.0, duracion, fotogramas + 1)
+    posiciones, cineticas, potenciales_totales = [], [], []
+    t = 0.0
+    pasos = 0
+    for siguiente in tiempos:
+        while t < siguiente:
+            a_max = float(np.max(np.linalg.norm(aceleracion, axis=1)))
+            v_max = float(np.max(np.linalg.norm(vel, axis=1)))
+            dt = min(dt_max, siguiente - t)
+            if a_max > 0:
+                dt = min(dt, eta * np.sqrt(suavizado / a_max))
+            if v_max > 0:
+                dt = min(dt, eta * suavizado / v_max)
+            dt = max(dt, min(dt_min, siguiente - t))
+
+            vel += 0.5 * dt * aceleracion
+            pos += dt * vel
+            if caja is not None:
+                for limite in (caja, -caja):
+                    fuera = pos > limite if limite > 0 else pos < limite
+                    pos[fuera] = 2 * limite - pos[fuera]
+                    vel[fuera] = -vel[fuera]
+            fuerzas, potenciales, _ = interaccion_coulomb(q, pos, k, metodo, theta, suavizado)
+            aceleracion = fuerzas / m
+            vel += 0.5 * dt * aceleracion
+            # Evita quedarse a un error de redondeo del fotograma
+            t = siguiente if siguiente - (t + dt) < 1e-12 * duracion else t + dt
+            pasos += 1
+        posiciones.append(pos.copy())
+        cineticas.append(0.5 * float(np.sum(m * vel**2)))
+        potenciales_totales.append(energia_potencial(q, potenciales))
+
+    return tiempos, np.stack(posiciones), np.array(cineticas), np.array(potenciales_totales), pasos
@@ -0,0 +1,39 @@
+"""Circuito RLC serie."""
+import numpy as np
+from scipy.integrate import odeint
+
+
+def voltaje_entrada(t, V0, tipo_excitacion, frecuencia):
+    if tipo_excitacion == 'escalon':
+        return V0
+    if tipo_excitacion == 'senoidal':
+        return V0 * np.sin(2 * np.pi * frecuencia * t)
+    return V0 if t < 1e-4 else 0  # impulso
+
+
+def derivadas_rlc(y, t, R, L, C, V0, tipo_excitacion, frecuencia):
+    """Lado derecho de L·di/dt + R·i + v_C = V_in, i = C·dv_C/dt."""
+    i, vc = y
+    V_in = voltaje_entrada(t, V0, tipo_excitacion, frecuencia)
+    return [(V_in - R * i - vc) / L, i / C]
+
+
+def respuesta_rlc(R, L, C, V0, tipo_excitacion, frecuencia, t):
+    """Integra el circuito desde reposo. C en faradios.
+
+    Devuelve (i, v_C, v_R, v_L) muestreados en `t`.
+    """
+    sol = odeint(derivadas_rlc, [0.0, 0.0], t,
+                 args=(R, L, C, V0, tipo_excitacion, frecuencia))
+    i = sol[:, 0]
+    vc = sol[:, 1]
+    return i, vc, R * i, L * np.gradient(i, t)
+
+
+def parametros_rlc(R, L, C):
+    """(ω₀, f₀, α, ζ, ω_d); ω_d = 0 si el circuito no es subamortiguado."""
+    omega0 = 1.0 / np.sqrt(L * C)
+    alpha = R / (2 * L)
+    zeta = alpha / omega0
+    omega_d = omega0 * np.sqrt(np.clip(1 - zeta**2, 0, None))
+    return omega0, omega0 / (2 * np.pi), alpha, zeta, omega_d
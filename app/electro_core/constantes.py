@@ -0,0 +1,7 @@
+"""Constantes físicas en SI."""
+import numpy as np
+
+MU0 = 4 * np.pi * 1e-7  # Permeabilidad del vacío (T·m/A)
+K_COULOMB = 8.9875e9  # Constante de Coulomb (N·m²/C²)
+EPS0 = 8.854e-12  # Permitividad del vacío (F/m)
+C_LUZ = 3e8  # Velocidad de la luz (m/s)
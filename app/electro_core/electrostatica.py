@@ -0,0 +1,54 @@
+"""Electrostática: cargas puntuales, esfera conductora y dipolos."""
+import numpy as np
+
+from electro_core.constantes import K_COULOMB
+
+
+def fuerza_coulomb(q1, q2, pos1, pos2, k=K_COULOMB):
+    """Fuerza sobre la carga 1 debida a la carga 2.
+
+    `pos1` y `pos2` tienen forma (..., 2) o (..., 3); las cargas se
+    difunden con ellas. Devuelve (vector fuerza, magnitud); si las cargas
+    coinciden la fuerza es cero.
+    """
+    q1 = np.asarray(q1, dtype=float)
+    q2 = np.asarray(q2, dtype=float)
+    r = np.asarray(pos1, dtype=float) - np.asarray(pos2, dtype=float)
+    distancia = np.linalg.norm(r, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitud = np.where(distancia > 0, k * np.abs(q1 * q2) / distancia**2, 0.0)
+        escala = np.where(distancia > 0, k * q1 * q2 / distancia**3, 0.0)
+    return escala[..., None] * r, magnitud
+
+
+def potencial_puntual(q, X, Y, k=K_COULOMB, r_cero=1e-10, x0=0.0, y0=0.0):
+    """Potencial k·q/r de una carga en (x0, y0); en r = 0 se usa r = r_cero."""
+    r = np.sqrt((X - x0)**2 + (Y - y0)**2)
+    r = np.where(r == 0, r_cero, r)
+    return k * q / r
+
+
+def campo_puntual(q, X, Y, k=K_COULOMB, x0=0.0, y0=0.0):
+    """Campo (Ex, Ey) de una carga en (x0, y0); cero sobre la carga."""
+    dX, dY = X - x0, Y - y0
+    r = np.sqrt(dX**2 + dY**2)
+    r = np.where(r == 0, np.inf, r)
+    return k * q * dX / r**3, k * q * dY / r**3
+
+
+def potencial_esfera_conductora(R, E0, X, Z):
+    """Esfera conductora aterrizada de radio R en un campo uniforme E0·ẑ."""
+    r = np.sqrt(X**2 + Z**2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        V_fuera = -E0 * Z * (1 - R**3 / r**3)
+    return np.where(r >= R, V_fuera, 0.0)
+
+
+def momento_dipolar_anillo(lambda0, R):
+    """|p| de un anillo con λ(φ) = λ₀·sin(φ); apunta en ŷ."""
+    return np.pi * lambda0 * R**2
+
+
+def torque(p, E):
+    """τ = p × E."""
+    return np.cross(p, E)
@@ -0,0 +1,182 @@
+"""Magnetostática: hilos rectos, Biot-Savart y dipolo magnético."""
+import numpy as np
+
+from electro_core.constantes import MU0
+from electro_core.superposicion import PRESUPUESTO
+
+
+def campo_hilo(I, x0, y0, X, Y, suavizado=1e-10):
+    """Campo (Bx, By) en teslas de un hilo infinito en (x0, y0) según ẑ."""
+    dX, dY = X - x0, Y - y0
+    r2 = dX**2 + dY**2 + suavizado
+    return -MU0 * I * dY / (2 * np.pi * r2), MU0 * I * dX / (2 * np.pi * r2)
+
+
+def _particion(n_fuentes, n_puntos, itemsize, temporales, presupuesto):
+    """(puntos por bloque, fuentes por grupo) con `temporales` arreglos (grupo, bloque) en `presupuesto`."""
+    celdas = max(presupuesto // (temporales * itemsize), 1)
+    bloque = max(min(n_puntos, celdas), 1)
+    return bloque, int(min(n_fuentes, max(celdas // bloque, 1)))
+
+
+def campo_hilos(I, x0, y0, X, Y, suavizado=1e-10, presupuesto=PRESUPUESTO):
+    """Campo (Bx, By) en teslas de N hilos infinitos según ẑ, superpuestos.
+
+    I, x0 e y0 son arreglos (N,). Es una sola evaluación hilos × puntos con
+    broadcasting; si no cabe en `presupuesto` bytes se parte en bloques de
+    puntos y grupos de hilos. El resultado tiene la forma y el tipo de X e Y.
+    """
+    X, Y = np.broadcast_arrays(X, Y)
+    dtype = np.result_type(X, Y, np.float32)
+    I, x0, y0 = (np.atleast_1d(np.asarray(v, dtype=dtype)) for v in (I, x0, y0))
+    puntos_x, puntos_y = X.ravel(), Y.ravel()
+    Bx = np.zeros(len(puntos_x), dtype=dtype)
+    By = np.zeros(len(puntos_x), dtype=dtype)
+
+    # Arreglos (grupo, bloque) vivos a la vez: dx, dy, dx², dy² e I/r²
+    bloque, grupo = _particion(len(I), len(puntos_x), np.dtype(dtype).itemsize, 5, presupuesto)
+    for p in range(0, len(puntos_x), bloque):
+        px, py = puntos_x[p:p + bloque], puntos_y[p:p + bloque]
+        for g in range(0, len(I), grupo):
+            dx = px[None, :] - x0[g:g + grupo, None]
+            dy = py[None, :] - y0[g:g + grupo, None]
+            inversa = I[g:g + grupo, None] / (dx**2 + dy**2 + suavizado)
+            Bx[p:p + bloque] -= np.einsum("hp,hp->p", inversa, dy)
+            By[p:p + bloque] += np.einsum("hp,hp->p", inversa, dx)
+
+    prefactor = MU0 / (2 * np.pi)
+    return (prefactor * Bx).reshape(X.shape), (prefactor * By).reshape(X.shape)
+
+
+def potencial_vector_hilos(I, x0, y0, X, Y, suavizado=1e-10, presupuesto=PRESUPUESTO):
+    """Potencial vector Az (T·m) de N hilos infinitos según ẑ, superpuestos.
+
+    Az = -μ₀/(2π) Σ I ln r, con Bx = ∂Az/∂y y By = -∂Az/∂x: las líneas de
+    campo son curvas de nivel de Az, y entre dos de ellas pasa un flujo por
+    unidad de longitud (Wb/m) igual a la diferencia de sus valores. Se
+    evalúa por bloques como campo_hilos; el resultado tiene la forma de X e Y.
+    """
+    X, Y = np.broadcast_arrays(X, Y)
+    dtype = np.result_type(X, Y, np.float32)
+    I, x0, y0 = (np.atleast_1d(np.asarray(v, dtype=dtype)) for v in (I, x0, y0))
+    puntos_x, puntos_y = X.ravel(), Y.ravel()
+    Az = np.zeros(len(puntos_x), dtype=dtype)
+
+    # Arreglos (grupo, bloque) vivos a la vez: dx, dy, r² y ln r²
+    bloque, grupo = _particion(len(I), len(puntos_x), np.dtype(dtype).itemsize, 4, presupuesto)
+    for p in range(0, len(puntos_x), bloque):
+        px, py = puntos_x[p:p + bloque], puntos_y[p:p + bloque]
+        for g in range(0, len(I), grupo):
+            dx = px[None, :] - x0[g:g + grupo, None]
+            dy = py[None, :] - y0[g:g + grupo, None]
+            Az[p:p + bloque] += np.einsum("h,hp->p", I[g:g + grupo], np.log(dx**2 + dy**2 + suavizado))
+
+    # ln r = ln(r²) / 2
+    return (-MU0 / (4 * np.pi) * Az).reshape(X.shape)
+
+
+def fuerzas_hilos(I, x0, y0, suavizado=1e-10):
+    """Fuerza por unidad de longitud (N/m) entre cada par de hilos paralelos.
+
+    Devuelve F (N, N, 2): F[i, j] es la fuerza sobre el hilo i debida al j,
+    F = -μ₀ I_i I_j (r_i - r_j) / (2π |r_i - r_j|²); corrientes del mismo
+    signo se atraen. La diagonal es cero y la fuerza neta es F.sum(axis=1).
+    """
+    I = np.asarray(I, dtype=float)
+    posiciones = np.stack([np.asarray(x0, dtype=float), np.asarray(y0, dtype=float)], axis=-1)
+    d = posiciones[:, None, :] - posiciones[None, :, :]
+    r2 = (d**2).sum(axis=-1) + suavizado
+    return -MU0 / (2 * np.pi) * (np.outer(I, I) / r2)[..., None] * d
+
+
+def campo_segmentos(puntos, inicios, finales, I, r_min=1e-6, presupuesto=PRESUPUESTO):
+    """Campo B (..., 3) en teslas de tramos rectos finitos de corriente, exacto.
+
+    Cada tramo a → b (`inicios` y `finales` (S, 3)) lleva la corriente I
+    (escalar o (S,)) y aporta la integral cerrada de Biot-Savart
+
+        B = μ₀I/(4π) · (r₁ × r₂)(|r₁| + |r₂|) / (|r₁||r₂|(|r₁||r₂| + r₁·r₂))
+
+    con r₁ = p - a y r₂ = p - b: un conductor recto es un solo tramo, sin
+    discretizarlo en elementos I·dl. Sobre la recta del tramo el numerador
+    se anula; a menos de `r_min` de ella (el propio conductor y sus
+    extremos, donde el campo diverge) el aporte del tramo es cero. Se evalúa
+    puntos × tramos por bloques, con los temporales dentro de `presupuesto`.
+    """
+    puntos = np.asarray(puntos, dtype=float)
+    planos = puntos.reshape(-1, 3)
+    a = np.asarray(inicios, dtype=float).reshape(-1, 3)
+    b = np.asarray(finales, dtype=float).reshape(-1, 3)
+    I = np.broadcast_to(np.asarray(I, dtype=float), (len(a),))
+    umbral = r_min**2 * ((b - a)**2).sum(axis=-1)  # |r₁ × r₂|² = d²·|b - a|²
+    B = np.zeros_like(planos)
+
+    # Arreglos (grupo, bloque) vivos a la vez: r₁, r₂ y r₁ × r₂ son de 3 componentes
+    bloque, grupo = _particion(len(a), len(planos), planos.itemsize, 14, presupuesto)
+    for p in range(0, len(planos), bloque):
+        punto = planos[None, p:p + bloque]
+        for g in range(0, len(a), grupo):
+            r1 = punto - a[g:g + grupo, None]
+            r2 = punto - b[g:g + grupo, None]
+            cruz = np.cross(r1, r2)
+            n1 = np.sqrt(np.einsum("spk,spk->sp", r1, r1))
+            n2 = np.sqrt(np.einsum("spk,spk->sp", r2, r2))
+            denominador = n1 * n2 * (n1 * n2 + np.einsum("spk,spk->sp", r1, r2))
+            lejos = np.einsum("spk,spk->sp", cruz, cruz) > umbral[g:g + grupo, None]
+            factor = np.divide(I[g:g + grupo, None] * (n1 + n2), denominador,
+                               out=np.zeros_like(denominador), where=lejos)
+            B[p:p + bloque] += np.einsum("sp,spk->pk", factor, cruz)
+
+    return (MU0 / (4 * np.pi) * B).reshape(puntos.shape)
+
+
+def campo_polilinea(puntos, vertices, I, cerrada=False, r_min=1e-6, presupuesto=PRESUPUESTO):
+    """Campo B (..., 3) en teslas de una corriente I por la poligonal `vertices` (V, 3).
+
+    La corriente va del primer vértice al último (y de vuelta al primero si
+    `cerrada`); cada lado es un tramo exacto de campo_segmentos.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    if cerrada:
+        vertices = np.concatenate([vertices, vertices[:1]])
+    return campo_segmentos(puntos, vertices[:-1], vertices[1:], I, r_min, presupuesto)
+
+
+def campo_dipolo(m, x, y, z, suavizado=1e-10):
+    """Campo (Bx, By, Bz, |B|) en teslas de un dipolo m·ẑ en el origen."""
+    r = np.sqrt(x**2 + y**2 + z**2)
+    prefactor = MU0 * m / (4 * np.pi)
+    denominador = r**5 + suavizado
+    Bx = prefactor * 3 * x * z / denominador
+    By = prefactor * 3 * y * z / denominador
+    Bz = prefactor * (3 * z**2 - r**2) / denominador
+    return Bx, By, Bz, np.sqrt(Bx**2 + By**2 + Bz**2)
+
+
+def lineas_de_campo(campo, semillas, pasos, paso):
+    """Integra todas las líneas de campo a la vez con pasos de Euler normalizados.
+
+    `campo(x, y, z)` devuelve (Bx, By, Bz, |B|) para arreglos. Desde cada
+    semilla (N, 3) se avanzan `pasos` puntos hacia adelante y otros tantos
+    hacia atrás. Devuelve (trayectorias (N, 2·pasos, 3), |B| (N, 2·pasos)),
+    ordenadas de atrás hacia adelante; la semilla aparece dos veces.
+    """
+    semillas = np.asarray(semillas, dtype=float)
+
+    def integrar(sentido):
+        pos = semillas.copy()
+        posiciones, magnitudes = [], []
+        for _ in range(pasos):
+            Bx, By, Bz, B_mag = campo(pos[:, 0], pos[:, 1], pos[:, 2])
+            posiciones.append(pos.copy())
+            magnitudes.append(B_mag)
+            direccion = np.stack([Bx, By, Bz], axis=-1)
+            direccion = direccion / (np.linalg.norm(direccion, axis=-1, keepdims=True) + 1e-10)
+            pos = pos + sentido * paso * direccion
+        return np.stack(posiciones, axis=1), np.stack(magnitudes, axis=1)
+
+    adelante, B_adelante = integrar(+1)
+    atras, B_atras = integrar(-1)
+    trayectorias = np.concatenate([atras[:, ::-1], adelante], axis=1)
+    magnitudes = np.concatenate([B_atras[:, ::-1], B_adelante], axis=1)
+    return trayectorias, magnitudes
@@ -0,0 +1,97 @@
+"""Ondas guiadas: fibra óptica de índice escalonado y guía rectangular."""
+import numpy as np
+
+from electro_core.constantes import C_LUZ
+
+
+def angulo_critico(n_nucleo, n_revestimiento):
+    """Ángulo crítico en grados; 90° si no hay reflexión total posible."""
+    n_nucleo = np.asarray(n_nucleo, dtype=float)
+    n_revestimiento = np.asarray(n_revestimiento, dtype=float)
+    cociente = np.clip(n_revestimiento / n_nucleo, -1.0, 1.0)
+    return np.where(n_nucleo <= n_revestimiento, 90.0, np.degrees(np.arcsin(cociente)))
+
+
+def trayectoria_fibra(n_nucleo, n_revestimiento, angulo_incidencia, radio_nucleo, longitud_fibra,
+                      max_pasos=20):
+    """Traza un rayo meridional dentro del núcleo.
+
+    Devuelve (trayectoria (K, 3), reflexiones (R, 3), ángulo crítico).
+    """
+    critico = float(angulo_critico(n_nucleo, n_revestimiento))
+    theta_i = np.radians(angulo_incidencia)
+
+    # Punto inicial
+    x, y, z = 0, -radio_nucleo * 0.8, 0
+    trayectoria = [(x, y, z)]
+    reflexiones = []
+
+    # Vector dirección inicial
+    direccion = np.array([np.sin(theta_i), 0, np.cos(theta_i)])
+
+    for _ in range(max_pasos):
+        if z > longitud_fibra:
+            break
+
+        # Intersección con la pared del núcleo
+        a = direccion[0]**2 + direccion[1]**2
+        b = 2 * (x * direccion[0] + y * direccion[1])
+        c = x**2 + y**2 - radio_nucleo**2
+
+        discriminante = b**2 - 4 * a * c
+        if discriminante < 0:
+            break
+
+        t = (-b - np.sqrt(discriminante)) / (2 * a)
+        if t <= 0:
+            t = (-b + np.sqrt(discriminante)) / (2 * a)
+
+        x_nuevo = x + direccion[0] * t
+        y_nuevo = y + direccion[1] * t
+        z_nuevo = z + direccion[2] * t
+
+        if z_nuevo > longitud_fibra:
+            t_final = (longitud_fibra - z) / direccion[2]
+            trayectoria.append((x + direccion[0] * t_final, y + direccion[1] * t_final, longitud_fibra))
+            break
+
+        trayectoria.append((x_nuevo, y_nuevo, z_nuevo))
+
+        # Reflexión total interna
+        if angulo_incidencia > critico:
+            normal = np.array([x_nuevo, y_nuevo, 0])
+            normal = normal / np.linalg.norm(normal)
+            direccion = direccion - 2 * np.dot(direccion, normal) * normal
+            reflexiones.append((x_nuevo, y_nuevo, z_nuevo))
+        else:
+            break
+
+        x, y, z = x_nuevo, y_nuevo, z_nuevo
+
+    return np.array(trayectoria), np.array(reflexiones).reshape(-1, 3), critico
+
+
+def campos_TE(X, Y, a, b, m, n):
+    """Patrón transversal (Ex, Ey, Ez) del modo TEmn; nulo para TE00."""
+    if m == 0 and n == 0:
+        return np.zeros_like(X), np.zeros_like(X), np.zeros_like(X)
+    Ex = (n / b) * np.cos(m * np.pi * X / a) * np.sin(n * np.pi * Y / b)
+    Ey = (-m / a) * np.sin(m * np.pi * X / a) * np.cos(n * np.pi * Y / b)
+    return Ex, Ey, np.zeros_like(Ex)
+
+
+def campos_TM(X, Y, a, b, m, n):
+    """Patrón (Ex, Ey, Ez) del modo TMmn; nulo si m o n son cero."""
+    if m == 0 or n == 0:
+        return np.zeros_like(X), np.zeros_like(X), np.zeros_like(X)
+    Ex = (m / a) * np.cos(m * np.pi * X / a) * np.sin(n * np.pi * Y / b)
+    Ey = (n / b) * np.sin(m * np.pi * X / a) * np.cos(n * np.pi * Y / b)
+    Ez = np.sin(m * np.pi * X / a) * np.sin(n * np.pi * Y / b)
+    return Ex, Ey, Ez
+
+
+def frecuencia_corte(a, b, m, n):
+    """Frecuencia de corte en GHz para a, b en cm; acepta arreglos."""
+    a_m = np.asarray(a) * 0.01
+    b_m = np.asarray(b) * 0.01
+    return (C_LUZ / 2) * np.sqrt((np.asarray(m) / a_m)**2 + (np.asarray(n) / b_m)**2) / 1e9
@@ -0,0 +1,111 @@
+"""Ecuación de Poisson ∇²V = -ρ/ε₀ en una malla 2D por diferencias finitas.
+
+Laplaciano de 5 puntos sobre una malla regular de paso h. Los nodos fijos
+(el borde de la malla, que siempre lo es, y los conductores) tienen un
+potencial dado; el resto son incógnitas. Para las incógnitas queda
+
+    A·V = h²·ρ/ε₀ + B·V_fijos
+
+con A (4 en la diagonal, -1 por vecino libre) y B (1 por vecino fijo), que
+sólo dependen de la geometría. A se factoriza una vez con splu y la
+factorización se guarda por geometría y malla (ver factorizacion): cambiar
+el potencial de un conductor, los valores del borde o las cargas cuesta
+una sola sustitución hacia adelante y hacia atrás.
+
+En 2D una "carga" es una densidad lineal (C/m) a lo largo del eje
+perpendicular a la malla, y un conductor es un cilindro infinito de esa
+sección.
+"""
+from functools import lru_cache
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import splu
+
+from electro_core.constantes import EPS0
+
+# Geometrías factorizadas que se conservan a la vez
+GEOMETRIAS_CACHE = 16
+
+_VECINOS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _con_borde(fijos):
+    """Los nodos fijos, con el marco exterior de la malla incluido."""
+    fijos = np.array(fijos, dtype=bool)
+    fijos[[0, -1], :] = True
+    fijos[:, [0, -1]] = True
+    return fijos
+
+
+class Poisson:
+    """Laplaciano factorizado de una geometría: resuelve con distintos valores y cargas."""
+
+    def __init__(self, fijos, h):
+        self.fijos = _con_borde(fijos)
+        self.h = float(h)
+        ny, nx = self.fijos.shape
+        self.libres = np.flatnonzero(~self.fijos)
+        numero = np.full(ny * nx, -1)
+        numero[self.libres] = np.arange(len(self.libres))
+
+        filas_a, columnas_a = [np.arange(len(self.libres))], [np.arange(len(self.libres))]
+        valores_a = [np.full(len(self.libres), 4.0)]
+        filas_b, columnas_b = [], []
+        for di, dj in _VECINOS:
+            # Las incógnitas nunca están en el borde: sus cuatro vecinos existen
+            vecino = self.libres + di * nx + dj
+            libre = numero[vecino] >= 0
+            filas_a.append(numero[self.libres[libre]])
+            columnas_a.append(numero[vecino[libre]])
+            valores_a.append(np.full(libre.sum(), -1.0))
+            filas_b.append(numero[self.libres[~libre]])
+            columnas_b.append(vecino[~libre])
+
+        n = len(self.libres)
+        A = coo_matrix((np.concatenate(valores_a), (np.concatenate(filas_a), np.concatenate(columnas_a))),
+                       shape=(n, n))
+        filas_b, columnas_b = np.concatenate(filas_b), np.concatenate(columnas_b)
+        self.B = coo_matrix((np.ones(len(filas_b)), (filas_b, columnas_b)), shape=(n, ny * nx)).tocsr()
+        self.lu = splu(A.tocsc())
+
+    def resolver(self, valores, rho=None, eps=EPS0):
+        """V (ny, nx): `valores` en los nodos fijos y ∇²V = -rho/eps en el resto.
+
+        `valores` y `rho` (C/m³) tienen la forma de la malla; de `valores`
+        sólo se leen los nodos fijos y de `rho` sólo los libres.
+        """
+        V = np.array(valores, dtype=float)
+        derecha = self.B @ V.ravel()
+        if rho is not None:
+            derecha += self.h**2 / eps * np.asarray(rho, dtype=float).ravel()[self.libres]
+        V.ravel()[self.libres] = self.lu.solve(derecha)
+        return V
+
+    def carga(self, V, eps=EPS0):
+        """Carga por nodo (C/m por unidad de longitud): ε₀·(4V - Σ vecinos).
+
+        En un nodo libre es la fuente que se puso; en un conductor es la
+        carga inducida en su superficie. En el borde de la malla no se mide.
+        """
+        V = np.asarray(V, dtype=float)
+        q = np.zeros_like(V)
+        q[1:-1, 1:-1] = eps * (4 * V[1:-1, 1:-1] - V[:-2, 1:-1] - V[2:, 1:-1] - V[1:-1, :-2] - V[1:-1, 2:])
+        return q
+
+
+@lru_cache(maxsize=GEOMETRIAS_CACHE)
+def _factorizacion(forma, h, bits):
+    fijos = np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=forma[0] * forma[1])
+    return Poisson(fijos.reshape(forma).astype(bool), h)
+
+
+def factorizacion(fijos, h):
+    """Poisson de esta geometría; la misma instancia mientras siga en la caché."""
+    fijos = _con_borde(fijos)
+    return _factorizacion(fijos.shape, float(h), np.packbits(fijos).tobytes())
+
+
+def resolver_poisson(fijos, valores, h, rho=None, eps=EPS0):
+    """V (ny, nx) con la factorización guardada de la geometría `fijos`."""
+    return factorizacion(fijos, h).resolver(valores, rho, eps)
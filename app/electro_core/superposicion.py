@@ -0,0 +1,83 @@
+"""Potencial y campo de muchas cargas sobre una malla, con memoria acotada.
+
+Evaluar N cargas sobre una malla de res×res de una sola vez crea
+temporales de N×res×res: 8 GB para 1000 cargas con res=1000. Aquí la malla
+se parte en bloques de filas y las cargas en grupos, de modo que los
+temporales de un bloque nunca pasan de su parte de `presupuesto` bytes.
+Los bloques se reparten en un grupo de hilos (NumPy suelta el GIL en las
+operaciones sobre arreglos grandes) y cada uno escribe su propia franja
+del resultado, así que no hace falta sincronizarlos.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from electro_core.constantes import K_COULOMB
+
+# Memoria de trabajo por evaluación, repartida entre los hilos
+PRESUPUESTO = int(os.environ.get("ELECTRO_SUPERPOSICION_MB", "64")) * 2**20
+# Hilos por evaluación; 0 usa todos los núcleos
+HILOS = int(os.environ.get("ELECTRO_SUPERPOSICION_HILOS", "0"))
+
+# Arreglos de (cargas × filas × columnas) vivos a la vez dentro de un bloque
+_TEMPORALES = {False: 2, True: 4}
+
+
+def particion(n_cargas, ny, nx, itemsize, presupuesto, campo=False):
+    """(cargas por grupo, filas por bloque) que caben en `presupuesto` bytes."""
+    celdas = max(presupuesto // (_TEMPORALES[campo] * itemsize), 1)
+    grupo = int(min(n_cargas, max(celdas // nx, 1)))
+    filas = int(min(ny, max(celdas // (nx * grupo), 1)))
+    return grupo, filas
+
+
+def superponer(q, xq, yq, x, y, k=K_COULOMB, r_cero=1e-10, campo=False,
+               presupuesto=PRESUPUESTO, hilos=HILOS):
+    """Potencial de N cargas en (xq, yq) sobre la malla x (nx,) × y (ny,).
+
+    Devuelve V (ny, nx), o (V, Ex, Ey) con `campo`. El resultado tiene el
+    tipo de x e y, así que una malla en float32 (ver electro_core/mallas.py)
+    calcula todo en float32. Como en potencial_puntual, sobre una carga se
+    usa r = r_cero; ahí el campo de esa carga es cero.
+    """
+    x = np.asarray(x).ravel()
+    y = np.asarray(y).ravel()
+    dtype = np.result_type(x, y, np.float32)
+    q = np.asarray(q, dtype=dtype).ravel()
+    xq = np.asarray(xq, dtype=dtype).ravel()
+    yq = np.asarray(yq, dtype=dtype).ravel()
+    ny, nx = len(y), len(x)
+    hilos = hilos or os.cpu_count() or 1
+
+    grupo, filas = particion(len(q), ny, nx, np.dtype(dtype).itemsize, presupuesto // hilos, campo)
+    salidas = [np.zeros((ny, nx), dtype=dtype) for _ in range(3 if campo else 1)]
+
+    def bloque(inicio):
+        fin = min(inicio + filas, ny)
+        franjas = [salida[inicio:fin] for salida in salidas]
+        for c in range(0, len(q), grupo):
+            dx = x[None, None, :] - xq[c:c + grupo, None, None]  # (C, 1, nx)
+            dy = y[None, inicio:fin, None] - yq[c:c + grupo, None, None]  # (C, R, 1)
+            inversa = dx**2 + dy**2
+            np.sqrt(inversa, out=inversa)
+            np.copyto(inversa, r_cero, where=inversa == 0)
+            np.divide(1, inversa, out=inversa)
+            cargas = q[c:c + grupo]
+            franjas[0] += np.tensordot(cargas, inversa, axes=1)
+            if campo:
+                inversa **= 3
+                franjas[1] += np.tensordot(cargas, dx * inversa, axes=1)
+                franjas[2] += np.tensordot(cargas, dy * inversa, axes=1)
+
+    inicios = range(0, ny, filas)
+    if hilos == 1 or len(inicios) == 1:
+        for inicio in inicios:
+            bloque(inicio)
+    else:
+        with ThreadPoolExecutor(max_workers=hilos) as grupo_hilos:
+            list(grupo_hilos.map(bloque, inicios))
+
+    for salida in salidas:
+        salida *= k
+    return salidas[0] if not campo else tuple(salidas)
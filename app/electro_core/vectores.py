@@ -0,0 +1,18 @@
+"""Utilidades para campos vectoriales en mallas."""
+import numpy as np
+
+
+def magnitud(*componentes):
+    return np.sqrt(sum(c**2 for c in componentes))
+
+
+def normalizar(*componentes, umbral=0.0):
+    """Componentes del vector unitario; cero donde la magnitud no supera `umbral`."""
+    norma = magnitud(*componentes)
+    valido = norma > umbral
+    unitarios = []
+    for c in componentes:
+        u = np.zeros_like(c)
+        u[valido] = c[valido] / norma[valido]
+        unitarios.append(u)
+    return tuple(unitarios)
@@ -1,16 +1,9 @@
 import streamlit as st
 import datetime
-from simulations.coulomb import mostrar_simulacion_coulomb
-from simulations.puntualfield import campo_electrico_carga_puntual
-from simulations.potencial import potencial_electrostatico
-from simulations.conductor import esfera_conductora
-from simulations.hilosmag import campo_magnetico_hilos_interactivo
-from simulations.BiotSavart import biot_savart_3d
-from simulations.torquedip import simular_anillo_campo_electrico
-from simulations.NoMonop import simular_campo_magnetico_bucle
-from simulations.FibraOp import simular_fibra_optica_3d
-from simulations.GuiaOnda import simular_guia_onda_mejorada
-from simulations.RLC import simular_circuito_rlc
+from registro import ejecutar_simulacion, tiempos_importacion
+from recursos import mostrar_escudo
+from simulations import metricas
+from simulations.cache import caches
 
 # Configuración de la página
 st.set_page_config(
@@ -136,6 +129,9 @@ seccion = st.sidebar.radio(
 st.sidebar.markdown("---")
 st.sidebar.header("🔧 Configuración")
 
+mostrar_metricas = st.sidebar.checkbox("📈 Mostrar métricas de rendimiento", False)
+metricas.nuevo_rerun()
+
 st.sidebar.info("""
 **Para prevenir inactividad:**
 📱
@@ -158,11 +154,10 @@ if seccion == "Inicio":
     col1, col2, col3 = st.columns([1, 2, 1])
        
     with col1:
-        # Escudo UNAM desde URL
+        # Escudo UNAM (copia local, ya reducida)
         try:
-            st.image("https://yosoycide.com/wp-content/uploads/2020/03/unam-escudo.png", 
-                 width=100)
-        except:
+            mostrar_escudo("unam_escudo.png")
+        except OSError:
             st.info("No se pudo cargar el escudo UNAM")
     
     with col2:
@@ -174,11 +169,10 @@ if seccion == "Inicio":
         """, unsafe_allow_html=True)
     
     with col3:
-        # Escudo Facultad de Ciencias desde URL
+        # Escudo Facultad de Ciencias (copia local, ya reducida)
         try:
-            st.image("https://iconape.com/wp-content/png_logo_vector/facultad-de-ciencias-unam-logo.png", 
-                 width=100)
-        except:
+            mostrar_escudo("fciencias_escudo.png")
+        except OSError:
             st.info("No se pudo cargar el escudo de Facultad de Ciencias")
     
     # Separador
@@ -243,22 +237,26 @@ elif seccion == "Electrostática":
     
     if subtema == "Ley de Coulomb":
         st.subheader("🔌 Simulación de la Ley de Coulomb")
-        mostrar_simulacion_coulomb()
+        ejecutar_simulacion(seccion, subtema)
     
     elif subtema == "Campos y potenciales eléctricos":
-        tab1, tab2 = st.tabs(["📊 Potencial Eléctrico", "🧭 Campo Eléctrico"])
-        with tab1:
-            potencial_electrostatico()
-        with tab2:
-            campo_electrico_carga_puntual()
+        # Sólo se calcula la pestaña abierta; cambiar de pestaña vuelve a correr la app
+        tab1, tab2 = st.tabs(["📊 Potencial Eléctrico", "🧭 Campo Eléctrico"],
+                             key="pestanas_campos", on_change="rerun")
+        if tab1.open:
+            with tab1:
+                ejecutar_simulacion(seccion, "Potencial eléctrico")
+        if tab2.open:
+            with tab2:
+                ejecutar_simulacion(seccion, "Campo eléctrico")
     
     elif subtema == "Conductores":
         st.subheader("🔗 Esfera Conductora")
-        esfera_conductora()
+        ejecutar_simulacion(seccion, subtema)
     
     elif subtema == "Torque sobre una distribución de carga":
         st.info("Anillo con distribución de carga λ(φ)=λ₀·sin(φ)")
-        simular_anillo_campo_electrico()
+        ejecutar_simulacion(seccion, subtema)
     
     elif subtema == "Energía electrostática":
         st.info("🚧 Simulación en desarrollo - Próximamente")
@@ -276,15 +274,15 @@ elif seccion == "Magnetostática":
     
     if subtema == "Ley de Biot-Savart":
         st.subheader("🔄 Ley de Biot-Savart en 3D")
-        biot_savart_3d()
+        ejecutar_simulacion(seccion, subtema)
     
     elif subtema == "Campo de inducción magnética":
         st.subheader("🧵 Campo Magnético de Hilos Paralelos")
-        campo_magnetico_hilos_interactivo()
+        ejecutar_simulacion(seccion, subtema)
     
     elif subtema == "No existencia de monopolos magnéticos":
         st.info("🧲 Campo Magnético de un Bucle de Corriente")
-        simular_campo_magnetico_bucle()
+        ejecutar_simulacion(seccion, subtema)
 
 elif seccion == "Ondas Electromagnéticas":
     st.header("🌊 Ondas Electromagnéticas")
@@ -295,11 +293,11 @@ elif seccion == "Ondas Electromagnéticas":
     
     if subtema == "Fibra óptica":
         st.subheader("〽️ Reflexión total interna para una fibra óptica")
-        simular_fibra_optica_3d()
+        ejecutar_simulacion(seccion, subtema)
 
     elif subtema == "Guías de onda":
         st.subheader("📡 Guía de onda en TM y TE")
-        simular_guia_onda_mejorada()
+        ejecutar_simulacion(seccion, subtema)
 
 elif seccion == "Circuitos Eléctricos":
     st.header("🔌 Circuitos Eléctricos")
@@ -310,10 +308,42 @@ elif seccion == "Circuitos Eléctricos":
     
     if subtema == "Circuitos RL, RC y RLC":
         st.subheader(" Simulación de Circuito RLC")
-        simular_circuito_rlc()
+        ejecutar_simulacion(seccion, subtema)
 
     elif subtema == "Leyes de Kirchhoff":
         st.info("🚧 Simulación en desarrollo - Próximamente")
     
     elif subtema == "Teoremas de Thevenin y Norton":
         st.info("🚧 Simulación en desarrollo - Próximamente")
+
+# Costo de importación de los módulos cargados en este proceso
+if tiempos_importacion:
+    with st.sidebar.expander("⏱️ Importación de simulaciones"):
+        for modulo, segundos in sorted(tiempos_importacion.items(), key=lambda par: par[1], reverse=True):
+            st.markdown(f"`{modulo}`: {segundos * 1000:.0f} ms")
+
+# Panel de rendimiento (opcional)
+if mostrar_metricas:
+    with st.sidebar.expander("📈 Rendimiento del último rerun"):
+        medidas = metricas.simulaciones_del_rerun()
+        if not medidas:
+            st.caption("Esta página no ejecutó ninguna simulación.")
+        for medida in medidas:
+            etapas = medida["etapas"]
+            st.markdown(f"**{medida['nombre']}**: {medida['total'] * 1000:.0f} ms")
+            st.markdown(
+                f"- Cálculo: {etapas.get('calculo', 0) * 1000:.0f} ms\n"
+                f"- Figura: {etapas.get('figura', 0) * 1000:.0f} ms\n"
+                f"- Rasterizado: {etapas.get('rasterizado', 0) * 1000:.0f} ms\n"
+                f"- Espera de proceso: {etapas.get('cola', 0) * 1000:.0f} ms\n"
+                f"- Envío (st.image): {etapas.get('envio', 0) * 1000:.0f} ms\n"
+                f"- Imagen enviada: {medida['bytes'] / 1024:.0f} KiB"
+            )
+        if caches:
+            st.markdown("**Cachés de figuras**")
+            for nombre, cache in sorted(caches.items()):
+                e = cache.estadisticas()
+                st.markdown(
+                    f"`{nombre}`: {e['aciertos']} aciertos / {e['fallos']} fallos, "
+                    f"{e['bytes'] / 2**20:.1f} de {e['max_bytes'] / 2**20:.0f} MiB"
+                )
@@ -0,0 +1,126 @@
+"""Comparación float32 contra float64 en las mallas que sólo se dibujan.
+
+Para cada simulación con malla (en su resolución más alta) mide el tiempo y
+el pico de memoria del cálculo y de la figura completa en las dos
+precisiones, y verifica que el error visual de float32 se quede por debajo
+de un contenedor del mapa de color: el valor normalizado que recibe el
+mapa (con la norma que usa la página) no puede moverse ni un nivel de
+contourf ni una de las 256 entradas del colormap.
+
+    python app/precision.py
+    python app/precision.py --repeticiones 5 --salida precision.json
+
+Sale con código 1 si alguna simulación supera el contenedor.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from matplotlib.colors import LogNorm, Normalize, SymLogNorm
+
+from simulations import conductor, hilosmag, potencial, puntualfield
+
+PRECISIONES = ("float64", "float32")
+
+
+def norma_potencial(X, Y, V):
+    vmax = np.max(np.abs(V))
+    return V, SymLogNorm(linthresh=0.1 * vmax, vmin=-vmax, vmax=vmax)
+
+
+def norma_campo_puntual(X, Y, Ex, Ey, E_magnitude, V):
+    valid = E_magnitude > 0
+    return E_magnitude, LogNorm(vmin=E_magnitude[valid].min() * 1.5, vmax=E_magnitude.max() * 0.8)
+
+
+def norma_hilos(X, Y, B1, B2, B_total):
+    return B_total[2], Normalize(vmin=0, vmax=B_total[2].max())
+
+
+def norma_conductor(X, Z, V):
+    return V, Normalize(vmin=V.min(), vmax=V.max())
+
+
+# nombre -> (cálculo y sus argumentos, figura completa y los suyos, norma de la página, contenedores)
+ESCENARIOS = {
+    "potencial": (potencial.calcular_potencial, (10.0, 1000),
+                  potencial.dibujar_potencial, (10.0, 1000), norma_potencial, 100),
+    "puntualfield": (puntualfield.calcular_campo_puntual, (5.0, 100),
+                     puntualfield.dibujar_campo_puntual, (5.0, 100), norma_campo_puntual, 256),
+    "hilosmag": (hilosmag.calcular_hilos, (-0.5, 0.0, 1.0, 0.5, 0.0, 1.0, 30),
+                 hilosmag.dibujar_hilos, (-0.5, 0.0, 1.0, 0.5, 0.0, 1.0, True, True, 30), norma_hilos, 256),
+    "conductor": (conductor.calcular_esfera_conductora, (1.0, 1.0),
+                  conductor.dibujar_esfera_conductora, (1.0, 1.0), norma_conductor, 256),
+}
+
+
+def medir(funcion, repeticiones):
+    """(mejor tiempo en s, pico de memoria en MiB) de funcion()."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(tiempos), pico / 2**20
+
+
+def error_en_contenedores(calcular, args, norma, contenedores):
+    """Máximo desplazamiento del valor normalizado, en contenedores del mapa."""
+    normalizados = []
+    for precision in PRECISIONES:
+        valores, norma_pagina = norma(*calcular(*args, precision=precision))
+        normalizados.append(np.clip(np.ma.filled(norma_pagina(np.asarray(valores, dtype=float)), np.nan), 0, 1))
+    return float(np.nanmax(np.abs(normalizados[1] - normalizados[0]))) * contenedores
+
+
+def comparar(repeticiones):
+    resultados = {}
+    for nombre, (calcular, args, dibujar, args_figura, norma, contenedores) in ESCENARIOS.items():
+        dibujar_sin_cache = dibujar.__wrapped__
+        resultado = {"contenedores": contenedores}
+        for precision in PRECISIONES:
+            calculo_s, calculo_mb = medir(lambda: calcular(*args, precision=precision), repeticiones)
+            total_s, total_mb = medir(lambda: dibujar_sin_cache(*args_figura, precision=precision), repeticiones)
+            resultado[precision] = {"calculo_s": calculo_s, "calculo_mb": calculo_mb,
+                                    "total_s": total_s, "total_mb": total_mb}
+        resultado["error_contenedores"] = error_en_contenedores(calcular, args, norma, contenedores)
+        resultados[nombre] = resultado
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--salida", help="escribe los resultados como JSON en este archivo")
+    args = parser.parse_args()
+
+    resultados = comparar(args.repeticiones)
+    print(f"{'Simulación':<14} {'Cálculo f64 → f32':>26} {'Figura f64 → f32':>26} {'Error':>14}")
+    for nombre, r in resultados.items():
+        a, b = r["float64"], r["float32"]
+        print(f"{nombre:<14} {a['calculo_s'] * 1000:6.1f} → {b['calculo_s'] * 1000:6.1f} ms "
+              f"{a['calculo_mb']:5.1f} → {b['calculo_mb']:5.1f} MiB  "
+              f"{a['total_s'] * 1000:6.0f} → {b['total_s'] * 1000:6.0f} ms "
+              f"{a['total_mb']:5.1f} → {b['total_mb']:5.1f} MiB  "
+              f"{r['error_contenedores']:.1e}/{r['contenedores']} cont.")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump({"python": platform.python_version(), "numpy": np.__version__,
+                       "repeticiones": args.repeticiones, "simulaciones": resultados},
+                      archivo, indent=2, ensure_ascii=False)
+
+    if any(r["error_contenedores"] >= 1 for r in resultados.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
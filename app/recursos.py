@@ -0,0 +1,88 @@
+"""Imágenes institucionales servidas desde el propio repositorio.
+
+Los escudos de app/static se reducen una vez al ancho con el que se muestran
+(al doble, para pantallas de alta densidad) y se escriben en
+app/static/generadas con el hash del contenido en el nombre. Como el nombre
+cambia cuando cambia la imagen, el navegador puede guardarla indefinidamente
+y revalidarla con el ETag que manda el servidor de archivos estáticos de
+Streamlit; no se depende de ningún host externo.
+
+Ejecutado como script prepara los escudos de antemano (lo hace el Dockerfile):
+
+    python app/recursos.py
+"""
+import hashlib
+import io
+import os
+import threading
+
+import streamlit as st # type: ignore
+from PIL import Image # type: ignore
+
+DIRECTORIO_STATIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIRECTORIO_GENERADAS = os.path.join(DIRECTORIO_STATIC, "generadas")
+URL_STATIC = "app/static"
+DENSIDAD = 2  # píxeles reales por píxel CSS
+
+# Escudos que usa la página de inicio y el ancho (px CSS) con que se muestran
+ESCUDOS = {
+    "unam_escudo.png": 100,
+    "fciencias_escudo.png": 100,
+}
+
+# (nombre, ancho) -> (nombre del archivo generado, bytes)
+_generadas = {}
+_candado = threading.Lock()
+
+
+def redimensionar(nombre, ancho):
+    """PNG de `nombre` reducido a `ancho` px CSS, como bytes."""
+    with Image.open(os.path.join(DIRECTORIO_STATIC, nombre)) as imagen:
+        ancho_px = min(ancho * DENSIDAD, imagen.width)
+        alto_px = round(imagen.height * ancho_px / imagen.width)
+        reducida = imagen.resize((ancho_px, alto_px), Image.LANCZOS)
+        buffer = io.BytesIO()
+        reducida.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def preparar(nombre, ancho):
+    """Genera (una vez por proceso) la versión reducida con hash en el nombre."""
+    with _candado:
+        if (nombre, ancho) not in _generadas:
+            datos = redimensionar(nombre, ancho)
+            resumen = hashlib.sha256(datos).hexdigest()[:12]
+            base, extension = os.path.splitext(nombre)
+            archivo = f"{base}.{ancho}w.{resumen}{extension}"
+            destino = os.path.join(DIRECTORIO_GENERADAS, archivo)
+            if not os.path.exists(destino):
+                try:
+                    os.makedirs(DIRECTORIO_GENERADAS, exist_ok=True)
+                    with open(destino + ".tmp", "wb") as salida:
+                        salida.write(datos)
+                    os.replace(destino + ".tmp", destino)
+                except OSError:
+                    archivo = None  # sin escritura: se sirve desde memoria
+            _generadas[(nombre, ancho)] = (archivo, datos)
+        return _generadas[(nombre, ancho)]
+
+
+def mostrar_escudo(nombre, ancho=None):
+    """Muestra un escudo local, por URL estática si está habilitada."""
+    ancho = ancho or ESCUDOS[nombre]
+    archivo, datos = preparar(nombre, ancho)
+    if archivo and st.get_option("server.enableStaticServing"):
+        st.markdown(
+            f'<div style="text-align: center;"><img src="{URL_STATIC}/generadas/{archivo}" '
+            f'width="{ancho}" alt="{nombre}"></div>',
+            unsafe_allow_html=True,
+        )
+    else:
+        # st.image también usa una URL derivada del contenido
+        st.image(datos, width=ancho)
+
+
+if __name__ == "__main__":
+    for nombre, ancho in ESCUDOS.items():
+        archivo, datos = preparar(nombre, ancho)
+        print(f"{archivo}: {len(datos) / 1024:.1f} KiB")
@@ -0,0 +1,106 @@
+"""Registro de simulaciones con importación diferida.
+
+Cada (sección, subtema) apunta al módulo y a la función que lo dibuja. El
+módulo sólo se importa la primera vez que se elige ese subtema, así que un
+visitante que se queda en "Inicio" no paga matplotlib, mplot3d ni scipy.
+
+Ejecutado como script imprime el costo de importación en frío de cada
+módulo, midiendo cada uno en un intérprete nuevo:
+
+    python app/registro.py
+"""
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import streamlit as st
+
+from simulations import metricas, procesos, prometheus
+
+# (sección, subtema) -> (módulo, función)
+SIMULACIONES = {
+    ("Electrostática", "Ley de Coulomb"): ("simulations.coulomb", "mostrar_simulacion_coulomb"),
+    ("Electrostática", "Potencial eléctrico"): ("simulations.potencial", "potencial_electrostatico"),
+    ("Electrostática", "Campo eléctrico"): ("simulations.puntualfield", "campo_electrico_carga_puntual"),
+    ("Electrostática", "Conductores"): ("simulations.conductor", "esfera_conductora"),
+    ("Electrostática", "Torque sobre una distribución de carga"): ("simulations.torquedip", "simular_anillo_campo_electrico"),
+    ("Magnetostática", "Ley de Biot-Savart"): ("simulations.BiotSavart", "biot_savart_3d"),
+    ("Magnetostática", "No existencia de monopolos magnéticos"): ("simulations.NoMonop", "simular_campo_magnetico_bucle"),
+    ("Magnetostática", "Campo de inducción magnética"): ("simulations.hilosmag", "campo_magnetico_hilos_interactivo"),
+    ("Ondas Electromagnéticas", "Fibra óptica"): ("simulations.FibraOp", "simular_fibra_optica_3d"),
+    ("Ondas Electromagnéticas", "Guías de onda"): ("simulations.GuiaOnda", "simular_guia_onda_mejorada"),
+    ("Circuitos Eléctricos", "Circuitos RL, RC y RLC"): ("simulations.RLC", "simular_circuito_rlc"),
+}
+
+# módulo -> segundos que tardó su primera importación en este proceso
+tiempos_importacion = {}
+_candado_importacion = threading.Lock()
+
+
+def obtener_simulacion(seccion, subtema):
+    """Devuelve la función de la simulación, importando su módulo si hace falta."""
+    modulo, funcion = SIMULACIONES[(seccion, subtema)]
+    # Con varias sesiones a la vez, otra puede estar a media importación:
+    # el módulo ya está en sys.modules pero todavía sin sus funciones.
+    with _candado_importacion:
+        if modulo not in sys.modules:
+            inicio = time.perf_counter()
+            importlib.import_module(modulo)
+            tiempos_importacion[modulo] = time.perf_counter() - inicio
+    return getattr(sys.modules[modulo], funcion)
+
+
+@st.fragment
+def ejecutar_simulacion(seccion, subtema):
+    """Ejecuta la simulación como fragmento de Streamlit.
+
+    Mover uno de sus controles vuelve a correr sólo esta función, no todo
+    main.py (CSS, encabezado, barra lateral). Por eso las simulaciones no
+    pueden escribir en st.sidebar.
+    """
+    simulacion = obtener_simulacion(seccion, subtema)
+    with metricas.simulacion(f"{seccion} / {subtema}"):
+        try:
+            simulacion()
+        except procesos.RenderNoDisponible as error:
+            st.warning(f"⏳ {error}")
+    prometheus.escribir()
+
+
+def medir_importacion_en_frio(modulo):
+    """Tiempo de importar `modulo` en un intérprete limpio (incluye sus dependencias)."""
+    codigo = (
+        "import time, importlib\n"
+        "t = time.perf_counter()\n"
+        f"importlib.import_module({modulo!r})\n"
+        "print(time.perf_counter() - t)\n"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+    return float(salida.stdout.strip().splitlines()[-1])
+
+
+def reporte_importaciones():
+    """Costo de importación en frío por módulo, ordenado de mayor a menor.
+
+    Devuelve pares (módulo, segundos) y, aparte, lo que cuesta importar sólo
+    streamlit, que todas las páginas pagan de cualquier forma.
+    """
+    base = medir_importacion_en_frio("streamlit")
+    modulos = sorted({modulo for modulo, _ in SIMULACIONES.values()})
+    costos = [(modulo, medir_importacion_en_frio(modulo)) for modulo in modulos]
+    return sorted(costos, key=lambda par: par[1], reverse=True), base
+
+
+if __name__ == "__main__":
+    costos, base = reporte_importaciones()
+    print(f"streamlit (común a todas las páginas): {base * 1000:.1f} ms\n")
+    print(f"{'Módulo':<28} {'En frío':>10} {'Sin streamlit':>14}")
+    for modulo, segundos in costos:
+        print(f"{modulo:<28} {segundos * 1000:>7.1f} ms {(segundos - base) * 1000:>11.1f} ms")
@@ -1,88 +1,25 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import plotly.graph_objects as go
 from mpl_toolkits.mplot3d import Axes3D
+from electro_core import angulo_critico, trayectoria_fibra
+from simulations.figuras import nueva_figura, a_bytes, mostrar_imagen
+from simulations.cache import cache_render
+from simulations.reticulas import reticula
+from simulations.interactivo import a_json, compacto, elegir_modo, mostrar_escena, nueva_escena
 
-def simular_fibra_optica_3d():
-    st.title("🔦 Simulación 3D de Fibra Óptica - Reflexión Total Interna")
-    
-    with st.sidebar:
-        st.header("Parámetros Ópticos")
-        n_nucleo = st.slider("Índice refracción núcleo (n₁)", 1.4, 1.6, 1.5, 0.01)
-        n_revestimiento = st.slider("Índice refracción revestimiento (n₂)", 1.3, 1.5, 1.4, 0.01)
-        angulo_incidencia = st.slider("Ángulo de incidencia (°)", 0, 89, 45, 1)
-        radio_nucleo = st.slider("Radio del núcleo (μm)", 3.0, 8.0, 5.0, 0.5)
-        longitud_fibra = st.slider("Longitud de la fibra (μm)", 10.0, 30.0, 20.0, 2.0)
-    
-    def calcular_angulo_critico(n_nucleo, n_revestimiento):
-        if n_nucleo <= n_revestimiento:
-            return 90.0
-        return np.degrees(np.arcsin(n_revestimiento / n_nucleo))
-    
-    def calcular_trayectoria_3d(n_nucleo, n_revestimiento, angulo_incidencia, radio_nucleo, longitud_fibra):
-        angulo_critico = calcular_angulo_critico(n_nucleo, n_revestimiento)
-        theta_i = np.radians(angulo_incidencia)
-        
-        # Punto inicial
-        x, y, z = 0, -radio_nucleo * 0.8, 0
-        trayectoria = [(x, y, z)]
-        reflexiones = []
-        
-        # Vector dirección inicial
-        direccion_xy = np.array([np.sin(theta_i), 0, np.cos(theta_i)])
-        
-        max_pasos = 20
-        for paso in range(max_pasos):
-            if z > longitud_fibra:
-                break
-                
-            # Calcular intersección con la pared
-            a = direccion_xy[0]**2 + direccion_xy[1]**2
-            b = 2 * (x * direccion_xy[0] + y * direccion_xy[1])
-            c = x**2 + y**2 - radio_nucleo**2
-            
-            discriminante = b**2 - 4 * a * c
-            
-            if discriminante < 0:
-                break
-                
-            t = (-b - np.sqrt(discriminante)) / (2 * a)
-            if t <= 0:
-                t = (-b + np.sqrt(discriminante)) / (2 * a)
-            
-            x_nuevo = x + direccion_xy[0] * t
-            y_nuevo = y + direccion_xy[1] * t
-            z_nuevo = z + direccion_xy[2] * t
-            
-            if z_nuevo > longitud_fibra:
-                t_final = (longitud_fibra - z) / direccion_xy[2]
-                x_nuevo = x + direccion_xy[0] * t_final
-                y_nuevo = y + direccion_xy[1] * t_final
-                z_nuevo = longitud_fibra
-                trayectoria.append((x_nuevo, y_nuevo, z_nuevo))
-                break
-            
-            trayectoria.append((x_nuevo, y_nuevo, z_nuevo))
-            
-            # Verificar reflexión total interna
-            if angulo_incidencia > angulo_critico:
-                normal = np.array([x_nuevo, y_nuevo, 0])
-                normal = normal / np.linalg.norm(normal)
-                direccion_xy = direccion_xy - 2 * np.dot(direccion_xy, normal) * normal
-                reflexiones.append((x_nuevo, y_nuevo, z_nuevo))
-            else:
-                break
-            
-            x, y, z = x_nuevo, y_nuevo, z_nuevo
-        
-        return np.array(trayectoria), reflexiones, angulo_critico
-    
+@reticula("angulo_critico", ejes=[(1.4, 1.6, 0.01), (1.3, 1.5, 0.01)])
+def angulo_critico_reticula(n_nucleo, n_revestimiento):
+    return angulo_critico(n_nucleo, n_revestimiento)
+
+@cache_render("fibra_optica")
+def dibujar_fibra_optica(n_nucleo, n_revestimiento, angulo_incidencia, radio_nucleo, longitud_fibra):
     # Calcular trayectoria
-    trayectoria, reflexiones, angulo_critico = calcular_trayectoria_3d(
+    trayectoria, reflexiones, angulo_critico = trayectoria_fibra(
         n_nucleo, n_revestimiento, angulo_incidencia, radio_nucleo, longitud_fibra)
     
     # Crear figura 3D
-    fig = plt.figure(figsize=(14, 8))
+    fig = nueva_figura(figsize=(14, 8))
     ax = fig.add_subplot(111, projection='3d')
     
     # Dibujar fibra óptica
@@ -108,9 +45,8 @@ def simular_fibra_optica_3d():
     if len(trayectoria) > 1:
         ax.plot(trayectoria[:, 0], trayectoria[:, 1], trayectoria[:, 2], 'r-', linewidth=3, alpha=0.9)
         
-        if reflexiones:
-            reflexiones_arr = np.array(reflexiones)
-            ax.scatter(reflexiones_arr[:, 0], reflexiones_arr[:, 1], reflexiones_arr[:, 2],
+        if len(reflexiones):
+            ax.scatter(reflexiones[:, 0], reflexiones[:, 1], reflexiones[:, 2],
                       c='red', s=50, alpha=0.8)
     
     # Configuración 3D
@@ -149,9 +85,72 @@ def simular_fibra_optica_3d():
     ]
     
     ax.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1.05, 0.5))
-    plt.tight_layout()
+    fig.tight_layout()
+
+    return a_bytes(fig), {"angulo_critico": angulo_critico}
+
+
+@cache_render("fibra_optica_3d")
+def escena_fibra_optica(n_nucleo, n_revestimiento, angulo_incidencia, radio_nucleo, longitud_fibra):
+    trayectoria, reflexiones, angulo_critico = trayectoria_fibra(
+        n_nucleo, n_revestimiento, angulo_incidencia, radio_nucleo, longitud_fibra)
+
+    limit = radio_nucleo * 2
+    fig = nueva_escena("Fibra óptica: trayectoria del rayo",
+                       rangos=[(-limit, limit), (-limit, limit), (0, longitud_fibra)], aspecto="data")
+    fig.update_scenes(xaxis_title='X (μm)', yaxis_title='Y (μm)', zaxis_title='Z (μm) - Propagación')
+
+    # Núcleo y revestimiento
+    z_fibra = np.linspace(0, longitud_fibra, 50)
+    theta = np.linspace(0, 2 * np.pi, 50)
+    theta_grid, z_grid = np.meshgrid(theta, z_fibra)
+    for radio, color, opacidad, nombre in [(radio_nucleo, 'gold', 0.3, 'Núcleo (n₁)'),
+                                           (radio_nucleo * 1.5, 'lightblue', 0.2, 'Revestimiento (n₂)')]:
+        fig.add_trace(go.Surface(
+            x=compacto(radio * np.cos(theta_grid)), y=compacto(radio * np.sin(theta_grid)), z=compacto(z_grid),
+            colorscale=[[0, color], [1, color]], showscale=False, opacity=opacidad,
+            name=nombre, showlegend=True, hoverinfo='skip'))
+
+    # Trayectoria del rayo y reflexiones
+    if len(trayectoria) > 1:
+        fig.add_trace(go.Scatter3d(
+            x=compacto(trayectoria[:, 0]), y=compacto(trayectoria[:, 1]), z=compacto(trayectoria[:, 2]),
+            mode='lines', line=dict(color='red', width=6), name='Trayectoria del rayo'))
+        if len(reflexiones):
+            fig.add_trace(go.Scatter3d(
+                x=compacto(reflexiones[:, 0]), y=compacto(reflexiones[:, 1]), z=compacto(reflexiones[:, 2]),
+                mode='markers', marker=dict(color='red', size=5), name='Reflexión total'))
+
+    if angulo_incidencia > angulo_critico:
+        estado = f'✓ Reflexión total interna ({len(reflexiones)} reflexiones)'
+    else:
+        estado = '✗ Refracción: pérdida por radiación'
+    fig.add_annotation(
+        text=f'n₁ = {n_nucleo:.3f}, n₂ = {n_revestimiento:.3f}, θ_crítico = {angulo_critico:.1f}°, '
+             f'θ_incidencia = {angulo_incidencia}°<br>{estado}',
+        xref='paper', yref='paper', x=0, y=1, showarrow=False, align='left')
+
+    return a_json(fig), {"angulo_critico": angulo_critico}
+
+
+def simular_fibra_optica_3d():
+    st.title("🔦 Simulación 3D de Fibra Óptica - Reflexión Total Interna")
+    
+    with st.expander("⚙️ Parámetros Ópticos", expanded=True):
+        n_nucleo = st.slider("Índice refracción núcleo (n₁)", 1.4, 1.6, 1.5, 0.01)
+        n_revestimiento = st.slider("Índice refracción revestimiento (n₂)", 1.3, 1.5, 1.4, 0.01)
+        angulo_incidencia = st.slider("Ángulo de incidencia (°)", 0, 89, 45, 1)
+        radio_nucleo = st.slider("Radio del núcleo (μm)", 3.0, 8.0, 5.0, 0.5)
+        longitud_fibra = st.slider("Longitud de la fibra (μm)", 10.0, 30.0, 20.0, 2.0)
     
-    st.pyplot(fig)
+    parametros = (n_nucleo, n_revestimiento, angulo_incidencia, radio_nucleo, longitud_fibra)
+    if elegir_modo("fibra_optica"):
+        escena, resumen = escena_fibra_optica(*parametros)
+        mostrar_escena(escena)
+    else:
+        imagen, resumen = dibujar_fibra_optica(*parametros)
+        mostrar_imagen(imagen)
+    angulo_critico = angulo_critico_reticula(n_nucleo, n_revestimiento)
     
     # Explicación física
     with st.expander("📚 Principio de Reflexión Total Interna"):
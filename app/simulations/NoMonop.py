@@ -1,10 +1,15 @@
 import streamlit as st
 import numpy as np
+import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from matplotlib.patches import Circle
 from matplotlib.colors import LogNorm
 from matplotlib.cm import ScalarMappable
+from electro_core import campo_dipolo, lineas_de_campo
+from simulations.figuras import nueva_figura, a_bytes, mostrar_imagen
+from simulations.cache import cache_render
+from simulations.interactivo import a_json, compacto, elegir_modo, mostrar_escena, nueva_escena, polilineas
 
 class Arrow3D(plt.Line2D):
     def __init__(self, xs, ys, zs, *args, **kwargs):
@@ -17,33 +22,38 @@ class Arrow3D(plt.Line2D):
         self.set_data(xs, ys)
         return min(zs)
 
-def simular_campo_magnetico_bucle():
-    st.title("🧭 Campo Magnético de un Bucle de Corriente")
-    
-    with st.sidebar:
-        st.header("Configuración")
-        I = st.slider("Corriente (A)", 0.1, 5.0, 1.0, 0.1)
-        R = st.slider("Radio del bucle (m)", 0.05, 0.5, 0.1, 0.01)
-        n_lines = st.slider("Número de líneas de campo", 8, 20, 12, 2)
-    
+def calcular_bucle(I, R, n_lines):
     # Constantes
-    mu0 = 4 * np.pi * 1e-7
     nano = 1e6
+    m = I * np.pi * R**2
 
     def campo_bucle2(x, y, z):
-        r = np.sqrt(x**2 + y**2 + z**2)
-        m = I * np.pi * R**2
-        prefactor = (mu0 * m) / (4 * np.pi) * nano
+        return tuple(c * nano for c in campo_dipolo(m, x, y, z))
 
-        Bx = prefactor * 3 * x * z / (r**5 + 1e-10)
-        By = prefactor * 3 * y * z / (r**5 + 1e-10)
-        Bz = prefactor * (3 * z**2 - r**2) / (r**5 + 1e-10)
+    # Parámetros para líneas de campo
+    max_length = 25
+    step_size = 0.1
 
-        B_mag = np.sqrt(Bx**2 + By**2 + Bz**2)
-        return Bx, By, Bz, B_mag
+    # Integración de todas las líneas a la vez
+    phi = np.linspace(0, 2*np.pi, n_lines, endpoint=False)
+    seeds = np.array([1.2*R*np.cos(phi), 1.2*R*np.sin(phi), 0.15*np.ones(n_lines)]).T
+    trayectorias, magnitudes = lineas_de_campo(campo_bucle2, seeds, max_length, step_size)
+
+    # Rango del colormap (magnitudes del tramo hacia adelante)
+    valid_B = magnitudes[:, max_length:].ravel()
+    valid_B = valid_B[valid_B > 0]
+    vmin_adjusted = max(valid_B.min() * 0.8, 0.05)
+    vmax_adjusted = 13.0
+
+    return campo_bucle2, trayectorias, magnitudes, vmin_adjusted, vmax_adjusted
+
+
+@cache_render("bucle")
+def dibujar_bucle(I, R, n_lines):
+    campo_bucle2, trayectorias, magnitudes, vmin_adjusted, vmax_adjusted = calcular_bucle(I, R, n_lines)
 
     # Crear figura
-    fig = plt.figure(figsize=(16, 8))
+    fig = nueva_figura(figsize=(16, 8))
     gs = fig.add_gridspec(1, 3, width_ratios=[1, 1, 0.05])
 
     # Gráfico 3D
@@ -55,60 +65,11 @@ def simular_campo_magnetico_bucle():
     ax1.plot(R*np.cos(theta), R*np.sin(theta), np.zeros(100),
             'r-', lw=3, label='Bucle de corriente')
 
-    # Parámetros para líneas de campo
-    max_length = 25
-    step_size = 0.1
-    arrow_spacing = 6
-
-    # Pre-calcular magnitudes para colormap
-    all_B_mags = []
-    phi = np.linspace(0, 2*np.pi, n_lines, endpoint=False)
-    seeds = np.array([1.2*R*np.cos(phi), 1.2*R*np.sin(phi), 0.15*np.ones(n_lines)]).T
-
-    for seed in seeds:
-        pos = seed.copy()
-        for _ in range(max_length):
-            _, _, _, B_mag = campo_bucle2(pos[0], pos[1], pos[2])
-            all_B_mags.append(B_mag)
-            direction = np.array(campo_bucle2(pos[0], pos[1], pos[2])[:3])
-            direction = direction / (np.linalg.norm(direction) + 1e-10)
-            pos = pos + step_size * direction
-
-    # Configurar colormap
-    valid_B = np.array(all_B_mags)
-    valid_B = valid_B[valid_B > 0]
-    vmin_adjusted = max(valid_B.min() * 0.8, 0.05)
-    vmax_adjusted = 13.0
     cmap = plt.get_cmap('gist_ncar')
     norm = LogNorm(vmin=vmin_adjusted, vmax=vmax_adjusted)
 
     # Dibujar líneas de campo
-    for seed in seeds:
-        trajectory = []
-        B_mags = []
-
-        # Integración
-        pos = seed.copy()
-        for _ in range(max_length):
-            Bx, By, Bz, B_mag = campo_bucle2(pos[0], pos[1], pos[2])
-            trajectory.append(pos.copy())
-            B_mags.append(B_mag)
-            direction = np.array([Bx, By, Bz])
-            direction = direction / (np.linalg.norm(direction) + 1e-10)
-            pos = pos + step_size * direction
-
-        pos = seed.copy()
-        for _ in range(max_length):
-            Bx, By, Bz, B_mag = campo_bucle2(pos[0], pos[1], pos[2])
-            trajectory.insert(0, pos.copy())
-            B_mags.insert(0, B_mag)
-            direction = np.array([Bx, By, Bz])
-            direction = direction / (np.linalg.norm(direction) + 1e-10)
-            pos = pos - step_size * direction
-
-        trajectory = np.array(trajectory)
-        B_mags = np.array(B_mags)
-
+    for trajectory, B_mags in zip(trayectorias, magnitudes):
         # Dibujar línea
         for i in range(len(trajectory)-1):
             color_val = norm(min(B_mags[i], vmax_adjusted))
@@ -157,8 +118,50 @@ def simular_campo_magnetico_bucle():
     cbar = fig.colorbar(sm, cax=ax_cb)
     cbar.set_label('Magnitud del campo (μT)', rotation=270, labelpad=20)
 
-    plt.tight_layout()
-    st.pyplot(fig)
+    fig.tight_layout()
+
+    return a_bytes(fig), {"vmax": vmax_adjusted}
+
+
+@cache_render("bucle_3d")
+def escena_bucle(I, R, n_lines):
+    _, trayectorias, magnitudes, vmin_adjusted, vmax_adjusted = calcular_bucle(I, R, n_lines)
+
+    fig = nueva_escena(f"Campo magnético del bucle: I = {I} A, R = {R} m",
+                       rangos=[(-0.8, 0.8), (-0.8, 0.8), (-0.8, 0.8)])
+
+    # Bucle
+    theta = np.linspace(0, 2*np.pi, 100)
+    fig.add_trace(go.Scatter3d(
+        x=compacto(R*np.cos(theta)), y=compacto(R*np.sin(theta)), z=compacto(np.zeros(100)),
+        mode='lines', line=dict(color='red', width=8), name='Bucle de corriente'))
+
+    # Líneas de campo, coloreadas en escala logarítmica como en la imagen
+    colores = np.log10(np.clip(magnitudes, vmin_adjusted, vmax_adjusted))
+    fig.add_trace(polilineas(
+        trayectorias, colores, name='Líneas de campo',
+        line=dict(width=4, colorscale='Rainbow', cmin=np.log10(vmin_adjusted), cmax=np.log10(vmax_adjusted),
+                  colorbar=dict(title='log₁₀ |B| (μT)'))))
+
+    return a_json(fig), {"vmax": vmax_adjusted}
+
+
+def simular_campo_magnetico_bucle():
+    st.title("🧭 Campo Magnético de un Bucle de Corriente")
+    
+    with st.expander("⚙️ Configuración", expanded=True):
+        I = st.slider("Corriente (A)", 0.1, 5.0, 1.0, 0.1)
+        R = st.slider("Radio del bucle (m)", 0.05, 0.5, 0.1, 0.01)
+        n_lines = st.slider("Número de líneas de campo", 8, 20, 12, 2)
+    
+    if elegir_modo("bucle"):
+        escena, resumen = escena_bucle(I, R, n_lines)
+        mostrar_escena(escena)
+        st.caption("La sección del plano XZ está en la vista de imagen.")
+    else:
+        imagen, resumen = dibujar_bucle(I, R, n_lines)
+        mostrar_imagen(imagen)
+    vmax_adjusted = resumen["vmax"]
     
     # Información adicional
     with st.expander("📊 Información del Campo Magnético"):
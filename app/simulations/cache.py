@@ -0,0 +1,120 @@
+"""Caché de figuras ya rasterizadas, compartida por todas las sesiones.
+
+Los sliders de las simulaciones son discretos, así que muchos estudiantes
+piden exactamente la misma figura. Cada simulación tiene su propia caché
+LRU con un presupuesto en bytes: la clave es la tupla canónica de
+parámetros y el valor son los bytes de la imagen más los números que la
+página muestra aparte. Un acierto se salta tanto NumPy como matplotlib.
+"""
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+
+from simulations import metricas, procesos
+
+MAX_BYTES_POR_DEFECTO = 32 * 2**20  # 32 MiB por simulación
+
+# nombre -> CacheRender, para poder consultar las estadísticas de todas
+caches = {}
+
+
+def canonizar(valor):
+    """Lleva un parámetro a una forma estable para usarlo en la clave."""
+    if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, (int, float)) or hasattr(valor, "__float__"):
+        # Los sliders con step=0.1 producen cosas como 0.30000000000000004
+        redondeado = round(float(valor), 9)
+        if redondeado.is_integer():
+            return int(redondeado)
+        return redondeado + 0.0  # -0.0 -> 0.0
+    if isinstance(valor, (list, tuple)):
+        return tuple(canonizar(v) for v in valor)
+    return valor
+
+
+class CacheRender:
+    def __init__(self, nombre, max_bytes=MAX_BYTES_POR_DEFECTO):
+        self.nombre = nombre
+        self.max_bytes = max_bytes
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        self._candado = threading.Lock()
+
+    def obtener(self, clave):
+        with self._candado:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada
+
+    def guardar(self, clave, imagen, resumen):
+        tamano = len(imagen)
+        if tamano > self.max_bytes:
+            return
+        with self._candado:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self.bytes_usados -= len(anterior[0])
+            self._entradas[clave] = (imagen, resumen)
+            self.bytes_usados += tamano
+            while self.bytes_usados > self.max_bytes:
+                _, (imagen_vieja, _) = self._entradas.popitem(last=False)
+                self.bytes_usados -= len(imagen_vieja)
+
+    def limpiar(self):
+        with self._candado:
+            self._entradas.clear()
+            self.bytes_usados = 0
+
+    def estadisticas(self):
+        with self._candado:
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self.bytes_usados,
+                "max_bytes": self.max_bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+            }
+
+
+def cache_render(nombre, max_bytes=MAX_BYTES_POR_DEFECTO):
+    """Decorador para funciones que devuelven (imagen_bytes, resumen).
+
+    Los argumentos se normalizan con la firma de la función, así que
+    f(1, b=2) y f(1, 2) comparten entrada.
+
+    En un fallo la figura se dibuja en el grupo de procesos si está activo
+    (ver simulations/procesos.py) y si no en el hilo de la sesión.
+    """
+    def decorador(funcion):
+        cache = caches.setdefault(nombre, CacheRender(nombre, max_bytes))
+        firma = inspect.signature(funcion)
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            argumentos = firma.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            clave = tuple((k, canonizar(v)) for k, v in argumentos.arguments.items())
+            entrada = cache.obtener(clave)
+            if entrada is None:
+                metricas.comenzar("calculo")
+                try:
+                    if procesos.activo():
+                        entrada = procesos.dibujar(funcion, args, kwargs)
+                    else:
+                        entrada = funcion(*args, **kwargs)
+                finally:
+                    metricas.comenzar(None)
+                cache.guardar(clave, *entrada)
+            return entrada
+
+        envoltura.cache = cache
+        return envoltura
+    return decorador
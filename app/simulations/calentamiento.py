@@ -0,0 +1,86 @@
+"""Calentamiento en frío: lo que paga la primera figura de un proceso nuevo.
+
+Un proceso recién arrancado construye (o lee) la caché de fuentes de
+matplotlib, arma el analizador de mathtext la primera vez que una etiqueta
+lleva $...$ (RLC tiene muchas), importa scipy y registra la proyección 3D
+de mplot3d. Todo eso lo pagaba el primer estudiante que abría una página.
+
+calentar() hace ese trabajo por adelantado: importa las dependencias que
+comparten las páginas (matplotlib con Agg, NumPy, SciPy, Plotly, mplot3d)
+y dibuja una sola figura diminuta con un eje 2D y uno 3D. Los módulos de
+cada página no se importan aquí: siguen cargándose al elegir la página
+(ver registro.obtener_simulacion). Lo corren la construcción de la imagen
+(donde la caché de fuentes queda guardada en la capa), el arranque del
+servidor (app/arranque.py) y cada proceso de dibujo (simulations/procesos.py).
+"""
+import time
+
+from simulations import metricas
+
+# Etiquetas con la misma sintaxis que las de RLC.py (fracciones, griegas, \mathrm)
+_MATHTEXT = (
+    r"$L\frac{di}{dt} + Ri + v_C = V_{in}$",
+    r"$\zeta = 0.5\ \alpha = 1\ \mathrm{s^{-1}}\ \mu\mathrm{F}\ \Omega\ \omega_0^2$",
+)
+
+
+def _fuentes():
+    from matplotlib import font_manager
+
+    # Importar font_manager lee la caché de fuentes o la construye si no está
+    font_manager.get_font(font_manager.findfont("DejaVu Sans"))
+
+
+def _importar_dependencias():
+    import matplotlib
+    matplotlib.use("Agg")
+    import mpl_toolkits.mplot3d  # noqa: F401
+    import numpy  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+    import scipy.integrate  # noqa: F401
+    import electro_core  # noqa: F401
+
+
+def _figura():
+    # Un eje 2D con mathtext, mapa de color, contornos y líneas de campo, y
+    # uno 3D: los tipos de figura de todas las simulaciones
+    import numpy as np
+
+    from simulations import figuras
+
+    x = np.linspace(-1, 1, 8)
+    X, Y = np.meshgrid(x, x)
+    fig = figuras.nueva_figura(figsize=(4, 2))
+    ax = fig.add_subplot(121)
+    malla = ax.contourf(X, Y, X * Y, levels=5, cmap="viridis")
+    ax.contour(X, Y, X * Y, levels=3, colors="k")
+    ax.streamplot(X, Y, -Y, X, density=0.3)
+    ax.plot([-1, 1], [-1, 1], label=_MATHTEXT[0])
+    ax.set_title(_MATHTEXT[1])
+    ax.legend()
+    fig.colorbar(malla, ax=ax)
+
+    ax_3d = fig.add_subplot(122, projection="3d")
+    ax_3d.quiver([0], [0], [0], [1], [1], [1], length=0.5, normalize=True)
+    ax_3d.plot_surface(X, Y, X * Y, alpha=0.3)
+    return figuras.a_bytes(fig, dpi=20)
+
+
+# etapa -> función, en el orden en que se corren
+ETAPAS = {
+    "fuentes": _fuentes,
+    "dependencias": _importar_dependencias,
+    "figura": _figura,
+}
+
+
+def calentar(etapas=None):
+    """Corre las etapas de calentamiento; devuelve {etapa: segundos}."""
+    tiempos = {}
+    for nombre in etapas or ETAPAS:
+        inicio = time.perf_counter()
+        ETAPAS[nombre]()
+        tiempos[nombre] = time.perf_counter() - inicio
+    # Las figuras de prueba no cuentan como un rerun
+    metricas.reiniciar()
+    return tiempos
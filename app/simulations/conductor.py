@@ -1,44 +1,40 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import pandas as pd
+import plotly.graph_objects as go
 from matplotlib.patches import Circle
+from electro_core import factorizacion, malla, potencial_esfera_conductora, sistema_conductores
+from simulations.figuras import PRECISION, subplots, a_bytes, mostrar_imagen
+from simulations.cache import cache_render
+from simulations.interactivo import a_json, compacto, mostrar_escena, nueva_escena
 
-def esfera_conductora():
-    st.title("🧲 Esfera Conductora en Campo Eléctrico")
-    
-    with st.expander("📚 Teoría", expanded=True):
-        st.markdown("""
-        **Conductor en campo eléctrico externo**
-        """)
-    
-    # Parámetros ajustables
-    R = st.slider("Radio de la esfera (m)", 0.5, 2.0, 1.0, 0.1)
-    E0 = st.slider("Campo externo (V/m)", 0.1, 5.0, 1.0, 0.1)
-    
+def calcular_esfera_conductora(R, E0, precision=PRECISION):
     # Mallado
     grid_size = 50
     plot_range = 3
-    x = np.linspace(-plot_range, plot_range, grid_size)
-    z = np.linspace(-plot_range, plot_range, grid_size)
-    X, Z = np.meshgrid(x, z)
+    X, Z = malla(-plot_range, plot_range, -plot_range, plot_range, grid_size,
+                 precision=precision, dispersa=True)
     
     # Cálculos
-    r = np.sqrt(X**2 + Z**2)
-    theta = np.arctan2(Z, X)
-    
-    V_outside = -E0*Z*(1 - (R**3)/(r**3))
-    V = np.where(r >= R, V_outside, 0)
+    V = potencial_esfera_conductora(R, E0, X, Z)
+    return X, Z, V
+
+
+@cache_render("conductor")
+def dibujar_esfera_conductora(R, E0, precision=PRECISION):
+    X, Z, V = calcular_esfera_conductora(R, E0, precision)
+    x, z = X.ravel(), Z.ravel()
     
     # Visualización
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig, ax = subplots(figsize=(10, 8))
     
     # Potencial
-    im = ax.pcolormesh(X, Z, V, shading='auto', cmap='nipy_spectral', alpha=0.8)
-    cbar = plt.colorbar(im, label='Potencial (V)')
+    im = ax.pcolormesh(x, z, V, shading='auto', cmap='nipy_spectral', alpha=0.8)
+    cbar = fig.colorbar(im, ax=ax, label='Potencial (V)')
     
     # Líneas equipotenciales
     levels = np.linspace(-2.5*E0, 2.5*E0, 20)
-    CS = ax.contour(X, Z, V, levels=levels, colors='white', linewidths=0.7)
+    CS = ax.contour(x, z, V, levels=levels, colors='white', linewidths=0.7)
     
     # Esfera
     ax.add_patch(Circle((0, 0), R, color='gray', alpha=0.6, label='Esfera conductora'))
@@ -50,6 +46,257 @@ def esfera_conductora():
     ax.legend()
     ax.grid(True, alpha=0.3)
     ax.set_aspect('equal')
+
+    return a_bytes(fig), {}
+
+
+FORMAS = ["Cilindro", "Placas paralelas", "Dos cilindros"]
+# Dónde se coloca la carga lineal de la solución numérica (m)
+POSICION_CARGA = (0.0, 2.2)
+
+def geometria(forma, tamano, X, Z):
+    """[(máscara, signo del potencial)] de cada conductor de la forma."""
+    if forma == "Cilindro":
+        return [(np.hypot(X, Z) <= tamano, 1)]
+    if forma == "Placas paralelas":
+        placa = np.abs(X) <= 1.5
+        return [(placa & (np.abs(Z - tamano) <= 0.08), 1), (placa & (np.abs(Z + tamano) <= 0.08), -1)]
+    radio = tamano / 2
+    return [(np.hypot(X - 1.5, Z) <= radio, 1), (np.hypot(X + 1.5, Z) <= radio, -1)]
+
+
+def calcular_conductores(forma, tamano, V0, E0, lam, res):
+    # Mallado (el solucionador trabaja siempre en float64)
+    x = np.linspace(-3, 3, res)
+    h = x[1] - x[0]
+    X, Z = np.meshgrid(x, x)
+    conductores = geometria(forma, tamano, X, Z)
+
+    # Nodos fijos: el borde sigue al campo externo, cada conductor a ±V0
+    fijos = np.zeros_like(X, dtype=bool)
+    valores = -E0 * Z
+    for mascara, signo in conductores:
+        fijos |= mascara
+        valores[mascara] = signo * V0
+
+    # Carga lineal (nC/m) en el nodo más cercano, como densidad de volumen
+    rho = np.zeros_like(X)
+    i, j = (np.abs(x - POSICION_CARGA[1]).argmin(), np.abs(x - POSICION_CARGA[0]).argmin())
+    rho[i, j] = lam * 1e-9 / h**2
+
+    # La factorización sólo depende de la forma, el tamaño y la resolución:
+    # mover V0, E0 o la carga reutiliza la guardada
+    poisson = factorizacion(fijos, h)
+    V = poisson.resolver(valores, rho)
+    carga = poisson.carga(V)
+    cargas = [float(carga[mascara].sum()) * 1e9 for mascara, _ in conductores]
+    return x, V, conductores, cargas
+
+
+@cache_render("conductores_numerico")
+def dibujar_conductores(forma, tamano, V0, E0, lam, res):
+    x, V, conductores, cargas = calcular_conductores(forma, tamano, V0, E0, lam, res)
+
+    fig, ax = subplots(figsize=(10, 8))
+    # El nodo de la carga lineal tiene un potencial muy alto: la escala sale
+    # de los conductores, el borde y el 99 % de la malla, y el resto satura
+    vmax = max(abs(V0), 3 * E0, np.percentile(np.abs(V), 99), 1e-3)
+    im = ax.pcolormesh(x, x, V, shading='auto', cmap='nipy_spectral', alpha=0.8, vmin=-vmax, vmax=vmax)
+    fig.colorbar(im, ax=ax, label='Potencial (V)')
+    ax.contour(x, x, V, levels=np.linspace(-vmax, vmax, 21), colors='white', linewidths=0.7)
+
+    # Líneas de campo E = -∇V
+    Ez, Ex = np.gradient(-V, x, x)
+    ax.streamplot(x, x, Ex, Ez, color='black', linewidth=0.6, density=1.2, arrowsize=0.8)
+
+    for mascara, _ in conductores:
+        ax.contourf(x, x, mascara, levels=[0.5, 1.5], colors='gray', alpha=0.9)
+    if lam != 0:
+        ax.scatter(*POSICION_CARGA, color='red' if lam > 0 else 'blue', s=120,
+                   label=f'Carga lineal: {lam} nC/m')
+        ax.legend(loc='upper right')
+
+    ax.set_title(f'Solución numérica: {forma.lower()}')
+    ax.set_xlabel('x (m)')
+    ax.set_ylabel('z (m)')
+    ax.set_xlim(-3, 3)
+    ax.set_ylim(-3, 3)
+    ax.set_aspect('equal')
+
+    return a_bytes(fig), {"cargas": cargas}
+
+
+def conductores_numericos():
+    col1, col2 = st.columns(2)
+    with col1:
+        forma = st.selectbox("Forma de los conductores", FORMAS)
+        tamano = st.slider("Tamaño (m)", 0.3, 1.5, 0.8, 0.1,
+                           help="Radio del cilindro, media separación de las placas o diámetro de cada cilindro.")
+        res = st.slider("Resolución", 61, 241, 121, 20)
+    with col2:
+        V0 = st.slider("Potencial de los conductores (V)", -10.0, 10.0, 0.0, 0.5,
+                       help="Con dos conductores, uno queda a +V y el otro a -V.")
+        E0 = st.slider("Campo externo (V/m)", 0.0, 5.0, 1.0, 0.1, key="conductores_E0")
+        lam = st.slider("Carga lineal (nC/m)", -5.0, 5.0, 0.0, 0.5)
+
+    imagen, resumen = dibujar_conductores(forma, tamano, V0, E0, lam, res)
+    columnas = st.columns(len(resumen["cargas"]))
+    for n, (columna, carga) in enumerate(zip(columnas, resumen["cargas"]), start=1):
+        columna.metric(f"Carga inducida, conductor {n}", f"{carga:.3f} nC/m")
+    mostrar_imagen(imagen)
+
+
+TIPOS_3D = {"Esfera": "esfera", "Placa": "placa", "Cilindro": "cilindro"}
+MAX_CONDUCTORES_3D = 4
+# Conductores de partida: una esfera sobre una placa a tierra
+CONDUCTORES_INICIALES = pd.DataFrame({
+    "Tipo": ["Esfera", "Placa"],
+    "x (m)": [0.0, 0.0],
+    "y (m)": [0.0, 0.0],
+    "z (m)": [1.0, -0.5],
+    "Tamaño (m)": [0.5, 2.5],
+    "Potencial (V)": [10.0, 0.0],
+})
+
+def calcular_conductores_3d(conductores, E0, paneles):
+    # La geometría (tipo, centro, tamaño, paneles) elige el sistema factorizado;
+    # los potenciales y el campo externo sólo cambian el lado derecho
+    geometria = tuple((TIPOS_3D[tipo], (x, y, z), tamano, paneles)
+                      for tipo, x, y, z, tamano, _ in conductores)
+    sistema = sistema_conductores(geometria)
+    potenciales = [potencial for *_, potencial in conductores]
+    campo = (0.0, 0.0, E0)
+    sigma = sistema.resolver(potenciales, campo)
+    return sistema, sigma, campo
+
+
+@cache_render("conductores_3d")
+def escena_conductores_3d(conductores, E0, paneles):
+    sistema, sigma, _ = calcular_conductores_3d(conductores, E0, paneles)
+    sigma_nano = sigma * 1e9
+
+    # Cada panel son dos triángulos con el color de su σ
+    vertices = sistema.vertices.reshape(-1, 3)
+    base = 4 * np.arange(len(sigma))
+    i = np.concatenate([base, base])
+    j = np.concatenate([base + 1, base + 2])
+    k = np.concatenate([base + 2, base + 3])
+    limite = max(np.abs(sigma_nano).max(), 1e-12)
+
+    fig = nueva_escena("Densidad de carga inducida", aspecto="data")
+    fig.add_trace(go.Mesh3d(
+        x=compacto(vertices[:, 0]), y=compacto(vertices[:, 1]), z=compacto(vertices[:, 2]),
+        i=i, j=j, k=k, intensity=compacto(np.concatenate([sigma_nano, sigma_nano])),
+        intensitymode='cell', colorscale='RdBu', reversescale=True, cmin=-limite, cmax=limite,
+        colorbar=dict(title='σ (nC/m²)'), flatshading=True, name='Conductores'))
+
+    cargas = sistema.cargas(sigma) * 1e9
+    capacitancias = sistema.capacitancias() * 1e12
+    return a_json(fig), {"cargas": cargas.tolist(), "capacitancias": capacitancias.tolist(),
+                         "paneles": len(sigma)}
+
+
+@cache_render("conductores_3d_corte")
+def dibujar_corte_3d(conductores, E0, paneles):
+    sistema, sigma, campo = calcular_conductores_3d(conductores, E0, paneles)
+
+    # Plano y = 0 alrededor de todos los conductores
+    minimo = sistema.vertices.reshape(-1, 3).min(axis=0) - 1.0
+    maximo = sistema.vertices.reshape(-1, 3).max(axis=0) + 1.0
+    x = np.linspace(minimo[0], maximo[0], 150)
+    z = np.linspace(minimo[2], maximo[2], 150)
+    X, Z = np.meshgrid(x, z)
+    V = sistema.potencial(np.stack([X, np.zeros_like(X), Z], axis=-1), sigma, campo)
+
+    fig, ax = subplots(figsize=(10, 6))
+    vmax = max(np.percentile(np.abs(V), 99), 1e-6)
+    im = ax.pcolormesh(x, z, V, shading='auto', cmap='nipy_spectral', vmin=-vmax, vmax=vmax)
+    fig.colorbar(im, ax=ax, label='Potencial (V)')
+    ax.contour(x, z, V, levels=np.linspace(-vmax, vmax, 21), colors='white', linewidths=0.6)
+
+    # Paneles que cortan el plano y = 0
+    cerca = np.abs(sistema.centros[:, 1]) < 0.05 * (maximo[1] - minimo[1]) + 1e-9
+    ax.scatter(sistema.centros[cerca, 0], sistema.centros[cerca, 2], s=2, color='black',
+               label='Superficie de los conductores')
+
+    ax.set_title('Potencial en el plano y = 0')
+    ax.set_xlabel('x (m)')
+    ax.set_ylabel('z (m)')
+    ax.legend(loc='upper right')
+    ax.set_aspect('equal')
+
+    return a_bytes(fig), {}
+
+
+def conductores_elementos_frontera():
+    tabla = st.data_editor(
+        CONDUCTORES_INICIALES,
+        num_rows="dynamic",
+        key="conductores_3d",
+        column_config={
+            "Tipo": st.column_config.SelectboxColumn(options=list(TIPOS_3D), required=True),
+            "x (m)": st.column_config.NumberColumn(min_value=-5.0, max_value=5.0, step=0.1),
+            "y (m)": st.column_config.NumberColumn(min_value=-5.0, max_value=5.0, step=0.1),
+            "z (m)": st.column_config.NumberColumn(min_value=-5.0, max_value=5.0, step=0.1),
+            "Tamaño (m)": st.column_config.NumberColumn(
+                min_value=0.1, max_value=5.0, step=0.1,
+                help="Radio de la esfera o del cilindro (de altura 2R), o lado de la placa."),
+            "Potencial (V)": st.column_config.NumberColumn(min_value=-100.0, max_value=100.0, step=1.0),
+        },
+    ).dropna()
+    conductores = tuple(tuple(fila) for fila in tabla.itertuples(index=False))
+    if not conductores:
+        st.info("Agrega al menos un conductor.")
+        return
+    if len(conductores) > MAX_CONDUCTORES_3D:
+        st.warning(f"Se usan los primeros {MAX_CONDUCTORES_3D} conductores.")
+        conductores = conductores[:MAX_CONDUCTORES_3D]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        E0 = st.slider("Campo externo en z (V/m)", -20.0, 20.0, 0.0, 0.5, key="conductores_3d_E0")
+    with col2:
+        paneles = st.slider("Paneles por conductor", 100, 800, 300, 50,
+                            help="Cambiar la geometría refactoriza; cambiar potenciales o el campo no. "
+                                 "La capacitancia de una esfera sale un 0.6 % alta con 300 paneles "
+                                 "y un 0.4 % con 800.")
+
+    escena, resumen = escena_conductores_3d(conductores, E0, paneles)
+    columnas = st.columns(len(conductores))
+    for n, (columna, carga) in enumerate(zip(columnas, resumen["cargas"]), start=1):
+        columna.metric(f"Carga, conductor {n}", f"{carga:.3f} nC")
+    mostrar_escena(escena)
+
+    imagen, _ = dibujar_corte_3d(conductores, E0, paneles)
+    mostrar_imagen(imagen)
+
+    st.markdown("**Matriz de capacitancias (pF)**: C[i, j] es la carga de i con j a 1 V y el resto a tierra.")
+    nombres = [f"{n}: {tipo}" for n, (tipo, *_) in enumerate(conductores, start=1)]
+    st.dataframe(pd.DataFrame(resumen["capacitancias"], index=nombres, columns=nombres).style.format("{:.2f}"))
+    st.caption(f"{resumen['paneles']} paneles en total.")
+
+
+def esfera_conductora():
+    st.title("🧲 Esfera Conductora en Campo Eléctrico")
+    
+    with st.expander("📚 Teoría", expanded=True):
+        st.markdown("""
+        **Conductor en campo eléctrico externo**
+        """)
+    
+    modelo = st.radio("Modelo", ["Esfera (analítico)", "Conductores 2D (diferencias finitas)",
+                                 "Conductores 3D (elementos de frontera)"], horizontal=True)
+    if modelo == "Conductores 2D (diferencias finitas)":
+        conductores_numericos()
+        return
+    if modelo == "Conductores 3D (elementos de frontera)":
+        conductores_elementos_frontera()
+        return
+
+    # Parámetros ajustables
+    R = st.slider("Radio de la esfera (m)", 0.5, 2.0, 1.0, 0.1)
+    E0 = st.slider("Campo externo (V/m)", 0.1, 5.0, 1.0, 0.1)
     
-    st.pyplot(fig)
+    imagen, _ = dibujar_esfera_conductora(R, E0)
+    mostrar_imagen(imagen)
     
\ No newline at end of file
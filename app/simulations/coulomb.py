@@ -1,23 +1,233 @@
 import numpy as np # type: ignore
+import pandas as pd # type: ignore
+import plotly.graph_objects as go # type: ignore
 import matplotlib.pyplot as plt # type: ignore
 import streamlit as st # type: ignore
+from matplotlib.colors import LogNorm # type: ignore
+from electro_core import (
+    DISTRIBUCIONES, energia_potencial, evolucionar, fuerza_coulomb, generar_cargas,
+    interaccion_coulomb, normalizar,
+)
+from simulations.figuras import subplots, a_bytes, mostrar_imagen
+from simulations.cache import cache_render
+from simulations.interactivo import a_json, compacto, fotogramas, mostrar_escena, nueva_animacion
 
 def calcular_fuerza(q1, q2, pos1, pos2):
-    k = 8.9875e9  # Constante de Coulomb (N·m²/C²)
-    r = pos2 - pos1
-    distancia = np.linalg.norm(r)
-    if distancia == 0:
-        return np.zeros(2), 0.0  # Devuelve también la magnitud
+    fuerza, fuerza_mag = fuerza_coulomb(q1, q2, pos1, pos2)
+    return fuerza * 1e-11, float(fuerza_mag)  # Escala para visualización
 
-    fuerza_mag = k * np.abs(q1 * q2) / (distancia ** 2)
-    fuerza_direc = r / distancia
+@cache_render("coulomb")
+def dibujar_coulomb(q1, x1, y1, q2, x2, y2):
+    # Calcular fuerzas
+    pos1 = np.array([x1, y1])
+    pos2 = np.array([x2, y2])
+    fuerza, fuerza_mag = calcular_fuerza(q1, q2, pos1, pos2)
+
+    # Crear figura
+    fig, ax = subplots(figsize=(8, 6))
+    ax.set_xlim(-5, 5)
+    ax.set_ylim(-5, 5)
+    ax.set_aspect('equal')
+    ax.grid(True, alpha=0.2)
+    ax.set_xlabel("x (m)")
+    ax.set_ylabel("y (m)")
+    ax.set_title("Ley de Coulomb - Fuerza Electroestática")
+    
+    # Dibujar cargas
+    carga1 = plt.Circle((x1, y1), 0.3, color='red' if q1 > 0 else 'blue', alpha=0.7, ec='black')
+    carga2 = plt.Circle((x2, y2), 0.3, color='red' if q2 > 0 else 'blue', alpha=0.7, ec='black')
+    ax.add_patch(carga1)
+    ax.add_patch(carga2)
+    
+    # Dibujar fuerzas
+    if np.any(fuerza):
+        ax.arrow(pos1[0], pos1[1], fuerza[0], fuerza[1], 
+                 head_width=0.3, head_length=0.5, fc='darkgreen', ec='darkgreen')
+        ax.arrow(pos2[0], pos2[1], -fuerza[0], -fuerza[1], 
+                 head_width=0.3, head_length=0.5, fc='darkgreen', ec='darkgreen')
+    
+    # Etiquetas
+    ax.text(pos1[0], pos1[1]-0.5, f'q₁ = {q1:.1f} μC', ha='center', 
+            bbox=dict(facecolor='white', alpha=0.7, pad=2))
+    ax.text(pos2[0], pos2[1]-0.5, f'q₂ = {q2:.1f} μC', ha='center', 
+            bbox=dict(facecolor='white', alpha=0.7, pad=2))
+    
+    # Mostrar magnitud de fuerza 
+    ax.text(3.5, 4.5, f'F = {fuerza_mag:.2e} N', 
+            bbox=dict(facecolor='white', alpha=0.8), fontsize=12)
+
+    return a_bytes(fig), {"fuerza": fuerza_mag}
+
+
+METODOS = {"Automático": "auto", "Directo (todos los pares)": "directo", "Barnes-Hut": "barnes_hut"}
+
+@cache_render("coulomb_n")
+def dibujar_n_cargas(q, x, y, metodo, theta):
+    q = np.asarray(q, dtype=float)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Fuerza neta sobre cada carga (q en μC) y energía del sistema
+    fuerzas, potenciales, usado = interaccion_coulomb(
+        q * 1e-6, np.column_stack([x, y]), metodo=metodo, theta=theta)
+    energia = energia_potencial(q * 1e-6, potenciales)
+    magnitudes = np.hypot(fuerzas[:, 0], fuerzas[:, 1])
+
+    # Crear figura
+    fig, ax = subplots(figsize=(8, 6))
+    ax.set_xlim(-5, 5)
+    ax.set_ylim(-5, 5)
+    ax.set_aspect('equal')
+    ax.grid(True, alpha=0.2)
+    ax.set_xlabel("x (m)")
+    ax.set_ylabel("y (m)")
+    ax.set_title(f"Ley de Coulomb - Fuerza neta sobre {len(q)} cargas")
+
+    # Cargas: tamaño según |q|
+    ax.scatter(x, y, s=30 + 20 * np.abs(q), c=np.where(q > 0, 'red', 'blue'),
+               alpha=0.7, edgecolors='black', zorder=3)
+
+    # Fuerzas netas: un solo quiver, flechas de largo fijo y color según |F|
+    validas = magnitudes > 0
+    if np.any(validas):
+        ux, uy = normalizar(fuerzas[:, 0], fuerzas[:, 1])
+        flechas = ax.quiver(
+            x[validas], y[validas], ux[validas], uy[validas], magnitudes[validas],
+            cmap='viridis', norm=LogNorm(vmin=magnitudes[validas].min(), vmax=magnitudes[validas].max()),
+            angles='xy', scale_units='xy', scale=2, width=0.004, zorder=4)
+        fig.colorbar(flechas, ax=ax, label='|F neta| (N)')
+
+    # Energía total
+    ax.text(-4.8, 4.5, f'U = {energia:.2e} J',
+            bbox=dict(facecolor='white', alpha=0.8), fontsize=12)
+
+    return a_bytes(fig), {"energia": energia, "fuerza_max": float(magnitudes.max()), "metodo": usado}
+
+
+def mostrar_n_cargas():
+    col1, col2 = st.columns(2)
+    with col1:
+        distribucion = st.selectbox("Distribución inicial", DISTRIBUCIONES)
+        n = st.slider("Número de cargas", 2, 500, 40)
+        semilla = 0
+        if distribucion == "Aleatoria":
+            semilla = st.number_input("Semilla", min_value=0, max_value=9999, value=0, step=1)
+    with col2:
+        metodo = METODOS[st.selectbox(
+            "Método de cálculo", list(METODOS),
+            help="Automático usa la suma directa hasta 1000 cargas y Barnes-Hut para más.")]
+        theta = 0.5
+        if metodo != "directo":
+            theta = st.slider("θ de Barnes-Hut", 0.1, 1.0, 0.5, 0.05,
+                              help="Un grupo de cargas se trata como una sola si lado/distancia < θ.")
+
+    q, pos = generar_cargas(distribucion, n, semilla)
+    with st.expander("✏️ Editar, agregar o quitar cargas"):
+        tabla = st.data_editor(
+            pd.DataFrame({"x (m)": pos[:, 0], "y (m)": pos[:, 1], "q (μC)": q}),
+            num_rows="dynamic",
+            key=f"cargas_{distribucion}_{n}_{semilla}",
+            column_config={
+                "x (m)": st.column_config.NumberColumn(min_value=-4.5, max_value=4.5, step=0.1),
+                "y (m)": st.column_config.NumberColumn(min_value=-4.5, max_value=4.5, step=0.1),
+                "q (μC)": st.column_config.NumberColumn(min_value=-5.0, max_value=5.0, step=0.1),
+            },
+        ).dropna()
 
-    if q1 * q2 > 0:  # Repulsión
-        fuerza_direc = -fuerza_direc
-    else:             # Atracción
-        fuerza_direc = fuerza_direc
+    if len(tabla) < 2:
+        st.info("Agrega al menos dos cargas.")
+        return
+
+    q, x, y = tuple(tabla["q (μC)"]), tuple(tabla["x (m)"]), tuple(tabla["y (m)"])
+    if elegir_dinamica():
+        mostrar_dinamica(q, x, y)
+        return
+
+    imagen, resumen = dibujar_n_cargas(q, x, y, metodo, theta)
+    mostrar_imagen(imagen)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Energía potencial total", f"{resumen['energia']:.3e} J")
+    col2.metric("Fuerza neta máxima", f"{resumen['fuerza_max']:.3e} N")
+    col3.metric("Método", "Barnes-Hut" if resumen["metodo"] == "barnes_hut" else "Directo")
+
+
+# Fotogramas que recibe el navegador, sin importar cuántos pasos se integren
+FOTOGRAMAS = 120
+MAX_CARGAS_DINAMICA = 100
+# Tope de pasos de Verlet por animación, para acotar el tiempo de cálculo
+PASOS_MAX = 10000
+
+@cache_render("coulomb_dinamica")
+def escena_dinamica(q, x, y, masa, duracion, suavizado, paredes):
+    q = np.asarray(q, dtype=float) * 1e-6  # μC -> C
+    pos = np.column_stack([x, y]).astype(float)
+    m = masa * 1e-3  # g -> kg
+
+    # Toda la trayectoria de una vez, desde el reposo
+    tiempos, posiciones, cinetica, potencial, pasos = evolucionar(
+        q, m, pos, np.zeros_like(pos), duracion, FOTOGRAMAS,
+        suavizado=suavizado, pasos_max=PASOS_MAX, caja=4.5 if paredes else None)
+    energia = cinetica + potencial
+    deriva = float(np.max(np.abs(energia - energia[0])) / max(np.max(np.abs(potencial)), 1e-30))
+
+    fig = nueva_animacion(f"Movimiento de {len(q)} cargas bajo sus fuerzas mutuas", [(-5, 5), (-5, 5)])
+
+    # Estelas: todas las trayectorias en una traza, separadas por NaN
+    estelas = np.concatenate(
+        [posiciones.transpose(1, 0, 2), np.full((len(q), 1, 2), np.nan)], axis=1).reshape(-1, 2)
+    fig.add_trace(go.Scatter(x=compacto(estelas[:, 0]), y=compacto(estelas[:, 1]), mode='lines',
+                             line=dict(color='lightgray', width=1), hoverinfo='skip'))
+
+    # Cargas: lo único que cambia de un fotograma a otro
+    marcador = dict(size=6 + 2 * np.abs(q * 1e6), color=np.where(q > 0, 'red', 'blue').tolist(),
+                    line=dict(color='black', width=1))
+    fig.add_trace(go.Scatter(x=compacto(posiciones[0, :, 0]), y=compacto(posiciones[0, :, 1]),
+                             mode='markers', marker=marcador))
+    cuadros = [[go.Scatter(x=compacto(p[:, 0]), y=compacto(p[:, 1]))] for p in posiciones]
+    fotogramas(fig, [1], cuadros, [f"{t:.2f} s" for t in tiempos])
+
+    resumen = {
+        "pasos": pasos,
+        "deriva": deriva,
+        "energias": {"t (s)": tiempos.tolist(), "Cinética (J)": cinetica.tolist(),
+                     "Potencial (J)": potencial.tolist(), "Total (J)": energia.tolist()},
+    }
+    return a_json(fig), resumen
+
+
+def elegir_dinamica():
+    return st.toggle(
+        "🎞️ Evolución temporal",
+        key="coulomb_dinamica",
+        help="Suelta las cargas desde el reposo y anima su movimiento en el navegador.",
+    )
+
+
+def mostrar_dinamica(q, x, y):
+    if len(q) > MAX_CARGAS_DINAMICA:
+        st.warning(f"La evolución temporal admite hasta {MAX_CARGAS_DINAMICA} cargas.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        masa = st.slider("Masa de cada carga (g)", 0.1, 10.0, 1.0, 0.1)
+    with col2:
+        duracion = st.slider("Duración (s)", 1.0, 10.0, 5.0, 0.5)
+    with col3:
+        suavizado = st.slider("Suavizado ε (m)", 0.02, 0.5, 0.1, 0.02,
+                              help="Acota la fuerza en los encuentros cercanos: 1/r² pasa a r/(r²+ε²)^(3/2).")
+    paredes = st.checkbox("Paredes reflejantes en ±4.5 m", True)
+
+    escena, resumen = escena_dinamica(q, x, y, masa, duracion, suavizado, paredes)
+    mostrar_escena(escena)
+
+    col1, col2 = st.columns(2)
+    col1.metric("Pasos de Verlet", f"{resumen['pasos']:,}")
+    col2.metric("Deriva de energía", f"{resumen['deriva']:.2%}",
+                help="Máxima variación de la energía total respecto de la mayor |U|.")
+    st.line_chart(pd.DataFrame(resumen["energias"]).set_index("t (s)"))
 
-    return fuerza_mag * fuerza_direc * 1e-11, fuerza_mag  # Escala para visualización
 
 def mostrar_simulacion_coulomb():
     st.markdown("""
@@ -25,6 +235,12 @@ def mostrar_simulacion_coulomb():
         <h3>Simulación interactiva de la Fuerza entre dos cargas</h3>
         <p>Utiliza los controles deslizantes para modificar las cargas y sus posiciones.</p>
     """, unsafe_allow_html=True)
+
+    modo = st.radio("Sistema", ["Dos cargas", "N cargas"], horizontal=True)
+    if modo == "N cargas":
+        mostrar_n_cargas()
+        st.markdown("</div>", unsafe_allow_html=True)
+        return
     
     col1, col2 = st.columns(2)
     
@@ -76,42 +292,9 @@ def mostrar_simulacion_coulomb():
             step=0.1
         )
     
-    # Crear figura
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.set_xlim(-5, 5)
-    ax.set_ylim(-5, 5)
-    ax.set_aspect('equal')
-    ax.grid(True, alpha=0.2)
-    ax.set_xlabel("x (m)")
-    ax.set_ylabel("y (m)")
-    ax.set_title("Ley de Coulomb - Fuerza Electroestática")
-    
-    # Dibujar cargas
-    carga1 = plt.Circle((x1, y1), 0.3, color='red' if q1 > 0 else 'blue', alpha=0.7, ec='black')
-    carga2 = plt.Circle((x2, y2), 0.3, color='red' if q2 > 0 else 'blue', alpha=0.7, ec='black')
-    ax.add_patch(carga1)
-    ax.add_patch(carga2)
-    
-    # Calcular y dibujar fuerzas
-    pos1 = np.array([x1, y1])
-    pos2 = np.array([x2, y2])
-    fuerza, fuerza_mag = calcular_fuerza(q1, q2, pos1, pos2)  # Ahora recibe ambos valores
-    
-    if np.any(fuerza):
-        ax.arrow(pos1[0], pos1[1], fuerza[0], fuerza[1], 
-                 head_width=0.3, head_length=0.5, fc='darkgreen', ec='darkgreen')
-        ax.arrow(pos2[0], pos2[1], -fuerza[0], -fuerza[1], 
-                 head_width=0.3, head_length=0.5, fc='darkgreen', ec='darkgreen')
-    
-    # Etiquetas
-    ax.text(pos1[0], pos1[1]-0.5, f'q₁ = {q1:.1f} μC', ha='center', 
-            bbox=dict(facecolor='white', alpha=0.7, pad=2))
-    ax.text(pos2[0], pos2[1]-0.5, f'q₂ = {q2:.1f} μC', ha='center', 
-            bbox=dict(facecolor='white', alpha=0.7, pad=2))
-    
-    # Mostrar magnitud de fuerza 
-    ax.text(3.5, 4.5, f'F = {fuerza_mag:.2e} N', 
-            bbox=dict(facecolor='white', alpha=0.8), fontsize=12)
-
-    st.pyplot(fig)
+    if elegir_dinamica():
+        mostrar_dinamica((q1, q2), (x1, x2), (y1, y2))
+    else:
+        imagen, _ = dibujar_coulomb(q1, x1, y1, q2, x2, y2)
+        mostrar_imagen(imagen)
     st.markdown("</div>", unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""Nivel de detalle para mapas de color y curvas de nivel en mallas densas.
+
+Con res=1000, contourf de 100 niveles construye y rasteriza polígonos sobre
+un millón de puntos, y contour recorre otra vez la malla completa: mucho
+más de lo que cabe en los píxeles de la figura. Para mallas densas:
+
+- mapa_de_color asigna a cada punto el color de su banda con una tabla
+  precalculada (los mismos colores que daría contourf) y dibuja la imagen
+  RGBA resultante con imshow.
+- lineas calcula las curvas sobre la malla diezmada a LINEAS_MAX puntos
+  por lado, con los niveles de la malla completa.
+
+En mallas pequeñas las dos funciones llaman a contourf y contour tal cual.
+Las mallas son regulares: x (nx,), y (ny,) y Z (ny, nx).
+"""
+import numpy as np
+from matplotlib import colormaps, ticker
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import BoundaryNorm, ListedColormap, Normalize
+
+# Desde cuántos puntos el mapa se dibuja como imagen
+UMBRAL_DENSO = 300 * 300
+# Puntos por lado de la malla sobre la que se trazan las curvas de nivel
+LINEAS_MAX = 250
+
+
+def diezmar(n, maximo=LINEAS_MAX):
+    """Hasta `maximo` índices repartidos en range(n), incluidos los dos bordes."""
+    return np.unique(np.linspace(0, n - 1, min(n, maximo)).round().astype(int))
+
+
+def niveles(Z, n, relleno=True):
+    """Los niveles que elegirían contourf (relleno) o contour con levels=n."""
+    z_min, z_max = float(np.min(Z)), float(np.max(Z))
+    valores = ticker.MaxNLocator(n + 1).tick_values(z_min, z_max)
+    if not relleno:
+        dentro = (valores > z_min) & (valores < z_max)
+        valores = valores[dentro] if dentro.any() else np.array([z_min])
+    return valores
+
+
+def tabla_de_colores(limites, cmap, norm):
+    """RGBA (uint8) de cada banda: el color de contourf en su punto medio."""
+    capas = 0.5 * (limites[:-1] + limites[1:])
+    cmap = colormaps[cmap] if isinstance(cmap, str) else cmap
+    return cmap(norm(capas), bytes=True)
+
+
+def mapa_de_color(ax, x, y, Z, levels=100, cmap="viridis", norm=None):
+    """contourf de Z; en mallas densas, imagen por bandas. Devuelve lo que va al colorbar.
+
+    En la imagen, levels y norm significan lo mismo que en contourf.
+    """
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    Z = np.asarray(Z, dtype=float)
+    if Z.size <= UMBRAL_DENSO:
+        X, Y = np.meshgrid(x, y)
+        return ax.contourf(X, Y, Z, levels=levels, cmap=cmap, norm=norm)
+
+    limites = niveles(Z, levels) if np.ndim(levels) == 0 else np.asarray(levels, dtype=float)
+    norm = norm if norm is not None else Normalize(vmin=limites[0], vmax=limites[-1])
+    tabla = tabla_de_colores(limites, cmap, norm)
+    bandas = np.searchsorted(limites, Z, side="left") - 1
+    np.clip(bandas, 0, len(tabla) - 1, out=bandas)
+    ax.imshow(tabla[bandas], origin="lower", extent=(x[0], x[-1], y[0], y[-1]),
+              interpolation="nearest")
+    # Mismas bandas y colores en el colorbar que con contourf
+    return ScalarMappable(norm=BoundaryNorm(limites, len(tabla)), cmap=ListedColormap(tabla / 255))
+
+
+def lineas(ax, x, y, Z, levels=12, **kwargs):
+    """contour de Z sobre la malla diezmada a LINEAS_MAX puntos por lado."""
+    Z = np.asarray(Z, dtype=float)
+    if np.ndim(levels) == 0:
+        levels = niveles(Z, levels, relleno=False)
+    filas, columnas = diezmar(Z.shape[0]), diezmar(Z.shape[1])
+    x = np.asarray(x, dtype=float).ravel()[columnas]
+    y = np.asarray(y, dtype=float).ravel()[filas]
+    return ax.contour(x, y, Z[np.ix_(filas, columnas)], levels=levels, **kwargs)
@@ -0,0 +1,94 @@
+"""Figuras que no dependen de ningún parámetro, horneadas una sola vez.
+
+Una simulación marca con @figura_estatica la función que construye una
+figura sin entradas (p. ej. la línea de tiempo de Biot-Savart). La figura
+se rasteriza a PNG y SVG en app/static/generadas, ya sea al construir la
+imagen de Docker:
+
+    cd app && python -m simulations.estaticas
+
+o, si el archivo no existe, la primera vez que alguien la pide. Después se
+sirve directamente desde disco/memoria sin volver a tocar matplotlib.
+"""
+import importlib
+import os
+import threading
+
+from simulations.figuras import a_bytes, mostrar_imagen
+
+DIRECTORIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "generadas")
+FORMATOS = ("png", "svg")
+
+# nombre -> función sin argumentos que devuelve una Figure
+figuras_estaticas = {}
+
+_imagenes = {}
+_candado = threading.Lock()
+
+
+def figura_estatica(nombre):
+    """Registra una función sin argumentos que construye una figura fija."""
+    def decorador(funcion):
+        figuras_estaticas[nombre] = funcion
+        return funcion
+    return decorador
+
+
+def ruta(nombre, formato="png"):
+    return os.path.join(DIRECTORIO, f"{nombre}.{formato}")
+
+
+def hornear(nombre):
+    """Rasteriza la figura en todos los formatos y la guarda en DIRECTORIO."""
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    rutas = []
+    for formato in FORMATOS:
+        datos = a_bytes(figuras_estaticas[nombre](), formato=formato)
+        destino = ruta(nombre, formato)
+        temporal = destino + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(datos)
+        os.replace(temporal, destino)
+        rutas.append(destino)
+    return rutas
+
+
+def obtener(nombre):
+    """Bytes PNG de la figura: de memoria, de disco, o horneándola en ese momento."""
+    with _candado:
+        if nombre not in _imagenes:
+            if not os.path.exists(ruta(nombre)):
+                try:
+                    hornear(nombre)
+                except OSError:
+                    # Directorio de sólo lectura: nos quedamos con la copia en memoria
+                    _imagenes[nombre] = a_bytes(figuras_estaticas[nombre]())
+                    return _imagenes[nombre]
+            with open(ruta(nombre), "rb") as archivo:
+                _imagenes[nombre] = archivo.read()
+        return _imagenes[nombre]
+
+
+def mostrar_estatica(nombre):
+    mostrar_imagen(obtener(nombre))
+
+
+def hornear_todas():
+    """Importa cada simulación (eso registra sus figuras) y las hornea todas."""
+    from registro import SIMULACIONES
+
+    for modulo in sorted({modulo for modulo, _ in SIMULACIONES.values()}):
+        importlib.import_module(modulo)
+    rutas = []
+    for nombre in sorted(figuras_estaticas):
+        rutas.extend(hornear(nombre))
+    return rutas
+
+
+if __name__ == "__main__":
+    # Con `python -m` este archivo es __main__; las simulaciones registran
+    # sus figuras en simulations.estaticas, así que usamos ese módulo.
+    from simulations.estaticas import hornear_todas as _hornear_todas
+
+    for destino in _hornear_todas():
+        print(destino)
@@ -0,0 +1,65 @@
+"""Capa común para crear, rasterizar y cerrar las figuras de las simulaciones.
+
+Las figuras se crean con `matplotlib.figure.Figure` directamente y no con
+pyplot, así que nunca entran al registro global de figuras de pyplot: al
+mostrarse se convierten a bytes, se limpian y no queda ninguna referencia
+viva entre reruns de Streamlit.
+"""
+import io
+import os
+
+import streamlit as st # type: ignore
+from matplotlib.figure import Figure # type: ignore
+
+from simulations import metricas
+
+# Mismos valores que usa st.pyplot al llamar savefig
+DPI = 200
+FORMATO = "png"
+
+# Precisión de las mallas que sólo se dibujan (ver electro_core/mallas.py)
+PRECISION = os.environ.get("ELECTRO_PRECISION", "float32")
+
+
+def nueva_figura(figsize=None, **kwargs):
+    """Equivalente a plt.figure, sin registrar la figura en pyplot."""
+    metricas.comenzar("figura")
+    return Figure(figsize=figsize, **kwargs)
+
+
+def subplots(nrows=1, ncols=1, figsize=None, **kwargs):
+    """Equivalente a plt.subplots, sin registrar la figura en pyplot."""
+    metricas.comenzar("figura")
+    fig = Figure(figsize=figsize)
+    axes = fig.subplots(nrows, ncols, **kwargs)
+    return fig, axes
+
+
+def cerrar(fig):
+    """Libera los artistas de la figura para que no sobrevivan al rerun."""
+    fig.clear()
+
+
+def a_bytes(fig, formato=FORMATO, dpi=DPI):
+    """Rasteriza la figura y la cierra, aunque savefig falle."""
+    metricas.comenzar("rasterizado")
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=formato, dpi=dpi, bbox_inches="tight")
+    finally:
+        cerrar(fig)
+        metricas.comenzar(None)
+    return buffer.getvalue()
+
+
+def mostrar_imagen(datos):
+    """Muestra bytes ya rasterizados."""
+    metricas.comenzar("envio")
+    st.image(datos)
+    metricas.comenzar(None)
+    metricas.sumar_bytes(len(datos))
+
+
+def mostrar(fig):
+    """Reemplazo de st.pyplot(fig): rasteriza, cierra y muestra la figura."""
+    mostrar_imagen(a_bytes(fig))
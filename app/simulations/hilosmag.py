@@ -1,74 +1,86 @@
 import streamlit as st # type: ignore
 import numpy as np # pyright: ignore[reportMissingImports]
 import matplotlib.pyplot as plt # type: ignore
-from matplotlib.colors import Normalize # type: ignore
+import pandas as pd
+from matplotlib.colors import LogNorm, Normalize # type: ignore
 from matplotlib.cm import ScalarMappable # type: ignore
+from matplotlib.ticker import MaxNLocator # type: ignore
+from electro_core import (campo_hilo, campo_hilos, fuerzas_hilos, magnitud, malla, normalizar,
+                          potencial_vector_hilos)
+from simulations.figuras import PRECISION, subplots, a_bytes, mostrar_imagen
+from simulations.cache import cache_render
+from simulations.detalle import diezmar, lineas, mapa_de_color
 
-def campo_magnetico_hilos_interactivo():
-    st.title("🧲 Simulador Interactivo: Campos Magnéticos de dos Hilos de corriente")
-    
-    with st.expander("📚 Puedes manipular todos los parámetros", expanded=True):
-        st.markdown("""
-        Mostrar o no los campos individuales y el total, ajustar la resolución de la malla, y las posiciones y corrientes de los hilos.
-        """)
-    
-    # Controles en sidebar
-    with st.sidebar:
-        st.header("Configuración de Hilos")
-        col1, col2 = st.columns(2)
-        with col1:
-            x1 = st.slider("Hilo 1 - Pos X (m)", -2.0, 2.0, -0.5, 0.1)
-            y1 = st.slider("Hilo 1 - Pos Y (m)", -2.0, 2.0, 0.0, 0.1)
-            I1 = st.slider("Hilo 1 - Corriente (A)", -3.0, 3.0, 1.0, 0.1)
-        with col2:
-            x2 = st.slider("Hilo 2 - Pos X (m)", -2.0, 2.0, 0.5, 0.1)
-            y2 = st.slider("Hilo 2 - Pos Y (m)", -2.0, 2.0, 0.0, 0.1)
-            I2 = st.slider("Hilo 2 - Corriente (A)", -3.0, 3.0, 1.0, 0.1)
-        
-        st.markdown("---")
-        show_individual = st.checkbox("Mostrar campos individuales", True)
-        show_total = st.checkbox("Mostrar campo total", True)
-        res = st.slider("Resolución de malla", 10, 30, 20)
-
+def calcular_hilos(x1, y1, I1, x2, y2, I2, res, precision=PRECISION):
+    """Malla y campos (Bx, By, |B|) en μT de cada hilo y del total."""
     # Constantes
-    mu0 = 4 * np.pi * 1e-7
     nano = 1e6  # Para convertir a μT
 
-    # Funciones
     def campo_B(I, x0, y0, X, Y):
-        r = np.sqrt((X - x0)**2 + (Y - y0)**2)
-        Bx = -mu0 * I * (Y - y0) / (2 * np.pi * (r**2 + 1e-10)) * nano
-        By = mu0 * I * (X - x0) / (2 * np.pi * (r**2 + 1e-10)) * nano
-        return Bx, By, np.sqrt(Bx**2 + By**2)
-
-    def normalize_arrows(Bx, By):
-        norm = np.sqrt(Bx**2 + By**2)
-        mask = norm > 0
-        Bx_norm, By_norm = np.zeros_like(Bx), np.zeros_like(By)
-        Bx_norm[mask] = Bx[mask] / norm[mask]
-        By_norm[mask] = By[mask] / norm[mask]
-        return Bx_norm, By_norm
+        Bx, By = campo_hilo(I, x0, y0, X, Y)
+        Bx, By = Bx * nano, By * nano
+        return Bx, By, magnitud(Bx, By)
 
     # Crear malla
     x_min, x_max = min(x1, x2)-1, max(x1, x2)+1
     y_min, y_max = min(y1, y2)-1, max(y1, y2)+1
-    x = np.linspace(x_min, x_max, res)
-    y = np.linspace(y_min, y_max, res)
-    X, Y = np.meshgrid(x, y)
+    X, Y = malla(x_min, x_max, y_min, y_max, res, precision=precision)
 
     # Calcular campos
-    B1x, B1y, B1_mag = campo_B(I1, x1, y1, X, Y)
-    B2x, B2y, B2_mag = campo_B(I2, x2, y2, X, Y)
-    B_total_x, B_total_y = B1x + B2x, B1y + B2y
-    B_total_mag = np.sqrt(B_total_x**2 + B_total_y**2)
+    B1 = campo_B(I1, x1, y1, X, Y)
+    B2 = campo_B(I2, x2, y2, X, Y)
+    B_total_x, B_total_y = B1[0] + B2[0], B1[1] + B2[1]
+    return X, Y, B1, B2, (B_total_x, B_total_y, magnitud(B_total_x, B_total_y))
+
+
+def marcar_hilos(ax, x1, y1, I1, x2, y2, I2):
+    """Hilos, sentido de sus corrientes, fuerzas y leyenda sobre `ax`."""
+    # Hilos y direcciones
+    ax.plot(x1, y1, 'ro', markersize=12)
+    ax.plot(x2, y2, 'bo', markersize=12)
+    arrow_scale = 0.1 * max(abs(I1), abs(I2))
+    ax.quiver(x1, y1, 0, np.sign(I1)*arrow_scale, color='red', scale=15, width=0.005)
+    ax.quiver(x2, y2, 0, np.sign(I2)*arrow_scale, color='blue', scale=15, width=0.005)
+
+    # Fuerzas: dirección de la fuerza neta sobre cada hilo; largo, 0.3 de la separación
+    force_scale = 0.3 * np.hypot(x2 - x1, y2 - y1)
+    fuerzas = fuerzas_hilos([I1, I2], [x1, x2], [y1, y2]).sum(axis=1)
+    for (x, y), (Fx, Fy) in zip([(x1, y1), (x2, y2)], fuerzas):
+        F = np.hypot(Fx, Fy)
+        if F > 0:
+            ax.arrow(x, y, Fx / F * force_scale, Fy / F * force_scale,
+                    head_width=0.1, color='black')
+
+    # Configuración
+    ax.set_xlabel("x (m)")
+    ax.set_ylabel("y (m)")
+    ax.set_aspect('equal')
+
+    # Leyenda
+    handles = [
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='red', 
+                  markersize=10, label=f'Hilo 1 ($I_1$ = {I1} A)'),
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='blue', 
+                  markersize=10, label=f'Hilo 2 ($I_2$ = {I2} A)'),
+        plt.Line2D([0], [0], color='black', lw=2, label='Fuerza')
+    ]
+    ax.legend(handles=handles, loc='upper right')
+
+
+@cache_render("hilosmag")
+def dibujar_hilos(x1, y1, I1, x2, y2, I2, show_individual, show_total, res, precision=PRECISION):
+    X, Y, B1, B2, B_total = calcular_hilos(x1, y1, I1, x2, y2, I2, res, precision)
+    B1x, B1y, B1_mag = B1
+    B2x, B2y, B2_mag = B2
+    B_total_x, B_total_y, B_total_mag = B_total
 
     # Normalizar
-    B1x_norm, B1y_norm = normalize_arrows(B1x, B1y)
-    B2x_norm, B2y_norm = normalize_arrows(B2x, B2y)
-    B_total_x_norm, B_total_y_norm = normalize_arrows(B_total_x, B_total_y)
+    B1x_norm, B1y_norm = normalizar(B1x, B1y)
+    B2x_norm, B2y_norm = normalizar(B2x, B2y)
+    B_total_x_norm, B_total_y_norm = normalizar(B_total_x, B_total_y)
 
     # Visualización
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig, ax = subplots(figsize=(10, 8))
 
     # Lista para almacenar las barras de color (corregido)
     colorbars = []
@@ -109,43 +121,240 @@ def campo_magnetico_hilos_interactivo():
         cbar_total.set_label('$|\mathbf{B}_{total}|$ (μT)', labelpad=10)
         colorbars.append(cbar_total)
 
-    # Hilos y direcciones
-    ax.plot(x1, y1, 'ro', markersize=12)
-    ax.plot(x2, y2, 'bo', markersize=12)
-    arrow_scale = 0.1 * max(abs(I1), abs(I2))
-    ax.quiver(x1, y1, 0, np.sign(I1)*arrow_scale, color='red', scale=15, width=0.005)
-    ax.quiver(x2, y2, 0, np.sign(I2)*arrow_scale, color='blue', scale=15, width=0.005)
+    marcar_hilos(ax, x1, y1, I1, x2, y2, I2)
+    ax.set_title(f"Interacción entre Hilos\n$I_1$ = {I1} A, $I_2$ = {I2} A", pad=20)
+    ax.grid(True, linestyle='--', alpha=0.3)
 
-    # Fuerzas
-    force_scale = 0.3
-    if I1 * I2 > 0:  # Atracción
-        ax.arrow(x1, y1, (x2-x1)*force_scale, (y2-y1)*force_scale, 
-                head_width=0.1, color='black')
-        ax.arrow(x2, y2, (x1-x2)*force_scale, (y1-y2)*force_scale, 
-                head_width=0.1, color='black')
-    else:  # Repulsión
-        ax.arrow(x1, y1, (x1-x2)*force_scale, (y1-y2)*force_scale, 
-                head_width=0.1, color='black')
-        ax.arrow(x2, y2, (x2-x1)*force_scale, (y2-y1)*force_scale, 
-                head_width=0.1, color='black')
+    return a_bytes(fig), {}
 
-    # Configuración
-    ax.set_title(f"Interacción entre Hilos\n$I_1$ = {I1} A, $I_2$ = {I2} A", pad=20)
+
+# Líneas de campo dibujadas como máximo con la opción de flujo por línea
+LINEAS_AZ_MAX = 200
+
+
+def calcular_hilos_az(x1, y1, I1, x2, y2, I2, res, precision=PRECISION):
+    """Malla (x, y) y potencial vector Az (μWb/m) de los dos hilos."""
+    x_min, x_max = min(x1, x2)-1, max(x1, x2)+1
+    y_min, y_max = min(y1, y2)-1, max(y1, y2)+1
+    X, Y = malla(x_min, x_max, y_min, y_max, res, precision=precision, dispersa=True)
+    Az = potencial_vector_hilos([I1, I2], [x1, x2], [y1, y2], X, Y)
+    return X.ravel(), Y.ravel(), Az * 1e6
+
+
+def niveles_az(Az, n_lineas=20, flujo=None):
+    """(niveles, flujo entre líneas) para las líneas de campo, curvas de nivel de Az.
+
+    Con `flujo` (μWb/m) hay una línea en cada múltiplo de flujo, así que su
+    densidad es proporcional a |B| y no se mueven al cambiar las corrientes
+    de escala; sin él, n_lineas repartidas en el rango. Az diverge como
+    ln r sobre cada hilo: el rango sale del 0.1-99.9 % de la malla.
+    """
+    a_min, a_max = (float(a) for a in np.percentile(Az, [0.1, 99.9]))
+    if a_max <= a_min:
+        return np.array([]), 0.0
+    flujo = (a_max - a_min) / n_lineas if flujo is None else flujo
+    flujo = max(flujo, (a_max - a_min) / LINEAS_AZ_MAX)
+    return np.arange(np.ceil(a_min / flujo), np.floor(a_max / flujo) + 1) * flujo, flujo
+
+
+@cache_render("hilosmag_az")
+def dibujar_hilos_az(x1, y1, I1, x2, y2, I2, res, n_lineas=20, flujo=None, precision=PRECISION):
+    x, y, Az = calcular_hilos_az(x1, y1, I1, x2, y2, I2, res, precision)
+    levels, flujo = niveles_az(Az, n_lineas, flujo)
+
+    fig, ax = subplots(figsize=(10, 8))
+    if len(levels):
+        limites = np.linspace(levels[0], levels[-1], 101)
+        fondo = mapa_de_color(ax, x, y, np.clip(Az.astype(float), levels[0], levels[-1]),
+                              levels=limites, cmap='RdBu_r')
+        barra = fig.colorbar(fondo, ax=ax, label='$A_z$ (μWb/m)')
+        barra.locator = MaxNLocator(8)
+        lineas(ax, x, y, Az, levels=levels, colors='black', linewidths=0.8, linestyles='solid')
+
+    marcar_hilos(ax, x1, y1, I1, x2, y2, I2)
+    ax.set_title(f"Líneas de campo ($A_z$ constante), {flujo:.3g} μWb/m entre líneas\n"
+                 f"$I_1$ = {I1} A, $I_2$ = {I2} A", pad=20)
+    ax.set_xlim(x[0], x[-1])
+    ax.set_ylim(y[0], y[-1])
+
+    return a_bytes(fig), {"flujo": flujo, "lineas": len(levels)}
+
+
+CONFIGURACIONES = ("Haz de conductores", "Bobina (sección transversal)", "Aleatoria")
+# Región dibujada en el modo de N hilos (m)
+LIMITE_N = 2.5
+# Hasta cuántos hilos se muestra la matriz de fuerzas completa
+MATRIZ_MAX = 12
+# Flechas de fuerza dibujadas como máximo
+FLECHAS_MAX = 80
+
+
+def generar_hilos(configuracion, n, corriente, semilla=0):
+    """(I, x0, y0) de n hilos paralelos a ẑ en la configuración pedida."""
+    if configuracion == "Haz de conductores":
+        # Espiral de Vogel: n hilos casi equiespaciados en un disco de 0.8 m
+        k = np.arange(n)
+        r = 0.8 * np.sqrt((k + 0.5) / n)
+        theta = k * np.pi * (3 - np.sqrt(5))
+        return np.full(n, float(corriente)), r * np.cos(theta), r * np.sin(theta)
+    if configuracion == "Bobina (sección transversal)":
+        # Dos bloques de espiras de 0.3 m × 1.6 m en x = ±1 m: la corriente
+        # sale del plano por el derecho y entra por el izquierdo
+        def bloque(m, centro):
+            columnas = max(int(np.ceil(np.sqrt(m / 5))), 1)
+            filas = int(np.ceil(m / columnas))
+            k = np.arange(m)
+            return (centro + 0.3 * ((k % columnas + 0.5) / columnas - 0.5),
+                    1.6 * ((k // columnas + 0.5) / filas - 0.5))
+        derecha, izquierda = bloque(n - n // 2, 1.0), bloque(n // 2, -1.0)
+        I = np.concatenate([np.full(n - n // 2, float(corriente)), np.full(n // 2, -float(corriente))])
+        return I, np.concatenate([derecha[0], izquierda[0]]), np.concatenate([derecha[1], izquierda[1]])
+    if configuracion == "Aleatoria":
+        rng = np.random.default_rng(semilla)
+        x0, y0 = rng.uniform(-1.5, 1.5, (2, n))
+        return corriente * rng.choice([-1.0, 1.0], n), x0, y0
+    raise ValueError(f"Configuración desconocida: {configuracion!r}")
+
+
+def calcular_n_hilos(configuracion, n, corriente, res, semilla=0, precision=PRECISION):
+    """Hilos, malla, campo total (Bx, By) en μT y matriz de fuerzas (N/m) de n hilos."""
+    I, x0, y0 = generar_hilos(configuracion, n, corriente, semilla)
+    X, Y = malla(-LIMITE_N, LIMITE_N, -LIMITE_N, LIMITE_N, res, precision=precision, dispersa=True)
+    Bx, By = campo_hilos(I, x0, y0, X, Y)
+    return (I, x0, y0), X.ravel(), Y.ravel(), Bx * 1e6, By * 1e6, fuerzas_hilos(I, x0, y0)
+
+
+@cache_render("hilosmag_n")
+def dibujar_n_hilos(configuracion, n, corriente, res, semilla=0, precision=PRECISION):
+    (I, x0, y0), x, y, Bx, By, F = calcular_n_hilos(configuracion, n, corriente, res, semilla, precision)
+    B_mag = magnitud(Bx, By)
+    netas = F.sum(axis=1)
+
+    fig, ax = subplots(figsize=(10, 8))
+    # Junto a cada hilo |B| crece como 1/r: la escala llega al 99.5 % de la malla
+    vmax = max(float(np.percentile(B_mag, 99.5)), 1e-9)
+    vmin = min(max(float(B_mag.min()), vmax * 1e-3), vmax / 10)
+    im = ax.imshow(B_mag, origin='lower', extent=(x[0], x[-1], y[0], y[-1]), cmap='magma',
+                   norm=LogNorm(vmin=vmin, vmax=vmax), interpolation='bilinear')
+    fig.colorbar(im, ax=ax, label='$|\\mathbf{B}|$ (μT)')
+    paso = max(res // 100, 1)
+    ax.streamplot(x[::paso], y[::paso], Bx[::paso, ::paso], By[::paso, ::paso],
+                  color='white', linewidth=0.5, density=1.5, arrowsize=0.7)
+
+    ax.scatter(x0, y0, c=np.sign(I), cmap='bwr', vmin=-1, vmax=1, s=min(80, 4000 / n),
+               edgecolors='black', linewidths=0.5, zorder=3)
+    F_max = float(np.hypot(*netas.T).max())
+    if F_max > 0:
+        # Hasta FLECHAS_MAX flechas; la fuerza neta más grande mide 0.3 m
+        i = diezmar(n, FLECHAS_MAX)
+        ax.quiver(x0[i], y0[i], netas[i, 0], netas[i, 1], color='lime', angles='xy', scale_units='xy',
+                  scale=F_max / 0.3, width=0.003, zorder=4)
+
+    ax.set_title(f"{n} hilos: {configuracion.lower()}, I = {corriente} A por hilo")
     ax.set_xlabel("x (m)")
     ax.set_ylabel("y (m)")
-    ax.grid(True, linestyle='--', alpha=0.3)
+    ax.set_xlim(-LIMITE_N, LIMITE_N)
+    ax.set_ylim(-LIMITE_N, LIMITE_N)
     ax.set_aspect('equal')
-
-    # Leyenda
     handles = [
-        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='red', 
-                  markersize=10, label=f'Hilo 1 ($I_1$ = {I1} A)'),
-        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='blue', 
-                  markersize=10, label=f'Hilo 2 ($I_2$ = {I2} A)'),
-        plt.Line2D([0], [0], color='black', lw=2, label='Fuerza')
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='red', markersize=10,
+                   label='Corriente saliente (+z)'),
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='blue', markersize=10,
+                   label='Corriente entrante (-z)'),
+        plt.Line2D([0], [0], color='lime', lw=2, label='Fuerza neta por unidad de longitud'),
     ]
     ax.legend(handles=handles, loc='upper right')
 
-    st.pyplot(fig)
+    resumen = {
+        "corriente_neta": float(I.sum()),
+        "fuerza_max": F_max,
+        # Acción y reacción: la suma de todas las fuerzas debe ser cero
+        "fuerza_total": float(np.hypot(*netas.sum(axis=0))),
+    }
+    if n <= MATRIZ_MAX:
+        # Módulo con signo: positivo si se atraen (corrientes del mismo sentido)
+        resumen["matriz"] = np.hypot(F[..., 0], F[..., 1]) * np.sign(np.outer(I, I))
+    return a_bytes(fig), resumen
+
+
+def n_hilos():
+    col1, col2 = st.columns(2)
+    with col1:
+        configuracion = st.selectbox("Configuración", CONFIGURACIONES)
+        n = st.slider("Número de hilos", 2, 500, 60)
+    with col2:
+        corriente = st.slider("Corriente por hilo (A)", -5.0, 5.0, 1.0, 0.1, key="hilos_n_corriente")
+        res = st.slider("Resolución de malla", 50, 400, 200, 50, key="hilos_n_res")
+    semilla = st.number_input("Semilla", 0, 9999, 0) if configuracion == "Aleatoria" else 0
+
+    imagen, resumen = dibujar_n_hilos(configuracion, n, corriente, res, semilla)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Corriente neta", f"{resumen['corriente_neta']:.1f} A")
+    col2.metric("Fuerza neta máxima", f"{resumen['fuerza_max'] * 1e6:.3g} μN/m")
+    col3.metric("Suma de todas las fuerzas", f"{resumen['fuerza_total'] * 1e6:.1e} μN/m",
+                help="Por acción y reacción debe ser cero (salvo redondeo).")
+    mostrar_imagen(imagen)
+
+    if "matriz" in resumen:
+        st.markdown("**Fuerza entre pares (μN/m)**: |F[i, j]| sobre el hilo i debida al j; "
+                    "positiva si se atraen.")
+        nombres = [f"Hilo {i}" for i in range(1, n + 1)]
+        st.dataframe(pd.DataFrame(resumen["matriz"] * 1e6, index=nombres, columns=nombres).style.format("{:.3g}"))
+    else:
+        st.caption(f"La matriz de fuerzas entre pares se muestra con hasta {MATRIZ_MAX} hilos.")
+
+
+def campo_magnetico_hilos_interactivo():
+    st.title("🧲 Simulador Interactivo: Campos Magnéticos de Hilos de corriente")
+
+    sistema = st.radio("Sistema", ["Dos hilos", "N hilos"], horizontal=True)
+    if sistema == "N hilos":
+        n_hilos()
+        return
+    
+    with st.expander("📚 Puedes manipular todos los parámetros", expanded=True):
+        st.markdown("""
+        Mostrar o no los campos individuales y el total, ajustar la resolución de la malla, y las posiciones y corrientes de los hilos.
+        """)
+    
+    # Controles en sidebar
+    with st.expander("⚙️ Configuración de Hilos", expanded=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            x1 = st.slider("Hilo 1 - Pos X (m)", -2.0, 2.0, -0.5, 0.1)
+            y1 = st.slider("Hilo 1 - Pos Y (m)", -2.0, 2.0, 0.0, 0.1)
+            I1 = st.slider("Hilo 1 - Corriente (A)", -3.0, 3.0, 1.0, 0.1)
+        with col2:
+            x2 = st.slider("Hilo 2 - Pos X (m)", -2.0, 2.0, 0.5, 0.1)
+            y2 = st.slider("Hilo 2 - Pos Y (m)", -2.0, 2.0, 0.0, 0.1)
+            I2 = st.slider("Hilo 2 - Corriente (A)", -3.0, 3.0, 1.0, 0.1)
+        
+        st.markdown("---")
+        representacion = st.radio("Representación", ["Flechas", "Líneas de campo (Az)"], horizontal=True,
+                                  help="Las líneas de campo son curvas de nivel del potencial vector Az: "
+                                       "un solo mapa escalar en lugar de tres campos de flechas.")
+        if representacion == "Líneas de campo (Az)":
+            densidad = st.radio("Densidad de líneas", ["Número de líneas", "Flujo por línea"], horizontal=True)
+            if densidad == "Flujo por línea":
+                n_lineas = 20
+                flujo = st.slider("Flujo entre líneas (μWb/m)", 0.01, 1.0, 0.05, 0.01,
+                                  help="La densidad de líneas es proporcional a |B|.")
+            else:
+                n_lineas = st.slider("Número de líneas", 5, 60, 20)
+                flujo = None
+            res = st.slider("Resolución de malla", 100, 600, 300, 50, key="hilos_az_res")
+        else:
+            show_individual = st.checkbox("Mostrar campos individuales", True)
+            show_total = st.checkbox("Mostrar campo total", True)
+            res = st.slider("Resolución de malla", 10, 30, 20)
+
+    if representacion == "Líneas de campo (Az)":
+        imagen, resumen = dibujar_hilos_az(x1, y1, I1, x2, y2, I2, res, n_lineas, flujo)
+        if resumen["lineas"] and flujo is not None and resumen["flujo"] > flujo:
+            st.warning(f"Con ese flujo habría más de {LINEAS_AZ_MAX} líneas: "
+                       f"se usan {resumen['flujo']:.3g} μWb/m entre líneas.")
+    else:
+        imagen, _ = dibujar_hilos(x1, y1, I1, x2, y2, I2, show_individual, show_total, res)
+    mostrar_imagen(imagen)
     
 
@@ -0,0 +1,175 @@
+"""Vistas 3D interactivas con Plotly (WebGL) para las simulaciones 3D.
+
+Las figuras de mplot3d llegan como PNG, así que girar la cámara exige mover
+un slider y repetir todo el rerun. En modo interactivo la página manda una
+sola vez la geometría y los campos ya calculados a una figura WebGL, y la
+rotación y el zoom ocurren en el navegador sin tocar el servidor.
+
+Lo mismo vale para las animaciones: la trayectoria completa se calcula de
+una vez y viaja como fotogramas de Plotly, que el navegador reproduce sin
+un rerun por cuadro.
+
+Los arreglos se bajan a float32 y Plotly los serializa como arreglos
+tipados en base64 ("bdata"), que ocupan bastante menos que las listas de
+JSON y que los PNG de 200 dpi. Las escenas se cachean igual que las
+imágenes: cache_render guarda los bytes del JSON.
+"""
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from simulations import metricas
+
+ALTURA = 700
+
+
+def compacto(arreglo):
+    """Arreglo en float32, que Plotly manda como bytes en base64."""
+    return np.ascontiguousarray(arreglo, dtype=np.float32)
+
+
+def elegir_modo(clave):
+    """Interruptor por página entre imagen estática y vista interactiva."""
+    return st.toggle(
+        "🖱️ Vista 3D interactiva (WebGL)",
+        key=f"interactivo_{clave}",
+        help="Gira y acerca la figura en el navegador sin volver a calcularla.",
+    )
+
+
+def nueva_escena(titulo, rangos=None, aspecto="cube"):
+    """Figura de Plotly con una escena 3D ya configurada."""
+    metricas.comenzar("figura")
+    escena = dict(
+        xaxis_title="X (m)", yaxis_title="Y (m)", zaxis_title="Z (m)",
+        aspectmode=aspecto,
+    )
+    for eje, rango in zip("xyz", rangos or ()):
+        if rango is not None:
+            escena[f"{eje}axis_range"] = list(rango)
+    fig = go.Figure()
+    fig.update_layout(
+        title=titulo, scene=escena, height=ALTURA,
+        margin=dict(l=0, r=0, t=50, b=0),
+        legend=dict(yanchor="top", y=0.95, xanchor="right", x=0.99),
+    )
+    return fig
+
+
+def nueva_animacion(titulo, rangos, altura=ALTURA):
+    """Figura de Plotly 2D con ejes en metros a la misma escala."""
+    metricas.comenzar("figura")
+    fig = go.Figure()
+    fig.update_layout(
+        title=titulo, height=altura, margin=dict(l=0, r=0, t=50, b=0), showlegend=False,
+        xaxis=dict(title="x (m)", range=list(rangos[0])),
+        yaxis=dict(title="y (m)", range=list(rangos[1]), scaleanchor="x", scaleratio=1),
+    )
+    return fig
+
+
+def fotogramas(fig, trazas, cuadros, etiquetas, duracion_ms=40):
+    """Agrega los fotogramas, el botón de reproducir y el deslizador de tiempo.
+
+    `cuadros` es una lista con, para cada fotograma, las trazas nuevas de
+    los índices `trazas`; las demás trazas no cambian.
+    """
+    nombres = [str(i) for i in range(len(cuadros))]
+    fig.frames = [go.Frame(data=datos, traces=trazas, name=nombre) for datos, nombre in zip(cuadros, nombres)]
+    inmediato = dict(mode="immediate", frame=dict(duration=0, redraw=False), transition=dict(duration=0))
+    fig.update_layout(
+        updatemenus=[dict(
+            type="buttons", direction="left", x=0, y=-0.08, xanchor="left", yanchor="top",
+            buttons=[
+                dict(label="▶", method="animate",
+                     args=[None, dict(frame=dict(duration=duracion_ms, redraw=False),
+                                      transition=dict(duration=0), fromcurrent=True)]),
+                dict(label="⏸", method="animate", args=[[None], inmediato]),
+            ],
+        )],
+        sliders=[dict(
+            x=0.12, y=-0.04, len=0.88, currentvalue=dict(prefix="t = "),
+            steps=[dict(label=etiqueta, method="animate", args=[[nombre], inmediato])
+                   for etiqueta, nombre in zip(etiquetas, nombres)],
+        )],
+    )
+    return fig
+
+
+def flechas(origenes, vectores, longitud, color, nombre):
+    """Conos de longitud fija en la dirección de cada vector (como quiver normalize=True)."""
+    origenes = np.asarray(origenes, dtype=float)
+    vectores = np.asarray(vectores, dtype=float)
+    norma = np.linalg.norm(vectores, axis=-1, keepdims=True)
+    unitarios = np.divide(vectores, norma, out=np.zeros_like(vectores), where=norma > 0)
+    return go.Cone(
+        x=compacto(origenes[:, 0]), y=compacto(origenes[:, 1]), z=compacto(origenes[:, 2]),
+        u=compacto(unitarios[:, 0]), v=compacto(unitarios[:, 1]), w=compacto(unitarios[:, 2]),
+        sizemode="absolute", sizeref=longitud, anchor="tail",
+        colorscale=[[0, color], [1, color]], showscale=False, name=nombre, showlegend=True,
+    )
+
+
+def vector(origen, direccion, longitud, color, nombre, etiqueta=None):
+    """Flecha con cuerpo: una línea y un cono en la punta. Devuelve dos trazas."""
+    origen = np.asarray(origen, dtype=float)
+    direccion = np.asarray(direccion, dtype=float)
+    norma = np.linalg.norm(direccion)
+    if norma > 0:
+        direccion = direccion / norma
+    punta = origen + longitud * direccion
+    cuerpo = go.Scatter3d(
+        x=[origen[0], punta[0]], y=[origen[1], punta[1]], z=[origen[2], punta[2]],
+        mode="lines+text" if etiqueta else "lines", text=["", etiqueta] if etiqueta else None,
+        textfont=dict(color=color), line=dict(color=color, width=6), name=nombre, legendgroup=nombre,
+    )
+    cabeza = go.Cone(
+        x=[punta[0]], y=[punta[1]], z=[punta[2]],
+        u=[direccion[0]], v=[direccion[1]], w=[direccion[2]],
+        sizemode="absolute", sizeref=0.15 * longitud, anchor="tip",
+        colorscale=[[0, color], [1, color]], showscale=False, legendgroup=nombre, showlegend=False,
+    )
+    return cuerpo, cabeza
+
+
+def polilineas(lineas, valores=None, **kwargs):
+    """Varias polilíneas (K_i, 3) en una sola traza, separadas por NaN.
+
+    Con `valores` (uno por punto) la línea se colorea con ellos.
+    """
+    partes, colores = [], []
+    for i, linea in enumerate(lineas):
+        partes.append(np.asarray(linea, dtype=float))
+        partes.append(np.full((1, 3), np.nan))
+        if valores is not None:
+            colores.append(np.asarray(valores[i], dtype=float))
+            colores.append(np.asarray(valores[i][-1:], dtype=float))
+    puntos = np.concatenate(partes) if partes else np.empty((0, 3))
+    traza = dict(x=compacto(puntos[:, 0]), y=compacto(puntos[:, 1]), z=compacto(puntos[:, 2]),
+                 mode="lines", connectgaps=False)
+    if valores is not None:
+        linea = dict(kwargs.pop("line", {}))
+        linea["color"] = compacto(np.concatenate(colores))
+        traza["line"] = linea
+    traza.update(kwargs)
+    return go.Scatter3d(**traza)
+
+
+def a_json(fig):
+    """Serializa la figura de Plotly; ocupa el lugar del rasterizado."""
+    metricas.comenzar("rasterizado")
+    try:
+        return pio.to_json(fig, validate=False).encode("utf-8")
+    finally:
+        metricas.comenzar(None)
+
+
+def mostrar_escena(datos):
+    """Manda al navegador una escena producida por a_json."""
+    metricas.comenzar("envio")
+    st.plotly_chart(json.loads(datos), config={"displaylogo": False})
+    metricas.comenzar(None)
+    metricas.sumar_bytes(len(datos))
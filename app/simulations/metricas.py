@@ -0,0 +1,129 @@
+"""Cronómetro por etapas de cada rerun.
+
+Las etapas las marcan las capas comunes, no cada simulación:
+
+- "calculo": desde que una función dibujar_* empieza (fallo de caché)
+  hasta que crea su figura,
+- "figura": construcción de artistas de matplotlib,
+- "rasterizado": savefig a bytes,
+- "envio": entrega de los bytes a Streamlit,
+- "cola": espera por un proceso de dibujo (ver simulations/procesos.py).
+
+Cada hilo (Streamlit ejecuta cada rerun en el hilo de su sesión) lleva su
+propio registro; publicar() deja una copia en `ultimo` para quien lo lea
+desde otro hilo, como el benchmark.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+_local = threading.local()
+
+# Último registro publicado por cualquier hilo
+ultimo = None
+
+
+# simulación -> {"reruns": n, "bytes": n, "etapas": {etapa: segundos}}, de todo el proceso
+acumulado = {}
+_candado_acumulado = threading.Lock()
+
+
+def _estado():
+    if not hasattr(_local, "etapas"):
+        _local.etapas = {}
+        _local.bytes = 0
+        _local.actual = None
+        _local.inicio = None
+        _local.simulaciones = []
+    return _local
+
+
+def reiniciar():
+    """Empieza un registro vacío para el rerun actual."""
+    estado = _estado()
+    estado.etapas = {}
+    estado.bytes = 0
+    estado.actual = None
+    estado.inicio = None
+
+
+def comenzar(etapa):
+    """Cierra la etapa en curso y abre `etapa` (None para no abrir ninguna)."""
+    estado = _estado()
+    ahora = time.perf_counter()
+    if estado.actual is not None:
+        estado.etapas[estado.actual] = estado.etapas.get(estado.actual, 0.0) + ahora - estado.inicio
+    estado.actual = etapa
+    estado.inicio = ahora
+
+
+def sumar_bytes(cantidad):
+    _estado().bytes += cantidad
+
+
+def sumar_etapas(etapas, descontar_de=None):
+    """Suma etapas medidas en otro lado (p. ej. un proceso hijo).
+
+    Cierra la etapa en curso. Si se da `descontar_de`, esa etapa pierde el
+    tiempo sumado, porque ya lo había contado como espera.
+    """
+    comenzar(None)
+    estado = _estado()
+    for etapa, segundos in etapas.items():
+        estado.etapas[etapa] = estado.etapas.get(etapa, 0.0) + segundos
+    if descontar_de is not None:
+        restante = estado.etapas.get(descontar_de, 0.0) - sum(etapas.values())
+        estado.etapas[descontar_de] = max(restante, 0.0)
+
+
+def registro():
+    """Copia de lo medido hasta ahora: {"etapas": {...}, "bytes": n}."""
+    estado = _estado()
+    return {"etapas": dict(estado.etapas), "bytes": estado.bytes}
+
+
+def publicar():
+    """Copia el registro del hilo actual en `ultimo` y lo devuelve."""
+    global ultimo
+    ultimo = registro()
+    return ultimo
+
+
+def nuevo_rerun():
+    """Olvida las simulaciones medidas en el rerun anterior de este hilo."""
+    _estado().simulaciones = []
+
+
+@contextmanager
+def simulacion(nombre):
+    """Mide una simulación completa y la suma al acumulado del proceso."""
+    reiniciar()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        comenzar(None)
+        medida = registro()
+        medida["nombre"] = nombre
+        medida["total"] = time.perf_counter() - inicio
+        # Un fragmento que se vuelve a correr reemplaza su medida anterior
+        simulaciones = [m for m in _estado().simulaciones if m["nombre"] != nombre]
+        _estado().simulaciones = simulaciones + [medida]
+        with _candado_acumulado:
+            total = acumulado.setdefault(nombre, {"reruns": 0, "bytes": 0, "etapas": {}})
+            total["reruns"] += 1
+            total["bytes"] += medida["bytes"]
+            for etapa, segundos in list(medida["etapas"].items()) + [("total", medida["total"])]:
+                total["etapas"][etapa] = total["etapas"].get(etapa, 0.0) + segundos
+
+
+def simulaciones_del_rerun():
+    return list(_estado().simulaciones)
+
+
+def copia_acumulado():
+    with _candado_acumulado:
+        return {
+            nombre: {"reruns": t["reruns"], "bytes": t["bytes"], "etapas": dict(t["etapas"])}
+            for nombre, t in acumulado.items()
+        }
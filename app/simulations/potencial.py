@@ -1,61 +1,156 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 from matplotlib.colors import SymLogNorm
+from electro_core import DISTRIBUCIONES, generar_cargas, malla, potencial_puntual, superponer
+from simulations.figuras import PRECISION, subplots, a_bytes, mostrar_imagen
+from simulations.cache import cache_render
+from simulations.detalle import lineas, mapa_de_color
 
-def potencial_electrostatico():
-    st.title("⚡ Potencial Electrostático de Carga Puntual")
-    
-    with st.expander("📚 Teoría", expanded=True):
-        st.markdown("""
-        
-        """)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        q = st.slider("Carga (nC)", -20.0, 20.0, 10.0, 0.1)
-    with col2:
-        res = st.slider("Resolución", 100, 1000, 500, 50)
-    
-    # Constantes
-    k_nano = 8.99e9 * 1e-9  # k para q en nC
-    
-    # Mallado
-    x = np.linspace(-2, 2, res)
-    y = np.linspace(-2, 2, res)
-    X, Y = np.meshgrid(x, y)
-    r = np.sqrt(X**2 + Y**2)
-    r[r == 0] = 1e-10  # Evitar división por cero
+# k para q en nC
+K_NANO = 8.99e9 * 1e-9
+# Región completa (x_min, x_max, y_min, y_max); el zoom calcula sólo una ventana dentro de ella
+VENTANA = (-2.0, 2.0, -2.0, 2.0)
+
+def calcular_potencial(q, res, precision=PRECISION, ventana=VENTANA):
+    # Mallado (X es una fila e Y una columna; V sí ocupa toda la malla)
+    X, Y = malla(*ventana, res, precision=precision, dispersa=True)
     
-    # Cálculo del potencial
-    V = k_nano * q / r
+    # Cálculo del potencial (r = 0 se reemplaza por 1e-10)
+    V = potencial_puntual(q, X, Y, k=K_NANO)
+    return X, Y, V
+
+
+@cache_render("potencial")
+def dibujar_potencial(q, res, precision=PRECISION, ventana=VENTANA):
+    X, Y, V = calcular_potencial(q, res, precision, ventana)
+    # contourf y contour trabajan en float64 y copian lo que no lo sea:
+    # convertir una sola vez para que las dos llamadas compartan la malla
+    x, y = X.ravel(), Y.ravel()
+    V = np.asarray(V, dtype=float)
     
     # Visualización
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig, ax = subplots(figsize=(10, 8))
     vmax = np.max(np.abs(V))
     linthresh = 0.1 * vmax
     
-    # Mapa de color
-    contour = ax.contourf(
-        X, Y, V, 
-        levels=100, 
+    # Mapa de color (imagen por bandas en mallas densas, ver simulations/detalle.py)
+    contour = mapa_de_color(
+        ax, x, y, V,
+        levels=100,
         cmap='viridis',
         norm=SymLogNorm(linthresh=linthresh, vmin=-vmax, vmax=vmax))
     
-    # Líneas equipotenciales
-    ax.contour(X, Y, V, levels=12, colors='white', alpha=0.3, linewidths=0.5)
+    # Líneas equipotenciales, sobre la malla diezmada
+    lineas(ax, x, y, V, levels=12, colors='white', alpha=0.3, linewidths=0.5)
     
     # Carga puntual
     color = 'red' if q > 0 else 'blue'
     ax.scatter([0], [0], color=color, s=200, label=f'Carga: {q} nC')
+    ax.set_xlim(ventana[0], ventana[1])
+    ax.set_ylim(ventana[2], ventana[3])
     
     # Configuración
-    cbar = plt.colorbar(contour, label='Potencial (V)')
+    cbar = fig.colorbar(contour, ax=ax, label='Potencial (V)')
     ax.set_title(f'Potencial {"Positivo" if q > 0 else "Negativo"}', pad=15)
     ax.set_xlabel('x (m)')
     ax.set_ylabel('y (m)')
     ax.legend()
     ax.grid(True, alpha=0.2)
     ax.set_aspect('equal')
+
+    return a_bytes(fig), {}
+
+
+def calcular_potencial_cargas(distribucion, n, semilla, res, precision=PRECISION, ventana=VENTANA):
+    q, pos = generar_cargas(distribucion, n, semilla, extension=1.8)
+    X, Y = malla(*ventana, res, precision=precision, dispersa=True)
+
+    # Por bloques de la malla y grupos de cargas: nunca N×res×res a la vez
+    V = superponer(q, pos[:, 0], pos[:, 1], X.ravel(), Y.ravel(), k=K_NANO)
+    return X, Y, V, q, pos
+
+
+@cache_render("potencial_cargas")
+def dibujar_potencial_cargas(distribucion, n, semilla, res, precision=PRECISION, ventana=VENTANA):
+    X, Y, V, q, pos = calcular_potencial_cargas(distribucion, n, semilla, res, precision, ventana)
+    x, y = X.ravel(), Y.ravel()
+    V = np.asarray(V, dtype=float)
+
+    fig, ax = subplots(figsize=(10, 8))
+    # Los puntos de la malla que caen sobre una carga valen k·q/1e-10:
+    # la escala se fija con el 99.5 % de los valores y el resto satura
+    vmax = np.percentile(np.abs(V), 99.5)
+    contour = mapa_de_color(
+        ax, x, y, np.clip(V, -vmax, vmax),
+        levels=100,
+        cmap='viridis',
+        norm=SymLogNorm(linthresh=0.1 * vmax, vmin=-vmax, vmax=vmax))
+    lineas(ax, x, y, V, levels=np.linspace(-vmax, vmax, 13), colors='white', alpha=0.3, linewidths=0.5)
+
+    tamano = max(200 / np.sqrt(n), 4)
+    for signo, color, nombre in ((1, 'red', 'Positivas'), (-1, 'blue', 'Negativas')):
+        cargas = pos[np.sign(q) == signo]
+        if len(cargas):
+            ax.scatter(cargas[:, 0], cargas[:, 1], color=color, s=tamano, edgecolors='white',
+                       linewidths=0.3, label=f'{nombre}: {len(cargas)}')
+
+    fig.colorbar(contour, ax=ax, label='Potencial (V)')
+    ax.set_title(f'Potencial de {n} cargas ({distribucion.lower()})', pad=15)
+    ax.set_xlabel('x (m)')
+    ax.set_ylabel('y (m)')
+    ax.set_xlim(ventana[0], ventana[1])
+    ax.set_ylim(ventana[2], ventana[3])
+    ax.legend(loc='upper right')
+    ax.grid(True, alpha=0.2)
+    ax.set_aspect('equal')
+
+    return a_bytes(fig), {"q_total": float(q.sum())}
+
+
+def elegir_ventana():
+    """VENTANA, o la ventana elegida con el zoom (se recalcula a resolución completa)."""
+    if not st.toggle("🔍 Zoom", help="Recalcula sólo la ventana elegida con toda la resolución."):
+        return VENTANA
+    col1, col2 = st.columns(2)
+    with col1:
+        x_min, x_max = st.slider("Ventana en x (m)", VENTANA[0], VENTANA[1], (-0.5, 0.5), 0.05)
+    with col2:
+        y_min, y_max = st.slider("Ventana en y (m)", VENTANA[2], VENTANA[3], (-0.5, 0.5), 0.05)
+    # Una ventana sin ancho no tiene malla
+    return (x_min, max(x_max, x_min + 0.05), y_min, max(y_max, y_min + 0.05))
+
+
+def potencial_electrostatico():
+    st.title("⚡ Potencial Electrostático de Carga Puntual")
     
-    st.pyplot(fig)
\ No newline at end of file
+    with st.expander("📚 Teoría", expanded=True):
+        st.markdown("""
+        
+        """)
+    
+    fuente = st.radio("Fuente", ["Carga puntual", "Distribución de cargas"], horizontal=True)
+
+    col1, col2 = st.columns(2)
+    if fuente == "Carga puntual":
+        with col1:
+            q = st.slider("Carga (nC)", -20.0, 20.0, 10.0, 0.1)
+        with col2:
+            res = st.slider("Resolución", 100, 1000, 500, 50)
+
+        imagen, _ = dibujar_potencial(q, res, ventana=elegir_ventana())
+        mostrar_imagen(imagen)
+        return
+
+    with col1:
+        distribucion = st.selectbox("Distribución", DISTRIBUCIONES)
+        n = st.slider("Número de cargas", 2, 1000, 100)
+        semilla = 0
+        if distribucion == "Aleatoria":
+            semilla = st.number_input("Semilla", min_value=0, max_value=9999, value=0, step=1)
+    with col2:
+        res = st.slider("Resolución", 100, 1000, 500, 50,
+                        help="Con muchas cargas y resolución alta el cálculo tarda unos segundos.")
+
+    imagen, resumen = dibujar_potencial_cargas(distribucion, n, semilla, res, ventana=elegir_ventana())
+    st.metric("Carga total", f"{resumen['q_total']:.1f} nC")
+    mostrar_imagen(imagen)
\ No newline at end of file
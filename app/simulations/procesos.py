@@ -0,0 +1,111 @@
+"""Dibujo de figuras en un grupo de procesos, fuera del hilo de Streamlit.
+
+matplotlib retiene el GIL mientras rasteriza, así que una figura pesada en
+una sesión frena a todas las demás del mismo servidor. Con este backend las
+funciones dibujar_* (las decoradas con cache_render) se mandan por nombre a
+un ProcessPoolExecutor de procesos ya calientes, que devuelven los bytes de
+la imagen y el resumen. La caché sigue viviendo en el proceso de Streamlit.
+
+Se configura con variables de entorno:
+
+- ELECTRO_RENDER_PROCESOS: número de procesos; 0 (por omisión) lo desactiva
+  y todo se dibuja en el hilo de la sesión, como antes.
+- ELECTRO_RENDER_COLA: trabajos admitidos a la vez entre ejecutándose y en
+  espera (por omisión, el doble de procesos).
+- ELECTRO_RENDER_TIMEOUT: segundos que una sesión espera su figura,
+  incluyendo el tiempo en la cola (por omisión 60).
+"""
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as TimeoutFuturo
+
+from simulations import metricas
+
+PROCESOS = int(os.environ.get("ELECTRO_RENDER_PROCESOS", "0"))
+COLA = int(os.environ.get("ELECTRO_RENDER_COLA", str(2 * PROCESOS)))
+TIMEOUT = float(os.environ.get("ELECTRO_RENDER_TIMEOUT", "60"))
+
+_pool = None
+_lugares = threading.BoundedSemaphore(max(COLA, 1))
+_candado = threading.Lock()
+
+
+class RenderNoDisponible(RuntimeError):
+    """La figura no se pudo dibujar a tiempo (cola llena o trabajo lento)."""
+
+
+def activo():
+    return PROCESOS > 0
+
+
+def _calentar():
+    """Inicializador de cada proceso: paga el arranque en frío una sola vez."""
+    from simulations import calentamiento
+    calentamiento.calentar()
+
+
+def _nada():
+    return os.getpid()
+
+
+def _dibujar(modulo, nombre, args, kwargs):
+    """Se ejecuta en el proceso hijo: llama a la función sin su caché."""
+    funcion = getattr(importlib.import_module(modulo), nombre)
+    funcion = getattr(funcion, "__wrapped__", funcion)
+    metricas.reiniciar()
+    metricas.comenzar("calculo")
+    try:
+        entrada = funcion(*args, **kwargs)
+    finally:
+        metricas.comenzar(None)
+    return entrada, metricas.registro()["etapas"]
+
+
+def obtener_pool():
+    """Crea el grupo la primera vez y arranca todos sus procesos."""
+    global _pool
+    with _candado:
+        if _pool is None:
+            # spawn: no se clonan los hilos del servidor de Streamlit
+            _pool = ProcessPoolExecutor(
+                max_workers=PROCESOS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_calentar,
+            )
+            for futuro in [_pool.submit(_nada) for _ in range(PROCESOS)]:
+                futuro.result()
+        return _pool
+
+
+def dibujar(funcion, args, kwargs):
+    """Dibuja `funcion(*args, **kwargs)` en el grupo y devuelve su resultado.
+
+    Con la cola llena lanza RenderNoDisponible en el acto, sin bloquear el
+    hilo de la sesión; también si el trabajo no termina dentro de TIMEOUT.
+    El lugar en la cola se libera cuando el trabajo de verdad termina (o se
+    cancela antes de empezar), aunque la sesión ya se haya rendido: un
+    trabajo que sigue corriendo en un proceso sigue ocupando su lugar.
+    """
+    metricas.comenzar("cola")
+    if not _lugares.acquire(blocking=False):
+        raise RenderNoDisponible("Hay demasiadas figuras en espera; intenta de nuevo en un momento.")
+    try:
+        futuro = obtener_pool().submit(_dibujar, funcion.__module__, funcion.__name__, args, kwargs)
+    except BaseException:
+        _lugares.release()
+        raise
+    futuro.add_done_callback(lambda _: _lugares.release())
+
+    try:
+        entrada, etapas = futuro.result(timeout=TIMEOUT)
+    except TimeoutFuturo:
+        # Sólo quita el trabajo si aún no empezó; si ya corre, su lugar se
+        # libera en add_done_callback cuando termine
+        futuro.cancel()
+        raise RenderNoDisponible(f"La figura tardó más de {TIMEOUT:.0f} s en dibujarse.") from None
+
+    # Lo que se midió en el hijo se reparte en sus etapas; el resto fue espera
+    metricas.sumar_etapas(etapas, descontar_de="cola")
+    return entrada
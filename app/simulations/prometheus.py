@@ -0,0 +1,68 @@
+"""Exportación de las métricas en el formato de texto de Prometheus.
+
+Si la variable de entorno ELECTRO_METRICAS_ARCHIVO apunta a un archivo,
+después de cada simulación se reescribe con los totales acumulados del
+proceso (tiempos por etapa, reruns, bytes enviados y estadísticas de las
+cachés). El archivo se reemplaza de forma atómica, como espera el
+textfile collector de node_exporter o cualquier scraper local.
+"""
+import os
+import threading
+
+from simulations import cache, metricas
+
+ARCHIVO = os.environ.get("ELECTRO_METRICAS_ARCHIVO")
+
+_candado = threading.Lock()
+
+
+def _etiqueta(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def texto():
+    """Todas las métricas del proceso en formato de exposición de Prometheus."""
+    acumulado = metricas.copia_acumulado()
+    lineas = [
+        "# HELP electro_etapa_segundos_total Tiempo acumulado por simulación y etapa.",
+        "# TYPE electro_etapa_segundos_total counter",
+    ]
+    for nombre, total in sorted(acumulado.items()):
+        for etapa, segundos in sorted(total["etapas"].items()):
+            lineas.append(
+                f'electro_etapa_segundos_total{{simulacion="{_etiqueta(nombre)}",etapa="{etapa}"}} {segundos:.6f}'
+            )
+    lineas += [
+        "# HELP electro_reruns_total Reruns de cada simulación.",
+        "# TYPE electro_reruns_total counter",
+    ]
+    lineas += [f'electro_reruns_total{{simulacion="{_etiqueta(n)}"}} {t["reruns"]}' for n, t in sorted(acumulado.items())]
+    lineas += [
+        "# HELP electro_payload_bytes_total Bytes de imagen enviados al navegador.",
+        "# TYPE electro_payload_bytes_total counter",
+    ]
+    lineas += [f'electro_payload_bytes_total{{simulacion="{_etiqueta(n)}"}} {t["bytes"]}' for n, t in sorted(acumulado.items())]
+
+    estadisticas = {nombre: c.estadisticas() for nombre, c in sorted(cache.caches.items())}
+    for campo, tipo, ayuda in [
+        ("aciertos", "counter", "Aciertos de la caché de figuras."),
+        ("fallos", "counter", "Fallos de la caché de figuras."),
+        ("bytes", "gauge", "Bytes ocupados por la caché de figuras."),
+    ]:
+        metrica = f"electro_cache_{campo}" + ("_total" if tipo == "counter" else "")
+        lineas += [f"# HELP {metrica} {ayuda}", f"# TYPE {metrica} {tipo}"]
+        lineas += [f'{metrica}{{cache="{_etiqueta(n)}"}} {e[campo]}' for n, e in estadisticas.items()]
+    return "\n".join(lineas) + "\n"
+
+
+def escribir(ruta=None):
+    """Reescribe el archivo de métricas; no hace nada si no hay ruta configurada."""
+    ruta = ruta or ARCHIVO
+    if not ruta:
+        return
+    contenido = texto()
+    with _candado:
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, ruta)
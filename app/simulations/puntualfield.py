@@ -1,63 +1,40 @@
+import io
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import pandas as pd
 from matplotlib.colors import LogNorm
 from matplotlib.ticker import ScalarFormatter
+from electro_core import campo_densidad, campo_puntual, magnitud, malla, normalizar, potencial_puntual
+from simulations.figuras import PRECISION, subplots, a_bytes, mostrar_imagen
+from simulations.cache import cache_render
+from simulations.detalle import lineas
 
-def campo_electrico_carga_puntual():
-    st.title("🏋️ Campo Eléctrico de Carga Puntual")
-    
-    # Teoría introductoria
-    with st.expander("📚 Contexto", expanded=True):
-        st.markdown("""
-        
-        """)
-    
-    # Controles interactivos
-    col1, col2 = st.columns(2)
-    with col1:
-        q = st.slider(
-            "Carga (nC)",
-            min_value=-20.0,
-            max_value=20.0,
-            value=5.0,
-            step=0.1,
-            format="%.1f",
-            help="Carga en nanocoulombs (1 nC = 10⁻⁹ C)"
-        )
-    with col2:
-        grid_size = st.slider(
-            "Resolución de malla",
-            min_value=20,
-            max_value=100,
-            value=40,
-            step=5
-        )
-    
+def calcular_campo_puntual(q, grid_size, precision=PRECISION):
     # Constante ajustada para nC
     k_nano = 8.99e9 * 1e-9  # k para q en nC y r en metros
     
     # ========== Cálculos ==========
-    x = np.linspace(-2, 2, grid_size)
-    y = np.linspace(-2, 2, grid_size)
-    X, Y = np.meshgrid(x, y)
-    r = np.sqrt(X**2 + Y**2)
-    r[r == 0] = np.inf  # Evitar división por cero
+    X, Y = malla(-2, 2, -2, 2, grid_size, precision=precision)
+
+    # Campo eléctrico (nulo sobre la carga)
+    Ex, Ey = campo_puntual(q, X, Y, k=k_nano)
+    E_magnitude = magnitud(Ex, Ey)
+
+    # Potencial para las equipotenciales (cero sobre la carga)
+    V = potencial_puntual(q, X, Y, k=k_nano, r_cero=np.inf)
+    return X, Y, Ex, Ey, E_magnitude, V
 
-    # Campo eléctrico
-    Ex = k_nano * q * X / r**3
-    Ey = k_nano * q * Y / r**3
-    E_magnitude = np.sqrt(Ex**2 + Ey**2)
+
+@cache_render("puntualfield")
+def dibujar_campo_puntual(q, grid_size, precision=PRECISION):
+    X, Y, Ex, Ey, E_magnitude, V = calcular_campo_puntual(q, grid_size, precision)
     
     # Normalización para visualización
     valid = E_magnitude > 0
-    Ex_norm = np.zeros_like(Ex)
-    Ey_norm = np.zeros_like(Ey)
-    Ex_norm[valid] = Ex[valid] / E_magnitude[valid]
-    Ey_norm[valid] = Ey[valid] / E_magnitude[valid]
+    Ex_norm, Ey_norm = normalizar(Ex, Ey)
 
     # ========== Visualización ==========
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig, ax = subplots(figsize=(10, 8))
     
     # Mapa de color logarítmico
     norm = LogNorm(vmin=E_magnitude[valid].min()*1.5, 
@@ -79,11 +56,10 @@ def campo_electrico_carga_puntual():
                label=f'Carga: {q} nC', zorder=5)
     
     # Líneas equipotenciales
-    V = k_nano * q / r
     ax.contour(X, Y, V, levels=12, colors='gray', alpha=0.4, linewidths=0.7)
     
     # Barra de color
-    cbar = plt.colorbar(quiver, ax=ax, label='Magnitud del Campo (N/C)',
+    cbar = fig.colorbar(quiver, ax=ax, label='Magnitud del Campo (N/C)',
                        extend='both', shrink=0.8)
     cbar.formatter = ScalarFormatter()
     cbar.formatter.set_powerlimits((-2, 2))
@@ -97,8 +73,209 @@ def campo_electrico_carga_puntual():
     ax.set_aspect('equal')
     ax.set_xlim(-2.1, 2.1)
     ax.set_ylim(-2.1, 2.1)
+
+    return a_bytes(fig), {}
+
+
+FIGURAS = ["Disco", "Anillo", "Cuadrado"]
+# Figuras de partida: dos discos opuestos dentro de un anillo
+FIGURAS_INICIALES = pd.DataFrame({
+    "Figura": ["Disco", "Disco", "Anillo"],
+    "x (m)": [-0.8, 0.8, 0.0],
+    "y (m)": [0.0, 0.0, 0.0],
+    "Tamaño (m)": [0.3, 0.3, 1.6],
+    "σ (nC/m²)": [50.0, -50.0, 5.0],
+})
+
+def malla_densidad(res):
+    """Centros de las celdas (x, y) y paso h de una malla res×res en ±2 m."""
+    h = 4.0 / res
+    x = -2 + (np.arange(res) + 0.5) * h
+    return x, x, h
+
+
+def densidad_figuras(figuras, res):
+    """σ (nC/m²) de la suma de las figuras (figura, x, y, tamaño, σ)."""
+    x, y, h = malla_densidad(res)
+    X, Y = np.meshgrid(x, y)
+    sigma = np.zeros((res, res))
+    for figura, x0, y0, tamano, valor in figuras:
+        if figura == "Disco":
+            dentro = np.hypot(X - x0, Y - y0) <= tamano
+        elif figura == "Anillo":
+            dentro = np.abs(np.hypot(X - x0, Y - y0) - tamano) <= max(0.04, h)
+        else:
+            dentro = (np.abs(X - x0) <= tamano / 2) & (np.abs(Y - y0) <= tamano / 2)
+        sigma[dentro] += valor
+    return sigma
+
+
+def densidad_archivo(datos, nombre, sigma_max, res):
+    """σ (nC/m²) de un .npy o .csv (tal cual) o de una imagen (brillo × sigma_max).
+
+    Un archivo que no se puede decodificar lanza ValueError.
+    """
+    try:
+        if nombre.endswith(".npy"):
+            valores = np.load(io.BytesIO(datos))
+        elif nombre.endswith(".csv"):
+            valores = np.loadtxt(io.BytesIO(datos), delimiter=",", ndmin=2)
+        else:
+            from matplotlib.image import imread
+            imagen = imread(io.BytesIO(datos), format=nombre.rsplit(".", 1)[-1])
+            imagen = imagen[..., :3].mean(axis=-1) if imagen.ndim == 3 else imagen
+            valores = sigma_max * imagen / max(float(imagen.max()), 1e-12)
+            # La fila 0 de una imagen es la de arriba
+            valores = valores[::-1]
+        valores = np.asarray(valores, dtype=float)
+    except (OSError, SyntaxError, TypeError) as error:
+        # PIL lanza SyntaxError con un PNG corrupto y OSError con otras imágenes ilegibles
+        raise ValueError(f"{nombre} no es un archivo válido ({error})") from error
+    if valores.ndim != 2:
+        raise ValueError("La densidad debe ser una matriz 2D")
+    # Al vecino más cercano, estirada a la malla res×res
+    filas = np.linspace(0, valores.shape[0] - 1, res).round().astype(int)
+    columnas = np.linspace(0, valores.shape[1] - 1, res).round().astype(int)
+    return np.nan_to_num(valores[np.ix_(filas, columnas)])
+
+
+def calcular_campo_densidad(sigma):
+    k_nano = 8.99e9 * 1e-9  # k para σ en nC/m²
+    x, y, h = malla_densidad(len(sigma))
+    V, Ex, Ey = campo_densidad(sigma, h, k=k_nano)
+    return x, y, h, V, Ex, Ey
+
+
+def dibujar_densidad(sigma, titulo):
+    x, y, h, V, Ex, Ey = calcular_campo_densidad(sigma)
+    E_magnitude = magnitud(Ex, Ey)
+
+    fig, ax = subplots(figsize=(10, 8))
+    valid = E_magnitude > 0
+    if not valid.any():
+        # σ = 0, o figuras que no cubren el centro de ninguna celda: no hay campo que escalar
+        ax.text(0, 0, 'Sin carga en la malla: el campo es nulo', ha='center', va='center')
+    else:
+        norm = LogNorm(vmin=E_magnitude[valid].min() * 1.5, vmax=E_magnitude.max() * 0.8)
+        im = ax.imshow(E_magnitude, origin='lower', extent=(-2, 2, -2, 2), cmap='nipy_spectral',
+                       norm=norm, interpolation='nearest')
+
+        # Dirección del campo sobre una malla diezmada (streamplot pide paso uniforme)
+        paso = max(len(x) // 64, 1)
+        ax.streamplot(x[::paso], y[::paso], Ex[::paso, ::paso], Ey[::paso, ::paso],
+                      color='white', linewidth=0.5, density=1.0, arrowsize=0.7)
+
+        lineas(ax, x, y, V, levels=12, colors='gray', alpha=0.6, linewidths=0.7)
+        lineas(ax, x, y, np.abs(sigma) > 0, levels=[0.5], colors='black', linewidths=1.0)
+
+        cbar = fig.colorbar(im, ax=ax, label='Magnitud del Campo (N/C)', extend='both', shrink=0.8)
+        cbar.formatter = ScalarFormatter()
+        cbar.formatter.set_powerlimits((-2, 2))
+
+    ax.set_title(titulo, pad=15)
+    ax.set_xlabel('x (m)')
+    ax.set_ylabel('y (m)')
+    ax.set_aspect('equal')
+    ax.set_xlim(-2, 2)
+    ax.set_ylim(-2, 2)
+
+    return a_bytes(fig), {"carga_total": float(sigma.sum() * h**2), "campo_nulo": not valid.any()}
+
+
+@cache_render("densidad_figuras")
+def dibujar_densidad_figuras(figuras, res):
+    return dibujar_densidad(densidad_figuras(figuras, res), 'Campo de la densidad dibujada')
+
+
+@cache_render("densidad_archivo")
+def dibujar_densidad_archivo(datos, nombre, sigma_max, res):
+    return dibujar_densidad(densidad_archivo(datos, nombre, sigma_max, res), f'Campo de {nombre}')
+
+
+def campo_densidad_carga():
+    col1, col2 = st.columns(2)
+    with col1:
+        fuente = st.radio("Densidad", ["Figuras", "Archivo"], horizontal=True,
+                          help="Figuras: discos, anillos y cuadrados con densidad uniforme. "
+                               "Archivo: .npy o .csv con σ en nC/m², o una imagen (brillo × σ máxima).")
+    with col2:
+        res = st.slider("Resolución de la densidad", 128, 512, 256, 64,
+                        help="Celdas por lado; el campo se calcula con FFT en O(M log M).")
+
+    if fuente == "Figuras":
+        tabla = st.data_editor(
+            FIGURAS_INICIALES,
+            num_rows="dynamic",
+            key="densidad_figuras",
+            column_config={
+                "Figura": st.column_config.SelectboxColumn(options=FIGURAS, required=True),
+                "x (m)": st.column_config.NumberColumn(min_value=-2.0, max_value=2.0, step=0.05),
+                "y (m)": st.column_config.NumberColumn(min_value=-2.0, max_value=2.0, step=0.05),
+                "Tamaño (m)": st.column_config.NumberColumn(min_value=0.01, max_value=2.0, step=0.05),
+                "σ (nC/m²)": st.column_config.NumberColumn(min_value=-500.0, max_value=500.0, step=1.0),
+            },
+        ).dropna()
+        figuras = tuple(tuple(fila) for fila in tabla.itertuples(index=False))
+        if not figuras:
+            st.info("Agrega al menos una figura.")
+            return
+        imagen, resumen = dibujar_densidad_figuras(figuras, res)
+    else:
+        archivo = st.file_uploader("Densidad de carga", type=["npy", "csv", "png", "jpg"])
+        sigma_max = st.slider("σ máxima para imágenes (nC/m²)", -200.0, 200.0, 50.0, 5.0)
+        if archivo is None:
+            st.info("Sube un archivo para calcular su campo.")
+            return
+        try:
+            imagen, resumen = dibujar_densidad_archivo(archivo.getvalue(), archivo.name.lower(), sigma_max, res)
+        except ValueError as error:
+            st.error(f"No se pudo leer la densidad: {error}")
+            return
+
+    if resumen["campo_nulo"]:
+        st.info("La densidad es nula en todas las celdas: usa σ distinta de cero o figuras más grandes.")
+        return
+    st.metric("Carga total", f"{resumen['carga_total']:.2f} nC")
+    mostrar_imagen(imagen)
+
+
+def campo_electrico_carga_puntual():
+    st.title("🏋️ Campo Eléctrico de Carga Puntual")
+    
+    # Teoría introductoria
+    with st.expander("📚 Contexto", expanded=True):
+        st.markdown("""
+        
+        """)
+    
+    fuente = st.radio("Fuente", ["Carga puntual", "Densidad de carga (FFT)"], horizontal=True)
+    if fuente != "Carga puntual":
+        campo_densidad_carga()
+        return
+
+    # Controles interactivos
+    col1, col2 = st.columns(2)
+    with col1:
+        q = st.slider(
+            "Carga (nC)",
+            min_value=-20.0,
+            max_value=20.0,
+            value=5.0,
+            step=0.1,
+            format="%.1f",
+            help="Carga en nanocoulombs (1 nC = 10⁻⁹ C)"
+        )
+    with col2:
+        grid_size = st.slider(
+            "Resolución de malla",
+            min_value=20,
+            max_value=100,
+            value=40,
+            step=5
+        )
     
-    st.pyplot(fig)
+    imagen, _ = dibujar_campo_puntual(q, grid_size)
+    mostrar_imagen(imagen)
     
     # Explicación adicional
     st.markdown("""
@@ -0,0 +1,121 @@
+"""Lecturas numéricas precalculadas sobre la retícula de los sliders.
+
+Algunas cantidades que las páginas muestran (ángulo crítico, frecuencia de
+corte) dependen sólo de sliders discretos y tienen forma cerrada. Una simulación marca con @reticula la función vectorizada que las
+calcula junto con los ejes (inicio, fin, paso) de sus sliders; la función
+se evalúa una vez sobre toda la retícula y se guarda como .npy en
+app/datos, ya sea al construir la imagen de Docker:
+
+    cd app && python -m simulations.reticulas
+
+o, si el archivo no existe, la primera vez que se consulta. Las tablas se
+abren con mmap en sólo lectura, así que todos los procesos del servidor
+comparten las mismas páginas en memoria. Consultar es indexar; un valor
+fuera de la retícula se calcula directamente con la función.
+"""
+import hashlib
+import importlib
+import os
+import threading
+
+import numpy as np
+
+DIRECTORIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datos")
+
+# Cuánto puede alejarse un valor de un nodo (en pasos) y seguir siendo ese nodo
+TOLERANCIA = 1e-6
+
+# nombre -> Reticula
+reticulas = {}
+
+
+class Reticula:
+    def __init__(self, nombre, ejes, funcion):
+        self.nombre = nombre
+        self.ejes = [(float(inicio), float(fin), float(paso)) for inicio, fin, paso in ejes]
+        self.funcion = funcion
+        self.forma = tuple(round((fin - inicio) / paso) + 1 for inicio, fin, paso in self.ejes)
+        self._tabla = None
+        self._candado = threading.Lock()
+
+    def valores(self, eje):
+        inicio, _, paso = self.ejes[eje]
+        return np.round(inicio + np.arange(self.forma[eje]) * paso, 10)
+
+    def construir(self):
+        mallas = np.meshgrid(*(self.valores(i) for i in range(len(self.ejes))), indexing="ij")
+        return np.ascontiguousarray(np.broadcast_to(self.funcion(*mallas), self.forma), dtype=np.float64)
+
+    def ruta(self):
+        # El nombre cambia si cambian los ejes o el código de la función
+        firma = repr(self.ejes).encode() + self.funcion.__code__.co_code + repr(self.funcion.__code__.co_consts).encode()
+        return os.path.join(DIRECTORIO, f"{self.nombre}.{hashlib.sha256(firma).hexdigest()[:12]}.npy")
+
+    def guardar(self):
+        os.makedirs(DIRECTORIO, exist_ok=True)
+        destino = self.ruta()
+        temporal = destino + ".tmp"
+        with open(temporal, "wb") as archivo:
+            np.save(archivo, self.construir())
+        os.replace(temporal, destino)
+        return destino
+
+    def tabla(self):
+        """La tabla completa: mmap del .npy, creándolo si hace falta."""
+        if self._tabla is not None:
+            return self._tabla
+        with self._candado:
+            if self._tabla is None:
+                try:
+                    if not os.path.exists(self.ruta()):
+                        self.guardar()
+                    self._tabla = np.load(self.ruta(), mmap_mode="r")
+                except OSError:
+                    # Directorio de sólo lectura: nos quedamos con la copia en memoria
+                    self._tabla = self.construir()
+            return self._tabla
+
+    def indices(self, *valores):
+        """Índice del nodo que corresponde a `valores`, o None si no es un nodo."""
+        indices = []
+        for valor, (inicio, _, paso), n in zip(valores, self.ejes, self.forma):
+            posicion = (float(valor) - inicio) / paso
+            i = round(posicion)
+            if abs(posicion - i) > TOLERANCIA or not 0 <= i < n:
+                return None
+            indices.append(i)
+        return tuple(indices)
+
+    def __call__(self, *valores):
+        indices = self.indices(*valores)
+        if indices is None:
+            return float(self.funcion(*valores))
+        return float(self.tabla()[indices])
+
+
+def reticula(nombre, ejes):
+    """Registra una función vectorizada para tabularla sobre `ejes`.
+
+    Devuelve la Reticula, que se llama igual que la función original.
+    """
+    def decorador(funcion):
+        reticulas[nombre] = Reticula(nombre, ejes, funcion)
+        return reticulas[nombre]
+    return decorador
+
+
+def construir_todas():
+    """Importa cada simulación (eso registra sus retículas) y las guarda todas."""
+    from registro import SIMULACIONES
+
+    for modulo in sorted({modulo for modulo, _ in SIMULACIONES.values()}):
+        importlib.import_module(modulo)
+    return [reticulas[nombre].guardar() for nombre in sorted(reticulas)]
+
+
+if __name__ == "__main__":
+    # Igual que en simulations.estaticas: usar el módulo importado, no __main__
+    from simulations.reticulas import construir_todas as _construir_todas
+
+    for destino in _construir_todas():
+        print(destino)
@@ -1,9 +1,13 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import plotly.graph_objects as go
 from mpl_toolkits.mplot3d import Axes3D
 from matplotlib.patches import FancyArrowPatch
 from mpl_toolkits.mplot3d.proj3d import proj_transform
+from electro_core import momento_dipolar_anillo, torque
+from simulations.figuras import nueva_figura, a_bytes, mostrar_imagen
+from simulations.cache import cache_render
+from simulations.interactivo import a_json, compacto, elegir_modo, flechas, mostrar_escena, nueva_escena, vector
 
 class Arrow3D(FancyArrowPatch):
     def __init__(self, x, y, z, dx, dy, dz, *args, **kwargs):
@@ -27,15 +31,7 @@ class Arrow3D(FancyArrowPatch):
         self.set_positions((xs[0], ys[0]), (xs[1], ys[1]))
         return np.min(zs)
 
-def simular_anillo_campo_electrico():
-    st.title("🧲 Anillo con Distribución de Carga en Campo Eléctrico")
-    
-    with st.sidebar:
-        st.header("Configuración de Parámetros")
-        R = st.slider("Radio del anillo (m)", 0.05, 0.5, 0.1, 0.01)
-        lambda0 = st.slider("Amplitud densidad de carga λ₀", 0.1, 5.0, 1.0, 0.1)
-        E0 = st.slider("Campo eléctrico externo (N/C)", 0.1, 2.0, 0.5, 0.1)
-    
+def calcular_anillo(R, lambda0, E0):
     # Crear el anillo
     phi = np.linspace(0, 2*np.pi, 100)
     x_ring = R * np.cos(phi)
@@ -44,8 +40,15 @@ def simular_anillo_campo_electrico():
     lambda_phi = lambda0 * np.sin(phi)
 
     # Cálculos físicos
-    p_y = np.pi * lambda0 * R**2  # Momento dipolar
-    tau_z = -p_y * E0  # Torque
+    p_y = momento_dipolar_anillo(lambda0, R)  # Momento dipolar
+    tau_z = torque([0, p_y, 0], [E0, 0, 0])[2]  # Torque
+
+    return x_ring, y_ring, z_ring, lambda_phi, p_y, tau_z
+
+
+@cache_render("torquedip")
+def dibujar_anillo(R, lambda0, E0):
+    x_ring, y_ring, z_ring, lambda_phi, p_y, tau_z = calcular_anillo(R, lambda0, E0)
 
     def add_arrow(ax, x, y, z, dx, dy, dz, label=None, mag=None, color='k', normalize=True, arrow_scale=1.0):
         if normalize:
@@ -58,7 +61,7 @@ def simular_anillo_campo_electrico():
             ax.text(x + dx, y + dy, z + dz, f"{label}\n{mag:.4f}", color=color, fontsize=9)
 
     # Gráfico 3D
-    fig = plt.figure(figsize=(12, 10))
+    fig = nueva_figura(figsize=(12, 10))
     ax = fig.add_subplot(111, projection='3d')
 
     # Dibujar anillo con colores según densidad de carga
@@ -102,4 +105,53 @@ def simular_anillo_campo_electrico():
             r'$R = %.2f$ m' % R,
             bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'))
 
-    st.pyplot(fig)
+    return a_bytes(fig), {}
+
+
+@cache_render("torquedip_3d")
+def escena_anillo(R, lambda0, E0):
+    x_ring, y_ring, z_ring, lambda_phi, p_y, tau_z = calcular_anillo(R, lambda0, E0)
+
+    fig = nueva_escena('Anillo con λ(φ)=λ₀sin(φ) en campo E externo: τ = p × E',
+                       rangos=[(-1, 0.4), (-1, 1), (-1, 1)])
+
+    # Anillo con colores según densidad de carga
+    fig.add_trace(go.Scatter3d(
+        x=compacto(x_ring), y=compacto(y_ring), z=compacto(z_ring), mode='markers',
+        marker=dict(size=4, color=compacto(lambda_phi), colorscale='RdBu_r',
+                    colorbar=dict(title='λ(φ) [C/m]')),
+        name='Anillo'))
+
+    # Campo eléctrico uniforme
+    y_E, z_E = np.meshgrid(np.linspace(-1.5*0.5, 1.5*0.5, 5), np.linspace(-1.5*0.5, 1.5*0.5, 5))
+    origenes = np.column_stack([np.full(y_E.size, -2*0.5), y_E.ravel(), z_E.ravel()])
+    fig.add_trace(flechas(origenes, np.tile([1.0, 0.0, 0.0], (y_E.size, 1)), R, '#90EE90',
+                          'Campo eléctrico (E)'))
+
+    # Vectores de momento dipolar y torque
+    fig.add_traces(vector([0, 0, 0], [0, p_y, 0], 3 * R, 'red', 'Momento dipolar (p)',
+                          etiqueta=f'p = {p_y:.4f}'))
+    fig.add_traces(vector([0, 0, 0], [0, 0, tau_z], 3 * R, 'magenta', 'Torque (τ)',
+                          etiqueta=f'τ = {abs(tau_z):.4f}'))
+
+    fig.add_annotation(
+        text=f'|E| = {E0:.1f} N/C, |p| = πλ₀R² = {p_y:.4f} C·m, |τ| = {abs(tau_z):.4f} N·m, R = {R:.2f} m',
+        xref='paper', yref='paper', x=0, y=1, showarrow=False, align='left')
+
+    return a_json(fig), {}
+
+
+def simular_anillo_campo_electrico():
+    st.title("🧲 Anillo con Distribución de Carga en Campo Eléctrico")
+    
+    with st.expander("⚙️ Configuración de Parámetros", expanded=True):
+        R = st.slider("Radio del anillo (m)", 0.05, 0.5, 0.1, 0.01)
+        lambda0 = st.slider("Amplitud densidad de carga λ₀", 0.1, 5.0, 1.0, 0.1)
+        E0 = st.slider("Campo eléctrico externo (N/C)", 0.1, 2.0, 0.5, 0.1)
+    
+    if elegir_modo("torquedip"):
+        escena, _ = escena_anillo(R, lambda0, E0)
+        mostrar_escena(escena)
+    else:
+        imagen, _ = dibujar_anillo(R, lambda0, E0)
+        mostrar_imagen(imagen)